@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# ⏱ Benchmark: indeks zajętości vs. zagnieżdżone pętle z zastepstwa.py
+# Uruchomienie: python3 benchmarks/bench_occupancy.py [--zapytania N] [--seed S]
+
+import sys, os, time, random, argparse
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from core.occupancy import OccupancyIndex
+
+DNI = ["poniedzialek", "wtorek", "sroda", "czwartek", "piatek"]
+GODZINY = [
+    "8:00-8:45", "8:55-9:40", "9:50-10:35", "10:55-11:40",
+    "11:50-12:35", "12:45-13:30", "13:40-14:25", "14:35-15:20"
+]
+SKALE = [50, 200, 1000]
+
+
+# ============================================================
+# SYNTETYCZNE PLANY
+# ============================================================
+
+def synthetic_plans(liczba_klas, rng):
+    """Plany w formacie data/plany/*.json — ok. 1.5 nauczyciela na klasę."""
+    nauczyciele = [f"Nauczyciel {i}" for i in range(int(liczba_klas * 1.5))]
+    plany = {}
+
+    for k in range(liczba_klas):
+        klasa = f"{k % 8 + 1}{chr(65 + k // 8 % 26)}{k // 208 or ''}"
+        plan = {}
+        for dzien in DNI:
+            sloty = set(rng.sample(range(len(GODZINY)), 6))
+            plan[dzien] = [
+                {
+                    "godzina": g,
+                    "przedmiot": "Przedmiot" if i in sloty else None,
+                    "sala": None,
+                    "nauczyciel": rng.choice(nauczyciele) if i in sloty else None
+                }
+                for i, g in enumerate(GODZINY)
+            ]
+        plany[klasa] = plan
+
+    return plany, nauczyciele
+
+
+# ============================================================
+# DOTYCHCZASOWE SPRAWDZANIE (kopia pętli z zastepstwa.main)
+# ============================================================
+
+def is_busy_scan(plany, imie, dzien, godzina):
+    for p in plany.values():
+        for ld in p.get(dzien, []):
+            if ld.get("nauczyciel") == imie and ld["godzina"] == godzina:
+                return True
+    return False
+
+
+def bench(liczba_klas, zapytania, rng):
+    plany, nauczyciele = synthetic_plans(liczba_klas, rng)
+    pytania = [
+        (rng.choice(nauczyciele), rng.choice(DNI), rng.choice(GODZINY))
+        for _ in range(zapytania)
+    ]
+
+    t0 = time.perf_counter()
+    wynik_scan = [is_busy_scan(plany, *q) for q in pytania]
+    t_scan = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    indeks = OccupancyIndex(plany)
+    t_build = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    wynik_idx = [indeks.is_busy(*q) for q in pytania]
+    t_idx = time.perf_counter() - t0
+
+    if wynik_scan != wynik_idx:
+        raise SystemExit(f"❌ Różne wyniki dla {liczba_klas} klas!")
+
+    return {
+        "klasy": liczba_klas,
+        "scan_us": t_scan / zapytania * 1e6,
+        "indeks_us": t_idx / zapytania * 1e6,
+        "budowa_ms": t_build * 1000,
+        "przyspieszenie": t_scan / t_idx if t_idx else float("inf"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark indeksu zajętości")
+    parser.add_argument("--zapytania", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+
+    print(f"{'klasy':>6} {'pętle [µs]':>12} {'indeks [µs]':>12} {'budowa [ms]':>12} {'x':>10}")
+    for n in SKALE:
+        r = bench(n, args.zapytania, rng)
+        print(f"{r['klasy']:>6} {r['scan_us']:>12.1f} {r['indeks_us']:>12.3f} "
+              f"{r['budowa_ms']:>12.1f} {r['przyspieszenie']:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# ⏱ Benchmark generatorów planów i zastępstw na syntetycznych szkołach
+# Mierzy: assign_teachers_to_classes, generate_plan (wszystkie klasy),
+# pełne plans.run (to samo co plans.main), plans.run --incremental
+# oraz zastepstwa.run dla kilku dni z nieobecnościami.
+# Wyniki dopisywane do historii JSON (domyślnie benchmarks/history.json — lokalna,
+# w .gitignore; --historia PLIK zapisuje gdzie indziej)
+# i porównywane z poprzednim wpisem o tych samych parametrach.
+#
+# Uruchomienie: python3 benchmarks/run.py [--skale 12,32,96] [--absencja 0.1]
+#               [--dni 5] [--powtorzenia 3] [--seed S] [--historia PLIK] [--bez-zapisu]
+
+import sys, os, json, time, random, platform, datetime, argparse, tempfile, subprocess
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import plans
+import zastepstwa
+from core.store import get_store
+from core.jsonio import write_json_atomic
+from benchmarks.synthetic import generate_school, generate_absences
+
+HISTORY_FILE = os.path.join(ROOT, "benchmarks", "history.json")
+SKALE = [12, 32, 96]
+
+# zmiana czasu powyżej tego progu jest oznaczana jako regresja
+PROG_REGRESJI = 0.20
+
+POMIARY = [
+    ("assign_ms", "przydział"),
+    ("generate_plan_ms", "generate_plan"),
+    ("plans_ms", "plans.run"),
+    ("plans_incremental_ms", "inkrement."),
+    ("zastepstwa_ms", "zastępstwa"),
+]
+
+
+def cisza(*args):
+    pass
+
+
+def best_of(powtorzenia, func):
+    """Najkrótszy czas [ms] z `powtorzenia` wywołań."""
+    najlepszy = None
+    for _ in range(powtorzenia):
+        t0 = time.perf_counter()
+        func()
+        czas = (time.perf_counter() - t0) * 1000
+        najlepszy = czas if najlepszy is None else min(najlepszy, czas)
+    return najlepszy
+
+
+# ============================================================
+# POMIAR JEDNEJ SKALI
+# ============================================================
+
+def bench_scale(liczba_klas, args):
+    with tempfile.TemporaryDirectory(prefix="bench_szkola_") as katalog:
+        _, nauczyciele = generate_school(katalog, liczba_klas, seed=args.seed)
+        store = get_store(katalog)
+
+        klasy = store.klasy()
+        przedmioty = store.przedmioty()
+        etapy = store.etapy()
+        godziny = [g for g in store.szkola()["godziny_szkolne"] if plans.time_in_range(g)]
+        dni = ["poniedzialek", "wtorek", "sroda", "czwartek", "piatek"]
+
+        wynik = {"klasy": liczba_klas, "nauczyciele": len(nauczyciele)}
+
+        wynik["assign_ms"] = best_of(args.powtorzenia, lambda: plans.assign_teachers_to_classes(
+            klasy, nauczyciele, przedmioty, etapy, log=cisza, rng=random.Random(args.seed)
+        ))
+
+        class_teachers = plans.assign_teachers_to_classes(
+            klasy, nauczyciele, przedmioty, etapy, log=cisza, rng=random.Random(args.seed)
+        )
+        rng = random.Random(args.seed)
+        wynik["generate_plan_ms"] = best_of(args.powtorzenia, lambda: [
+            plans.generate_plan(k, class_teachers, przedmioty, dni, godziny,
+                                klasy=klasy, nauczyciele=nauczyciele, rng=rng)
+            for k in klasy
+        ])
+
+        wynik["plans_ms"] = best_of(args.powtorzenia, lambda: plans.run(
+            katalog, seed=args.seed, log=cisza
+        ))
+        wynik["plans_incremental_ms"] = best_of(args.powtorzenia, lambda: plans.run(
+            katalog, seed=args.seed, incremental=True, log=cisza
+        ))
+
+        od = datetime.date.fromisoformat(args.od)
+        daty = generate_absences(katalog, nauczyciele, od, args.dni, args.absencja, args.seed)
+        wynik["dni"] = len(daty)
+        wynik["zastepstwa_ms"] = best_of(args.powtorzenia, lambda: zastepstwa.run(
+            katalog, daty, log=cisza
+        ))
+        wynik["zastepstwa_dzien_ms"] = wynik["zastepstwa_ms"] / max(1, len(daty))
+
+    return wynik
+
+
+# ============================================================
+# HISTORIA
+# ============================================================
+
+def version_info():
+    """Wersja z package.json i skrót commita (jeśli to repozytorium git)."""
+    try:
+        with open(os.path.join(ROOT, "package.json"), encoding="utf-8") as f:
+            wersja = json.load(f).get("version")
+    except (OSError, ValueError):
+        wersja = None
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+            capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+
+    return wersja, commit
+
+
+def load_history(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            dane = json.load(f)
+        return dane if isinstance(dane, list) else []
+    except (OSError, ValueError):
+        return []
+
+
+def previous_run(historia, parametry):
+    """Ostatni wpis historii z tymi samymi parametrami."""
+    return next((h for h in reversed(historia) if h.get("parametry") == parametry), None)
+
+
+def print_results(wyniki, poprzedni):
+    stare = {w["klasy"]: w for w in (poprzedni or {}).get("wyniki", [])}
+
+    print(f"{'klasy':>6} {'naucz.':>6}" + "".join(f" {nazwa + ' [ms]':>18}" for _, nazwa in POMIARY))
+    for w in wyniki:
+        wiersz = f"{w['klasy']:>6} {w['nauczyciele']:>6}"
+        for klucz, _ in POMIARY:
+            komorka = f"{w[klucz]:.1f}"
+            stary = stare.get(w["klasy"], {}).get(klucz)
+            if stary:
+                zmiana = (w[klucz] - stary) / stary
+                komorka += f" ({zmiana:+.0%}{'⚠️' if zmiana > PROG_REGRESJI else ''})"
+            wiersz += f" {komorka:>18}"
+        print(wiersz)
+
+    if poprzedni:
+        print(f"\n(w nawiasach: zmiana względem {poprzedni.get('commit') or '?'} z {poprzedni['czas']})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark plans.py i zastepstwa.py")
+    parser.add_argument("--skale", default=",".join(map(str, SKALE)),
+                        help="liczby klas, np. 12,32,96")
+    parser.add_argument("--absencja", type=float, default=0.1,
+                        help="część nauczycieli nieobecna każdego dnia")
+    parser.add_argument("--od", default="2030-09-02",
+                        help="pierwszy dzień zastępstw (YYYY-MM-DD)")
+    parser.add_argument("--dni", type=int, default=5)
+    parser.add_argument("--powtorzenia", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--historia", default=HISTORY_FILE)
+    parser.add_argument("--bez-zapisu", action="store_true",
+                        help="nie dopisuj wyniku do historii")
+    args = parser.parse_args()
+
+    skale = [int(s) for s in args.skale.split(",") if s.strip()]
+    parametry = {
+        "skale": skale, "absencja": args.absencja, "od": args.od,
+        "dni": args.dni, "powtorzenia": args.powtorzenia, "seed": args.seed
+    }
+
+    wyniki = []
+    for n in skale:
+        print(f"⏳ {n} klas…", flush=True)
+        wyniki.append(bench_scale(n, args))
+
+    historia = load_history(args.historia)
+    print()
+    print_results(wyniki, previous_run(historia, parametry))
+
+    if args.bez_zapisu:
+        return
+
+    wersja, commit = version_info()
+    historia.append({
+        "czas": datetime.datetime.now().isoformat(timespec="seconds"),
+        "wersja": wersja,
+        "commit": commit,
+        "python": platform.python_version(),
+        "maszyna": f"{platform.system()} {platform.machine()}",
+        "parametry": parametry,
+        "wyniki": [{k: round(v, 3) if isinstance(v, float) else v for k, v in w.items()} for w in wyniki]
+    })
+    write_json_atomic(args.historia, historia)
+    print(f"\n📁 Historia: {args.historia}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# 🏭 Syntetyczna szkoła do benchmarków
+# Zapisuje w <katalog>/ komplet plików jak w data/: klasy.json, nauczyciele.json,
+# przedmioty.json, etapy.json, szkola.json, calendar.json, opcjonalnie plany
+# (przez plans.run) i nieobecności (data/nieobecnosci.jsonl).
+#
+# Uruchomienie: python3 benchmarks/synthetic.py KATALOG [--klasy N] [--nauczyciele N]
+#               [--absencja 0.1] [--od YYYY-MM-DD] [--dni N] [--bez-planow] [--seed S]
+
+import sys, os, math, random, datetime, argparse
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from core.jsonio import write_json_atomic
+from core.absences import AbsenceLedger, ledger_path
+
+# przedmiot → godziny tygodniowo
+PRZEDMIOTY = {
+    "Matematyka": 4, "Polski": 4, "Angielski": 3, "Historia": 2, "Biologia": 2,
+    "Chemia": 2, "Fizyka": 2, "WF": 3, "Geografia": 1, "Informatyka": 1
+}
+
+GODZINY = [
+    "8:00-8:45", "8:55-9:40", "9:50-10:35", "10:55-11:40", "11:50-12:35",
+    "12:45-13:30", "13:40-14:25", "14:35-15:20", "15:30-16:15"
+]
+
+# etap → roczniki
+ETAPY = {"1": (1, 2, 3), "2": (4, 5, 6), "3": (7, 8)}
+
+# tygodniowe pensum jednego nauczyciela
+PENSUM = 18
+
+
+def class_names(liczba):
+    """1A..8A, 1B..8B, ... — roczniki rozłożone równo."""
+    nazwy = []
+    for i in range(liczba):
+        litera = chr(ord("A") + i // 8 % 26)
+        nazwy.append(f"{i % 8 + 1}{litera}{i // 208 or ''}")
+    return nazwy
+
+
+def teacher_count(liczba_klas):
+    """Tylu nauczycieli, ile potrzeba na godziny wszystkich klas (+10%)."""
+    godziny = liczba_klas * sum(PRZEDMIOTY.values())
+    return math.ceil(godziny / PENSUM * 1.1)
+
+
+# ============================================================
+# GENERATOR
+# ============================================================
+
+def generate_school(katalog, klasy=32, nauczyciele=None, seed=1):
+    """Zapisuje pliki szkoły w `katalog`. Zwraca (lista klas, lista nauczycieli)."""
+    rng = random.Random(seed)
+    os.makedirs(os.path.join(katalog, "plany"), exist_ok=True)
+
+    nazwy = class_names(klasy)
+    nauczyciele = nauczyciele or teacher_count(klasy)
+
+    # przedmioty nauczycieli proporcjonalnie do liczby godzin
+    pula = [p for p, h in PRZEDMIOTY.items() for _ in range(h)]
+    lista = []
+    for i in range(nauczyciele):
+        przedmiot = pula[i % len(pula)]
+        lista.append({
+            "imie": f"{przedmiot[:3]} Nauczyciel{i:04d}",
+            "przedmiot": przedmiot,
+            "sala": str(100 + i),
+            "etap": rng.choice([1, 2, 3]),
+            "klasy": rng.sample(nazwy, min(2, len(nazwy))),
+            "specjalizacja": przedmiot,
+            "obecnosc": "yes",
+            "moze_byc_wychowawca": True
+        })
+
+    klasy_json = {
+        k: {
+            "wychowawca": lista[i % len(lista)]["imie"],
+            "uczniowie": [f"Uczeń {k}-{u}" for u in range(rng.randint(15, 30))]
+        }
+        for i, k in enumerate(nazwy)
+    }
+
+    etapy = {
+        eid: {"klasy": [k for k in nazwy if int(k[0]) in roczniki]}
+        for eid, roczniki in ETAPY.items()
+    }
+
+    przedmioty = {
+        p: {"godziny": h, "klasy": nazwy, "etapy": [1, 2, 3]}
+        for p, h in PRZEDMIOTY.items()
+    }
+
+    rok = datetime.date.today().year
+    pliki = {
+        "klasy.json": klasy_json,
+        "nauczyciele.json": lista,
+        "przedmioty.json": przedmioty,
+        "etapy.json": etapy,
+        "szkola.json": {"nazwa": f"Szkoła syntetyczna ({klasy} klas)", "godziny_szkolne": GODZINY},
+        "calendar.json": {"swieta": {
+            "Wszystkich Świętych": f"{rok}-11-01",
+            "Przerwa świąteczna": [f"{rok}-12-23", f"{rok}-12-31"]
+        }}
+    }
+    for nazwa, dane in pliki.items():
+        write_json_atomic(os.path.join(katalog, nazwa), dane)
+
+    return nazwy, lista
+
+
+def generate_plans(katalog, seed=1):
+    """Plany lekcji syntetycznej szkoły — tym samym kodem co plans.py."""
+    import plans
+    return plans.run(katalog, seed=seed, log=lambda *a: None)
+
+
+def generate_absences(katalog, nauczyciele, od, dni, absencja=0.1, seed=1):
+    """Jednodniowe nieobecności: w każdym dniu roboczym `absencja` nauczycieli.
+    Zwraca listę dat (dni robocze)."""
+    rng = random.Random(seed)
+    ledger = AbsenceLedger(ledger_path(katalog))
+    ile = max(1, round(len(nauczyciele) * absencja)) if absencja > 0 else 0
+
+    daty = []
+    for i in range(dni):
+        data = od + datetime.timedelta(days=i)
+        if data.weekday() >= 5:
+            continue
+        daty.append(data)
+        for n in rng.sample(nauczyciele, ile):
+            ledger.add(n["imie"], data.isoformat(), data.isoformat(), "Choroba")
+    return daty
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Syntetyczna szkoła do benchmarków")
+    parser.add_argument("katalog", help="katalog docelowy (odpowiednik data/)")
+    parser.add_argument("--klasy", type=int, default=32)
+    parser.add_argument("--nauczyciele", type=int, default=None,
+                        help="domyślnie wg liczby godzin wszystkich klas")
+    parser.add_argument("--absencja", type=float, default=0.1,
+                        help="część nauczycieli nieobecna każdego dnia")
+    parser.add_argument("--od", type=datetime.date.fromisoformat, default=None,
+                        help="pierwszy dzień nieobecności (domyślnie jutro)")
+    parser.add_argument("--dni", type=int, default=5)
+    parser.add_argument("--bez-planow", action="store_true")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    klasy, nauczyciele = generate_school(args.katalog, args.klasy, args.nauczyciele, args.seed)
+    print(f"🏫 {len(klasy)} klas, {len(nauczyciele)} nauczycieli → {args.katalog}")
+
+    if not args.bez_planow:
+        generate_plans(args.katalog, args.seed)
+        print("📅 Plany lekcji wygenerowane")
+
+    od = args.od or datetime.date.today() + datetime.timedelta(days=1)
+    daty = generate_absences(args.katalog, nauczyciele, od, args.dni, args.absencja, args.seed)
+    print(f"🤒 Nieobecności: {len(daty)} dni roboczych od {od}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+# 🗓 Rejestr nieobecności nauczycieli (data/nieobecnosci.jsonl)
+# Plik tylko-do-dopisywania: jedna operacja JSON na linię.
+#   {"op": "dodaj", "id": "...", "imie": "...", "od": "YYYY-MM-DD", "do": "YYYY-MM-DD", "powod": "..."}
+#   {"op": "powod", "id": "...", "powod": "..."}
+#   {"op": "imie",  "id": "...", "imie": "..."}
+#   {"op": "usun",  "id": "..."}
+# W pamięci: nauczyciel → IntervalIndex, zapytanie o dzień w O(log n).
+# Gdy nieaktualne linie przeważą, menu przepisuje plik (maybe_compact()).
+
+import os, json, uuid
+
+from core.intervals import IntervalIndex, as_key
+from core.jsonio import write_atomic
+
+LEDGER_FILE = "nieobecnosci.jsonl"
+
+# compact(), gdy w pliku jest co najmniej tyle linii i ponad połowa jest nieaktualna
+COMPACT_MIN_LINES = 500
+
+# tyle ostatnich bajtów wczytanej części sprawdzamy, czy plik nie został przepisany
+OGON = 256
+
+
+def ledger_path(data_dir):
+    return os.path.join(data_dir, LEDGER_FILE)
+
+
+class AbsenceLedger:
+    def __init__(self, path):
+        self.path = path
+        self.wpisy = {}          # id → {"id", "imie", "od", "do", "powod"}
+        self._offset = 0         # ile bajtów pliku już wczytano
+        self._plik = None        # (st_dev, st_ino) wczytywanego pliku
+        self._stan = None        # (mtime_ns, rozmiar) po ostatnim odczycie/zapisie
+        self._ogon = b""         # ostatnie bajty wczytanej części
+        self._linie = 0          # ile operacji (linii) wczytano
+        self._indeksy = None     # imie → IntervalIndex (budowany leniwie)
+        self.reload()
+
+    # ============================================================
+    # ODCZYT — tylko nowe linie od ostatniego odczytu
+    # ============================================================
+
+    def _reset(self):
+        self.wpisy.clear()
+        self._offset = 0
+        self._plik = None
+        self._stan = None
+        self._ogon = b""
+        self._linie = 0
+        self._indeksy = None
+
+    def _remember(self, st):
+        self._plik = (st.st_dev, st.st_ino)
+        self._stan = (st.st_mtime_ns, st.st_size)
+
+    def _rewritten(self, st):
+        """Plik podmieniony (compact(), inny proces) albo przepisany w miejscu
+        — wczytanej części nie da się już kontynuować."""
+        if self._plik != (st.st_dev, st.st_ino) or st.st_size < self._offset:
+            return True
+        if st.st_size == self._offset:
+            # nic nie dopisano — zmiana mtime oznacza przepisanie
+            return self._stan != (st.st_mtime_ns, st.st_size)
+        # dopisano coś — koniec wczytanej części musi być taki jak był
+        with open(self.path, "rb") as f:
+            f.seek(self._offset - len(self._ogon))
+            return f.read(len(self._ogon)) != self._ogon
+
+    def reload(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            if self._offset:
+                self._reset()
+            return
+
+        if self._offset and self._rewritten(st):
+            self._reset()
+
+        self._remember(st)
+        if st.st_size == self._offset:
+            return
+
+        with open(self.path, "rb") as f:
+            f.seek(self._offset)
+            chunk = f.read()
+
+        # niepełna ostatnia linia (trwa zapis) zostaje na następny raz
+        koniec = chunk.rfind(b"\n") + 1
+        for line in chunk[:koniec].splitlines():
+            if line.strip():
+                self._linie += 1
+                try:
+                    self._apply(json.loads(line))
+                except ValueError:
+                    print(f"⚠️ Pominięto uszkodzoną linię w {self.path}")
+
+        self._offset += koniec
+        self._ogon = (self._ogon + chunk[:koniec])[-OGON:]
+        self._indeksy = None
+
+    def _apply(self, op):
+        rodzaj = op.get("op")
+
+        if rodzaj == "dodaj":
+            self.wpisy[op["id"]] = {
+                "id": op["id"],
+                "imie": op["imie"],
+                "od": op["od"],
+                "do": op.get("do") or op["od"],
+                "powod": op.get("powod", "")
+            }
+        elif rodzaj == "powod" and op.get("id") in self.wpisy:
+            self.wpisy[op["id"]]["powod"] = op.get("powod", "")
+        elif rodzaj == "imie" and op.get("id") in self.wpisy:
+            self.wpisy[op["id"]]["imie"] = op["imie"]
+        elif rodzaj == "usun":
+            self.wpisy.pop(op.get("id"), None)
+
+    # ============================================================
+    # ZAPIS — dopisanie jednej linii
+    # ============================================================
+
+    def _append(self, op):
+        self.reload()
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        line = (json.dumps(op, ensure_ascii=False) + "\n").encode("utf-8")
+
+        with open(self.path, "ab") as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+            st = os.fstat(f.fileno())
+
+        self._remember(st)
+        self._apply(op)
+        self._offset += len(line)
+        self._ogon = (self._ogon + line)[-OGON:]
+        self._linie += 1
+        self._indeksy = None
+
+    def add(self, imie, od, do=None, powod="Brak powodu"):
+        op = {
+            "op": "dodaj",
+            "id": uuid.uuid4().hex[:12],
+            "imie": imie,
+            "od": as_key(od),
+            "do": as_key(do or od),
+            "powod": powod
+        }
+        self._append(op)
+        return self.wpisy[op["id"]]
+
+    def set_reason(self, wpis_id, powod):
+        self._append({"op": "powod", "id": wpis_id, "powod": powod})
+
+    def rename(self, stare, nowe):
+        """Przenosi wszystkie wpisy nauczyciela na nowe imię (zmiana w nauczyciele.json)."""
+        self.reload()
+        for w in [w for w in self.wpisy.values() if w["imie"] == stare]:
+            self._append({"op": "imie", "id": w["id"], "imie": nowe})
+
+    def remove(self, wpis_id):
+        self._append({"op": "usun", "id": wpis_id})
+
+    def compact(self):
+        """Przepisuje plik tak, by zawierał tylko aktualne wpisy."""
+        self.reload()
+
+        linie = "".join(
+            json.dumps({"op": "dodaj", **w}, ensure_ascii=False) + "\n"
+            for w in self.wpisy.values()
+        )
+
+        dane = linie.encode("utf-8")
+        write_atomic(self.path, dane)
+        self._remember(os.stat(self.path))
+        self._offset = len(dane)
+        self._ogon = dane[-OGON:]
+        self._linie = len(self.wpisy)
+
+    def maybe_compact(self):
+        """compact(), gdy nieaktualne linie (usunięte i poprawione wpisy)
+        stanowią większość dużego pliku. Zwraca True, jeśli plik przepisano."""
+        self.reload()
+        if self._linie < COMPACT_MIN_LINES or self._linie < 2 * len(self.wpisy):
+            return False
+        self.compact()
+        return True
+
+    # ============================================================
+    # ZAPYTANIA
+    # ============================================================
+
+    def _index(self):
+        if self._indeksy is None:
+            grupy = {}
+            for w in self.wpisy.values():
+                grupy.setdefault(w["imie"], []).append((w["od"], w["do"], w))
+            self._indeksy = {imie: IntervalIndex(p) for imie, p in grupy.items()}
+        return self._indeksy
+
+    def is_absent(self, imie, data):
+        """Wpis nieobecności obejmujący `data` albo None."""
+        indeks = self._index().get(imie)
+        return indeks.find(data) if indeks else None
+
+    def entries_on(self, imie, data):
+        """Wszystkie wpisy nauczyciela obejmujące `data`."""
+        indeks = self._index().get(imie)
+        return indeks.overlapping(data, data) if indeks else []
+
+    def absent_on(self, data):
+        """imie → wpis dla wszystkich nieobecnych w danym dniu."""
+        wynik = {}
+        for imie, indeks in self._index().items():
+            w = indeks.find(data)
+            if w:
+                wynik[imie] = w
+        return wynik
+
+
+# ============================================================
+# NIEOBECNI W DANYM DNIU (rejestr + stara flaga "obecnosc")
+# ============================================================
+
+def absent_teachers(nauczyciele, ledger, data):
+    """imie → powód dla nauczycieli nieobecnych w dniu `data`.
+
+    Flaga `obecnosc: "no"` z nauczyciele.json nadal oznacza nieobecność
+    (bez daty), rejestr dokłada nieobecności przypisane do dat."""
+
+    wynik = {
+        n["imie"]: n.get("powod", "")
+        for n in nauczyciele if n.get("obecnosc") == "no"
+    }
+
+    if ledger is not None:
+        for imie, w in ledger.absent_on(data).items():
+            wynik.setdefault(imie, w.get("powod", ""))
+
+    return wynik
@@ -0,0 +1,76 @@
+# 🧮 Macierz zajętości nauczycieli (nauczyciel × dzień × godzina)
+# Dla każdej godziny lekcyjnej jedna liczba całkowita używana jako zbiór bitów:
+# bit i = nauczyciel nr i z nauczyciele.json ma wtedy lekcję.
+# Wolni w danej godzinie to `kandydaci & ~zajeci` — jedna operacja na wszystkich
+# nauczycielach naraz zamiast sprawdzania każdego kandydata osobno.
+#
+# Maski są w kolejności nauczyciele.json, więc members() zwraca nauczycieli
+# w tej samej kolejności co dotychczasowe filtrowanie listy.
+
+
+def iter_bits(maska):
+    """Numery ustawionych bitów, od najmłodszego (też dla core/scheduler.py)."""
+    while maska:
+        niski = maska & -maska
+        yield niski.bit_length() - 1
+        maska ^= niski
+
+
+class BusyMatrix:
+    def __init__(self, timetable, nauczyciele):
+        self.timetable = timetable
+        self.nauczyciele = list(nauczyciele)
+        self.D = timetable.D
+        self.S = timetable.S
+
+        # imię → bity nauczycieli o tym imieniu
+        self.bity = {}
+        for i, n in enumerate(self.nauczyciele):
+            self.bity[n["imie"]] = self.bity.get(n["imie"], 0) | (1 << i)
+
+        # id nauczyciela w Timetable → bity w macierzy
+        po_id = [self.bity.get(imie, 0) for imie in timetable.nauczyciele.names]
+
+        self.zajeci = [0] * (self.D * self.S)
+        for _, d, s, t in timetable.lessons():
+            self.zajeci[d * self.S + s] |= po_id[t]
+
+    # ============================================================
+    # MASKI
+    # ============================================================
+
+    def mask(self, kandydaci):
+        """Maska listy nauczycieli (obiekty z nauczyciele.json albo imiona)."""
+        m = 0
+        for k in kandydaci:
+            m |= self.bity.get(k if isinstance(k, str) else k["imie"], 0)
+        return m
+
+    def members(self, mask):
+        """Nauczyciele z maski, w kolejności nauczyciele.json."""
+        return [self.nauczyciele[i] for i in iter_bits(mask)]
+
+    def busy(self, dzien, godzina):
+        """Maska nauczycieli z lekcją w tej godzinie (0 dla nieznanej godziny)."""
+        d = self.timetable.dzien_idx.get(dzien)
+        s = self.timetable.slot_idx.get(godzina)
+        if d is None or s is None:
+            return 0
+        return self.zajeci[d * self.S + s]
+
+    # ============================================================
+    # ZAPYTANIA ZBIORCZE
+    # ============================================================
+
+    def candidate_matrix(self, dzien, godziny, kandydaci):
+        """{godzina: maska wolnych kandydatów} — wiersz na godzinę, kolumna
+        (bit) na nauczyciela. Podstawa dla własnego rankingu kandydatów."""
+        m = kandydaci if isinstance(kandydaci, int) else self.mask(kandydaci)
+        return {g: m & ~self.busy(dzien, g) for g in godziny}
+
+    def free_sets(self, dzien, godziny, kandydaci):
+        """{godzina: [wolni kandydaci]} dla wszystkich godzin naraz."""
+        return {
+            g: self.members(m)
+            for g, m in self.candidate_matrix(dzien, godziny, kandydaci).items()
+        }
@@ -0,0 +1,104 @@
+# 📆 Kalendarz dni wolnych (data/calendar.json) jako indeks przedziałów
+# calendar.json parsowany raz; kolejne wywołania dostają gotowy indeks,
+# dopóki plik się nie zmieni (mtime + rozmiar). Zapytania przez bisekcję.
+#
+# Wynik dla dnia wolnego — jak w plikach zastępstw:
+#   {"powod": "Weekend"} / {"powod": nazwa} / {"powod": nazwa, "od": ..., "do": ...}
+
+import os
+import datetime
+
+from core.intervals import IntervalIndex
+from core.store import get_store
+
+CALENDAR_FILE = "calendar.json"
+
+
+def as_date(data):
+    return datetime.date.fromisoformat(data) if isinstance(data, str) else data
+
+
+class CalendarIndex:
+    def __init__(self, calendar):
+        przedzialy = []
+
+        # nr = kolejność w pliku — przy nakładaniu wygrywa wcześniejszy wpis
+        for nr, (nazwa, wartosc) in enumerate((calendar or {}).get("swieta", {}).items()):
+
+            # Jednodniowe
+            if isinstance(wartosc, str):
+                przedzialy.append((wartosc, wartosc, (nr, wartosc, wartosc, {"powod": nazwa})))
+
+            # Wielodniowe
+            elif isinstance(wartosc, list) and len(wartosc) == 2:
+                od, do = wartosc
+                przedzialy.append((od, do, (nr, od, do, {"powod": nazwa, "od": od, "do": do})))
+
+        self.swieta = IntervalIndex(przedzialy)
+
+    def holiday(self, data):
+        """Święto / przerwa obejmująca `data` (bez weekendów) albo None."""
+        trafienia = self.swieta.overlapping(data, data)
+        return dict(min(trafienia, key=lambda p: p[0])[3]) if trafienia else None
+
+    def is_free(self, data):
+        """None dla dnia szkolnego, dict z powodem dla dnia wolnego."""
+        if as_date(data).weekday() >= 5:
+            return {"powod": "Weekend"}
+        return self.holiday(data)
+
+    def free_days_between(self, od, do):
+        """{date: powód} dla wszystkich dni wolnych w [od, do] — bez sprawdzania
+        dzień po dniu: tylko przedziały z indeksu i weekendy z arytmetyki dat."""
+        od, do = as_date(od), as_date(do)
+        wynik = {}
+
+        # święta: rozwijamy tylko przedziały mające część wspólną z zakresem
+        najlepszy = {}
+        for nr, start, koniec, info in self.swieta.overlapping(od, do):
+            d = max(od, as_date(start))
+            koniec = min(do, as_date(koniec))
+            while d <= koniec:
+                if d not in najlepszy or nr < najlepszy[d][0]:
+                    najlepszy[d] = (nr, info)
+                d += datetime.timedelta(days=1)
+
+        for d, (nr, info) in najlepszy.items():
+            wynik[d] = dict(info)
+
+        # weekendy nadpisują święta (tak jak w is_free)
+        # pierwsza sobota nie później niż `od` (żeby złapać niedzielę na początku)
+        sobota = od - datetime.timedelta(days=(od.weekday() - 5) % 7)
+        while sobota <= do:
+            for d in (sobota, sobota + datetime.timedelta(days=1)):
+                if od <= d <= do:
+                    wynik[d] = {"powod": "Weekend"}
+            sobota += datetime.timedelta(days=7)
+
+        return dict(sorted(wynik.items()))
+
+
+# ============================================================
+# INDEKS NA KATALOG — przebudowa tylko po zmianie calendar.json
+# ============================================================
+
+_cache = {}   # ścieżka → ((mtime_ns, rozmiar), CalendarIndex)
+
+
+def calendar_index(data_dir):
+    store = get_store(data_dir)
+    path = store.path(CALENDAR_FILE)
+
+    try:
+        st = os.stat(path)
+        klucz = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        klucz = None
+
+    wpis = _cache.get(path)
+    if wpis and wpis[0] == klucz:
+        return wpis[1]
+
+    indeks = CalendarIndex(store.calendar())
+    _cache[path] = (klucz, indeks)
+    return indeks
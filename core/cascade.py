@@ -0,0 +1,113 @@
+# 🔁 Zastępstwa kaskadowe — wspólne rozwiązanie jednej godziny lekcyjnej
+# Wejście: lekcje nieobecnych, których nie da się połączyć z klasą obecnego
+# nauczyciela. Każda lekcja może:
+#   "S"      — dostać zastępcę (wolnych nauczycieli jest `wolnych`),
+#   ("C", j) — dołączyć do klasy j, która sama dostała zastępcę (kaskada),
+#   "X"      — zostać odwołana.
+# Jeden zastępca obsługuje wtedy dwie klasy, a zwolniony nauczyciel bierze
+# kolejną lekcję. Przeszukiwanie z nawrotami i odcinaniem: najpierw liczba
+# pokrytych lekcji, potem jak najmniej łączeń (kaskada tylko gdy coś daje),
+# na końcu jak najwięcej zastępców przy lekcjach `premiowane` (te, które
+# w skojarzeniu z uprawnionymi wolnymi nauczycielami dostały zastępcę).
+# Budżet czasu — po jego upływie zwracane jest najlepsze znalezione rozwiązanie.
+
+import time
+
+# domyślny budżet czasu na jeden dzień
+BUDGET_MS = 200
+
+
+class _Timeout(Exception):
+    pass
+
+
+def evaluate(decyzje, premiowane=()):
+    """(pokryte, -łączenia, premiowane z zastępcą) dla listy decyzji — większe jest lepsze."""
+    pokryte = sum(1 for d in decyzje if d != "X")
+    laczenia = sum(1 for d in decyzje if isinstance(d, tuple))
+    trafione = sum(1 for i, d in enumerate(decyzje) if d == "S" and i in premiowane)
+    return pokryte, -laczenia, trafione
+
+
+def greedy(n, wolnych, premiowane=()):
+    """Rozwiązanie bez kaskad: zastępcy dla `wolnych` lekcji, premiowane najpierw."""
+    kolejnosc = sorted(range(n), key=lambda i: i not in premiowane)
+    z_zastepca = set(kolejnosc[:wolnych])
+    return ["S" if i in z_zastepca else "X" for i in range(n)]
+
+
+def solve_slot(n, sasiedzi, wolnych, deadline=None, premiowane=()):
+    """`sasiedzi[i]` — lekcje, do których klasy może dołączyć lekcja i,
+    `premiowane` — lekcje, którym przy remisie lepiej dać własnego zastępcę.
+    Zwraca (decyzje, pełne): `pełne` = False, gdy skończył się czas."""
+    premiowane = frozenset(premiowane)
+    najlepsze = greedy(n, wolnych, premiowane)
+    wynik = [evaluate(najlepsze, premiowane), najlepsze]
+
+    # nic do poprawienia: wszyscy obsadzeni albo brak możliwych kaskad
+    if n <= wolnych or wolnych == 0 or not any(sasiedzi):
+        return najlepsze, True
+
+    # najpierw lekcje z największą liczbą sąsiadów — dobre cele kaskad
+    kolejnosc = sorted(range(n), key=lambda i: -len(sasiedzi[i]))
+    decyzje = [None] * n
+    wymaga = [0] * n          # ile lekcji czeka na zastępcę w klasie i
+    licznik = [0]
+
+    def rec(k, uzyci, pokryte, laczenia, trafione):
+        licznik[0] += 1
+        if deadline is not None and licznik[0] % 256 == 0 and time.perf_counter() > deadline:
+            raise _Timeout
+
+        # górne ograniczenie: wszystkie pozostałe pokryte bez łączeń,
+        # każdy pozostały zastępca przy lekcji premiowanej
+        if (pokryte + n - k, -laczenia, trafione + min(n - k, wolnych - uzyci)) <= wynik[0]:
+            return
+
+        if k == n:
+            wynik[0] = (pokryte, -laczenia, trafione)
+            wynik[1] = list(decyzje)
+            return
+
+        i = kolejnosc[k]
+        premia = i in premiowane
+
+        # ktoś już dołączył do tej klasy → musi dostać zastępcę
+        if wymaga[i]:
+            if uzyci < wolnych:
+                decyzje[i] = "S"
+                rec(k + 1, uzyci + 1, pokryte + 1, laczenia, trafione + premia)
+            decyzje[i] = None
+            return
+
+        # 1) dołączenie do klasy, która już ma zastępcę (nic nie kosztuje)
+        gotowa = next((j for j in sasiedzi[i] if decyzje[j] == "S"), None)
+        if gotowa is not None:
+            decyzje[i] = ("C", gotowa)
+            rec(k + 1, uzyci, pokryte + 1, laczenia + 1, trafione)
+
+        # 2) własny zastępca
+        if uzyci < wolnych:
+            decyzje[i] = "S"
+            rec(k + 1, uzyci + 1, pokryte + 1, laczenia, trafione + premia)
+
+        # 3) dołączenie do klasy jeszcze nierozstrzygniętej (musi dostać zastępcę)
+        if gotowa is None:
+            for j in sasiedzi[i]:
+                if decyzje[j] is None:
+                    decyzje[i] = ("C", j)
+                    wymaga[j] += 1
+                    rec(k + 1, uzyci, pokryte + 1, laczenia + 1, trafione)
+                    wymaga[j] -= 1
+
+        # 4) odwołanie
+        decyzje[i] = "X"
+        rec(k + 1, uzyci, pokryte, laczenia, trafione)
+
+        decyzje[i] = None
+
+    try:
+        rec(0, 0, 0, 0, 0)
+    except _Timeout:
+        return wynik[1], False
+    return wynik[1], True
@@ -0,0 +1,40 @@
+# ⚖️ Sprawiedliwy rozkład zastępstw między dniami
+# Liczniki zastępstw na nauczyciela pochodzą z indeksu historii
+# (data/cache/zastepstwa_index.json, pole `zastepcy` każdego dnia) — nocne
+# uruchomienie nie czyta plików zastępstw, tylko sumuje okno ostatnich dni.
+# Dni wygenerowane w bieżącym uruchomieniu są dopisywane w pamięci (add()).
+
+import datetime
+
+from core.history import substitute_counts
+
+# ile dni wstecz liczy się do obciążenia
+WINDOW_DAYS = 28
+
+
+class LoadTally:
+    def __init__(self, historia, dni=WINDOW_DAYS):
+        self.historia = historia
+        self.okno = dni
+        self._nowe = {}      # dzień → {imie: liczba} z bieżącego uruchomienia
+
+    def add(self, dzien, zastepstwa):
+        """Dopisuje dzień (YYYY-MM-DD) wygenerowany w tym uruchomieniu."""
+        self._nowe[dzien] = substitute_counts(zastepstwa) if isinstance(zastepstwa, list) else {}
+
+    def day(self, dzien):
+        if dzien in self._nowe:
+            return self._nowe[dzien]
+        return self.historia.dni.get(dzien, {}).get("zastepcy", {})
+
+    def counts(self, data):
+        """{imie: liczba zastępstw} w oknie `okno` dni przed `data` (bez niej)."""
+        if isinstance(data, str):
+            data = datetime.date.fromisoformat(data)
+
+        suma = {}
+        for k in range(1, self.okno + 1):
+            dzien = (data - datetime.timedelta(days=k)).strftime("%Y-%m-%d")
+            for imie, n in self.day(dzien).items():
+                suma[imie] = suma.get(imie, 0) + n
+        return suma
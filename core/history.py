@@ -0,0 +1,111 @@
+# 🗂 Indeks historii zastępstw (data/cache/zastepstwa_index.json)
+# dzień → {ilosc, wolne, powod, zastepcy, mtime, rozmiar} — lista dni bez parsowania plików.
+# `zastepcy` — {imie: liczba zastępstw w tym dniu} (podstawa core/fairness.py).
+# Generator dopisuje dzień przy zapisie; sync() sprawdza tylko stat() plików
+# i parsuje jedynie te, które zmieniły się poza generatorem (lub są nowe).
+
+import os
+
+from core.store import get_store, ZASTEPSTWA
+
+INDEX_NAME = os.path.join("cache", "zastepstwa_index.json")
+# zmiana formatu skrótu → wszystkie dni parsowane ponownie (jednorazowo)
+INDEX_VERSION = 2
+
+
+def summarize(dane):
+    """Skrót jednego pliku dnia."""
+    if isinstance(dane, dict) and dane.get("status") == "wolne":
+        return {"ilosc": 0, "wolne": True, "powod": dane.get("powod", "")}
+    if not isinstance(dane, list):
+        return {"ilosc": 0, "wolne": False, "powod": ""}
+
+    skrot = {"ilosc": len(dane), "wolne": False, "powod": ""}
+    zastepcy = substitute_counts(dane)
+    if zastepcy:
+        skrot["zastepcy"] = zastepcy
+    return skrot
+
+
+def substitute_counts(zastepstwa):
+    """{imie: liczba zastępstw} dla listy wpisów jednego dnia."""
+    wynik = {}
+    for z in zastepstwa:
+        if isinstance(z, dict) and z.get("status") == "zastępstwo" and z.get("nauczyciel_zastepujacy"):
+            imie = z["nauczyciel_zastepujacy"]
+            wynik[imie] = wynik.get(imie, 0) + 1
+    return wynik
+
+
+class SubstitutionIndex:
+    def __init__(self, data_dir):
+        self.store = get_store(data_dir)
+        self.katalog = self.store.path(ZASTEPSTWA)
+
+        zapisany = self.store.load(INDEX_NAME)
+        if isinstance(zapisany, dict) and zapisany.get("wersja") == INDEX_VERSION:
+            self.dni = dict(zapisany.get("dni", {}))
+        else:
+            self.dni = {}
+        self._zmiany = False
+
+    # ============================================================
+    # AKTUALIZACJA
+    # ============================================================
+
+    def record(self, dzien, dane):
+        """Wpis dnia `dzien` (YYYY-MM-DD) po zapisaniu jego pliku."""
+        try:
+            st = os.stat(os.path.join(self.katalog, f"{dzien}.json"))
+            stat = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            stat = (None, None)
+
+        self.dni[dzien] = {**summarize(dane), "mtime": stat[0], "rozmiar": stat[1]}
+        self._zmiany = True
+
+    def sync(self):
+        """Dopasowuje indeks do katalogu: nowe / zmienione pliki są parsowane,
+        usunięte znikają. Niezmienione pliki kosztują tylko stat()."""
+        if not os.path.isdir(self.katalog):
+            obecne = {}
+        else:
+            obecne = {
+                e.name[:-5]: e for e in os.scandir(self.katalog)
+                if e.name.endswith(".json") and e.is_file()
+            }
+
+        for dzien in list(self.dni):
+            if dzien not in obecne:
+                del self.dni[dzien]
+                self._zmiany = True
+
+        for dzien, e in obecne.items():
+            st = e.stat()
+            wpis = self.dni.get(dzien)
+            if wpis and wpis.get("mtime") == st.st_mtime_ns and wpis.get("rozmiar") == st.st_size:
+                continue
+
+            dane = self.store.load(os.path.join(ZASTEPSTWA, e.name))
+            self.dni[dzien] = {**summarize(dane), "mtime": st.st_mtime_ns, "rozmiar": st.st_size}
+            self._zmiany = True
+
+        self.save()
+        return self
+
+    def save(self):
+        if self._zmiany:
+            self.store.save(INDEX_NAME, {"wersja": INDEX_VERSION, "dni": self.dni})
+            self._zmiany = False
+
+    # ============================================================
+    # ODCZYT
+    # ============================================================
+
+    def __len__(self):
+        return len(self.dni)
+
+    def page(self, offset=0, limit=60, newest_first=True):
+        """Wycinek historii: lista (dzień, skrót)."""
+        dni = sorted(self.dni, reverse=newest_first)[offset:offset + limit]
+        return [(d, self.dni[d]) for d in dni]
@@ -0,0 +1,141 @@
+# 📊 Pomiary generatorów: czasy faz, liczniki, szczyt pamięci
+# Włączane flagą --instrument albo zmienną ZASTEPSTWA_INSTRUMENT=1.
+# Wyłączone — phase() i count() nic nie robią (bez pomiaru czasu i pamięci).
+#
+# Raport: podsumowanie dla człowieka (summary(), trafia do logu) oraz JSON
+# obok plików wynikowych: data/zastepstwa/raporty/, data/plany/raporty/.
+
+import os
+import time
+import datetime
+import threading
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+ENV_FLAG = "ZASTEPSTWA_INSTRUMENT"
+RAPORTY = "raporty"
+
+
+# jeden pomiar pamięci naraz — tracemalloc i szczyt pamięci są wspólne dla procesu
+_POMIAR = threading.RLock()
+
+
+def enabled_by_env():
+    return os.environ.get(ENV_FLAG) == "1"
+
+
+@contextmanager
+def tracing(ramki=1):
+    """tracemalloc włączony na czas bloku. Pomiary z różnych wątków (raport
+    wydajności, profilowanie) czekają na siebie nawzajem — żaden nie wyłączy
+    tracemalloc drugiemu ani nie pomiesza mu szczytu pamięci. Zagnieżdżone
+    w tym samym wątku korzystają z jednego, zewnętrznego pomiaru."""
+    with _POMIAR:
+        wlasny = not tracemalloc.is_tracing()
+        if wlasny:
+            tracemalloc.start(ramki)
+        try:
+            yield
+        finally:
+            if wlasny:
+                tracemalloc.stop()
+
+
+class _Phase:
+    def __init__(self, instr, nazwa):
+        self.instr = instr
+        self.nazwa = nazwa
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+
+    def __exit__(self, *exc):
+        faza = self.instr.fazy.setdefault(self.nazwa, [0.0, 0])
+        faza[0] += time.perf_counter() - self.t0
+        faza[1] += 1
+        return False
+
+
+class Instrumentation:
+    def __init__(self, nazwa, enabled=None):
+        self.nazwa = nazwa
+        self.enabled = enabled_by_env() if enabled is None else enabled
+
+        self.fazy = {}           # nazwa → [sekundy, wywołania] (w kolejności pierwszego wejścia)
+        self.liczniki = {}
+        self.t0 = None
+        self.czas = None
+        self.pamiec = None
+        self._tracing = None
+
+    # ============================================================
+    # POMIAR
+    # ============================================================
+
+    def start(self):
+        if not self.enabled:
+            return self
+        self._tracing = tracing()
+        self._tracing.__enter__()
+        tracemalloc.reset_peak()
+        self.t0 = time.perf_counter()
+        return self
+
+    def phase(self, nazwa):
+        """`with instr.phase("zapis"): ...` — czas sumowany po wszystkich wejściach."""
+        return _Phase(self, nazwa) if self.enabled else nullcontext()
+
+    def count(self, nazwa, ile=1):
+        if self.enabled:
+            self.liczniki[nazwa] = self.liczniki.get(nazwa, 0) + ile
+
+    def stop(self):
+        if not self.enabled or self.t0 is None:
+            return self
+        self.czas = time.perf_counter() - self.t0
+        self.pamiec = tracemalloc.get_traced_memory()[1]
+        self.t0 = None
+        self._tracing.__exit__(None, None, None)
+        self._tracing = None
+        return self
+
+    # `with Instrumentation(...) as instr:` — stop() także po wyjątku/anulowaniu
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+    # ============================================================
+    # RAPORT
+    # ============================================================
+
+    def report(self):
+        return {
+            "generator": self.nazwa,
+            "czas": datetime.datetime.now().isoformat(timespec="seconds"),
+            "calkowity_ms": round((self.czas or 0) * 1000, 3),
+            "fazy": {
+                nazwa: {"ms": round(s * 1000, 3), "wywolania": n}
+                for nazwa, (s, n) in self.fazy.items()
+            },
+            "liczniki": dict(self.liczniki),
+            "pamiec_szczyt_mb": round((self.pamiec or 0) / 2 ** 20, 2)
+        }
+
+    def summary(self):
+        """Linie tekstu do logu."""
+        r = self.report()
+        linie = [f"📊 Raport wydajności ({self.nazwa}): {r['calkowity_ms']:.1f} ms, "
+                 f"szczyt pamięci {r['pamiec_szczyt_mb']} MB"]
+        for nazwa, f in r["fazy"].items():
+            udzial = f["ms"] / r["calkowity_ms"] if r["calkowity_ms"] else 0
+            linie.append(f"   ⏱ {nazwa:<16} {f['ms']:>10.1f} ms  {udzial:>5.0%}  ×{f['wywolania']}")
+        for nazwa, n in r["liczniki"].items():
+            linie.append(f"   🔢 {nazwa:<28} {n}")
+        return linie
+
+    def save(self, store, katalog, nazwa_pliku):
+        """Zapis raportu JSON do data/<katalog>/raporty/<nazwa_pliku>.json; zwraca ścieżkę."""
+        return store.save(os.path.join(katalog, RAPORTY, f"{nazwa_pliku}.json"), self.report(), delay=0)
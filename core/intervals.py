@@ -0,0 +1,58 @@
+# 📏 Indeks przedziałów dat
+# Posortowane początki + maksimum końców na prefiksie → zapytanie
+# "który przedział zawiera dzień X" przez bisekcję, także przy nakładaniu.
+
+from bisect import bisect_right
+
+
+def as_key(data):
+    """date / datetime.date / "YYYY-MM-DD" → "YYYY-MM-DD" (porządek leksykograficzny = chronologiczny)."""
+    return data if isinstance(data, str) else data.isoformat()
+
+
+class IntervalIndex:
+    """Niezmienny zbiór przedziałów [od, do] (włącznie) z dowolnym ładunkiem."""
+
+    def __init__(self, przedzialy):
+        przedzialy = sorted(przedzialy, key=lambda p: p[0])
+
+        self.starts = [p[0] for p in przedzialy]
+        self.ends = [p[1] for p in przedzialy]
+        self.payloads = [p[2] for p in przedzialy]
+
+        # max_end[i] = największy koniec wśród przedziałów 0..i
+        self.max_end = []
+        naj = None
+        for koniec in self.ends:
+            if naj is None or koniec > naj:
+                naj = koniec
+            self.max_end.append(naj)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def find(self, data):
+        """Ładunek przedziału zawierającego `data` (ostatnio rozpoczętego) albo None."""
+        x = as_key(data)
+        i = bisect_right(self.starts, x) - 1
+
+        while i >= 0 and self.max_end[i] >= x:
+            if self.ends[i] >= x:
+                return self.payloads[i]
+            i -= 1
+
+        return None
+
+    def overlapping(self, od, do):
+        """Ładunki wszystkich przedziałów mających część wspólną z [od, do]."""
+        a, b = as_key(od), as_key(do)
+        i = bisect_right(self.starts, b) - 1
+
+        wynik = []
+        while i >= 0 and self.max_end[i] >= a:
+            if self.ends[i] >= a:
+                wynik.append(self.payloads[i])
+            i -= 1
+
+        wynik.reverse()
+        return wynik
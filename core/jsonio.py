@@ -0,0 +1,185 @@
+# 🛡 Bezpieczny zapis JSON
+# ✔ zapis do pliku tymczasowego + fsync + rename — nigdy nie zostaje ucięty plik
+#   (z uprawnieniami dotychczasowego pliku — czyta go też serwer Node)
+# ✔ łączenie wielu zapisów z krótkiego okna w jeden (WriteBatcher);
+#   nieudany odłożony zapis zostaje w kolejce i jest ponawiany
+# ✔ opcjonalny zwarty format (bez wcięć) dla dużych plików planów i zastępstw
+
+import os, json, stat, atexit, tempfile, threading
+
+# umask procesu — os.umask() da się tylko odczytać przez ustawienie,
+# więc raz przy imporcie, a nie przy każdym zapisie z wielu wątków
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def dump_json(data, compact=False):
+    if compact:
+        tekst = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    else:
+        tekst = json.dumps(data, indent=2, ensure_ascii=False)
+    return tekst.encode("utf-8")
+
+
+def _fsync_dir(katalog):
+    # na Windows katalogu nie da się otworzyć — rename i tak jest atomowy
+    if os.name != "posix":
+        return
+    fd = os.open(katalog, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _file_mode(path):
+    """Uprawnienia dla nowej wersji pliku: dotychczasowe albo jak z open()."""
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except OSError:
+        return 0o666 & ~_UMASK
+
+
+def write_atomic(path, payload):
+    """Zapisuje bajty tak, że czytelnik widzi stary albo nowy plik — nigdy połowę."""
+    katalog = os.path.dirname(path) or "."
+    os.makedirs(katalog, exist_ok=True)
+
+    # mkstemp tworzy plik 0600, a rename zachowuje uprawnienia pliku tymczasowego
+    fd, tmp = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=katalog)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            if hasattr(os, "fchmod"):
+                os.fchmod(f.fileno(), _file_mode(path))
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+    _fsync_dir(katalog)
+
+
+def write_json_atomic(path, data, compact=False):
+    write_atomic(path, dump_json(data, compact))
+
+
+# ============================================================
+# ŁĄCZENIE ZAPISÓW
+# ============================================================
+
+class WriteBatcher:
+    """Odkłada zapisy na `delay` sekund; kolejny zapis tego samego pliku
+    w tym oknie zastępuje poprzedni, a na dysk trafia tylko ostatni.
+
+    Dane są serializowane od razu w schedule() — późniejsze zmiany
+    współdzielonego obiektu nie trafią do pliku w połowie. Nieudany zapis
+    zostaje w kolejce i jest ponawiany; błąd odbiera take_errors()."""
+
+    # najdłuższa przerwa między ponowieniami nieudanego zapisu [s]
+    RETRY_MAX = 5.0
+
+    def __init__(self, delay=0.25, on_written=None, on_error=None):
+        self.delay = delay
+        self.on_written = on_written   # callback(path, data) po zapisie
+        self.on_error = on_error       # callback(path, wyjątek) po nieudanym zapisie
+        self._pending = {}             # path → (data, bajty)
+        self._inflight = {}            # path → data, właśnie zapisywane
+        self._failures = {}            # path → liczba nieudanych prób z rzędu
+        self._errors = {}              # path → wyjątek, jeszcze nie odebrany
+        self._timer = None
+        self._lock = threading.RLock()
+        self._io_lock = threading.Lock()
+        atexit.register(self.flush)
+
+    def schedule(self, path, data, compact=False):
+        payload = dump_json(data, compact)
+        with self._lock:
+            self._pending[path] = (data, payload)
+            self._arm(self.delay)
+
+    def _arm(self, delay):
+        # wołane pod _lock
+        if self._timer is None:
+            self._timer = threading.Timer(delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def pending(self, path):
+        """(True, dane) jeśli plik czeka na zapis, inaczej (False, None)."""
+        with self._lock:
+            if path in self._pending:
+                return True, self._pending[path][0]
+            if path in self._inflight:
+                return True, self._inflight[path]
+        return False, None
+
+    def write_now(self, path, data, compact=False):
+        """Zapis natychmiastowy (wyjątek leci do wołającego); zastępuje
+        ewentualny odłożony zapis tego samego pliku."""
+        with self._io_lock:
+            self.discard(path)
+            write_json_atomic(path, data, compact)
+
+    def discard(self, path):
+        with self._lock:
+            self._pending.pop(path, None)
+            self._failures.pop(path, None)
+            self._errors.pop(path, None)
+
+    def take_errors(self):
+        """dict path → wyjątek dla zapisów, które się nie udały (każdy zgłaszany raz)."""
+        with self._lock:
+            bledy, self._errors = self._errors, {}
+        return bledy
+
+    def flush(self, path=None):
+        # _io_lock porządkuje zapisy; _lock chroni tylko kolejkę,
+        # więc callback może bezpiecznie sięgać po własne blokady
+        with self._io_lock:
+            with self._lock:
+                if self._timer is not None and path is None:
+                    self._timer.cancel()
+                    self._timer = None
+
+                if path is None:
+                    do_zapisu, self._pending = self._pending, {}
+                elif path in self._pending:
+                    do_zapisu = {path: self._pending.pop(path)}
+                else:
+                    do_zapisu = {}
+                self._inflight = {p: d for p, (d, _) in do_zapisu.items()}
+
+            for p, (data, payload) in do_zapisu.items():
+                try:
+                    write_atomic(p, payload)
+                except Exception as e:
+                    self._failed(p, data, payload, e)
+                    continue
+
+                with self._lock:
+                    self._inflight.pop(p, None)
+                    self._failures.pop(p, None)
+                    self._errors.pop(p, None)
+                if self.on_written:
+                    self.on_written(p, data)
+
+    def _failed(self, path, data, payload, blad):
+        with self._lock:
+            self._inflight.pop(path, None)
+            # nowszy zapis tego pliku już czeka → ten jest nieaktualny
+            self._pending.setdefault(path, (data, payload))
+            proby = self._failures[path] = self._failures.get(path, 0) + 1
+            if proby == 1:
+                self._errors[path] = blad
+            self._arm(min(self.delay * 2 ** proby, self.RETRY_MAX))
+
+        if proby == 1:
+            print(f"❌ Błąd zapisu {path}: {blad} — ponowię próbę")
+        if self.on_error:
+            self.on_error(path, blad)
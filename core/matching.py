@@ -0,0 +1,144 @@
+# 🔗 Przydział zastępców jako skojarzenie w grafie dwudzielnym
+# Jedna godzina lekcyjna = jeden graf: lekcje do zastąpienia ↔ wolni nauczyciele
+# uprawnieni do danej lekcji (każda lekcja ma własny zbiór kandydatów).
+# Hopcroft–Karp daje skojarzenie maksymalne (najwięcej obsadzonych lekcji),
+# a nauczyciel nie dostaje dwóch klas naraz.
+#
+# Kolejność kandydatów każdej lekcji decyduje, które z wielu maksymalnych
+# skojarzeń zostanie wybrane: domyślnie od najmniej obciążonych w tym dniu,
+# zastepstwa.py podaje ranking kwalifikacji z core/ranking.py.
+
+from collections import deque
+
+
+def hopcroft_karp(adj, n_right):
+    """`adj[u]` — sąsiedzi lewego wierzchołka u (indeksy prawych, od najlepszego).
+    Zwraca listę: lewy → prawy albo -1."""
+    n_left = len(adj)
+    match_l = [-1] * n_left
+    match_r = [-1] * n_right
+
+    # start zachłanny w kolejności preferencji
+    for u in range(n_left):
+        for v in adj[u]:
+            if match_r[v] == -1:
+                match_l[u] = v
+                match_r[v] = u
+                break
+
+    while True:
+        # BFS: warstwy od wolnych lewych wierzchołków
+        dist = [-1] * n_left
+        q = deque()
+        for u in range(n_left):
+            if match_l[u] == -1:
+                dist[u] = 0
+                q.append(u)
+
+        znaleziono = False
+        while q:
+            u = q.popleft()
+            for v in adj[u]:
+                w = match_r[v]
+                if w == -1:
+                    znaleziono = True
+                elif dist[w] == -1:
+                    dist[w] = dist[u] + 1
+                    q.append(w)
+
+        if not znaleziono:
+            return match_l
+
+        # DFS (iteracyjnie — bez limitu rekurencji) po ścieżkach powiększających
+        nastepny = [0] * n_left
+        przez = [-1] * n_left
+
+        for s in range(n_left):
+            if match_l[s] != -1:
+                continue
+
+            stos = [s]
+            while stos:
+                u = stos[-1]
+                if nastepny[u] == len(adj[u]):
+                    dist[u] = -1        # ślepy zaułek w tej fazie
+                    stos.pop()
+                    continue
+
+                v = adj[u][nastepny[u]]
+                nastepny[u] += 1
+                w = match_r[v]
+
+                if w == -1:
+                    przez[u] = v
+                    for x in stos:
+                        match_l[x] = przez[x]
+                        match_r[przez[x]] = x
+                    break
+
+                if dist[w] == dist[u] + 1:
+                    przez[u] = v
+                    stos.append(w)
+
+
+def assign_slot(kandydaci, obciazenie=None, klucze=None):
+    """`kandydaci[i]` — imiona nauczycieli mogących wziąć lekcję i.
+    `klucze[i]` — klucz sortowania kandydatów lekcji i (mniejszy = lepszy);
+    domyślnie liczba zastępstw w tym dniu.
+    Zwraca listę imię | None; `obciazenie` (imię → liczba zastępstw) jest aktualizowane."""
+    if obciazenie is None:
+        obciazenie = {}
+
+    prawi = {}
+    adj = []
+    for i, lista in enumerate(kandydaci):
+        # stabilnie: przy remisie zostaje dotychczasowa kolejność
+        klucz = klucze[i] if klucze else (lambda imie: obciazenie.get(imie, 0))
+        kolejnosc = sorted(lista, key=klucz)
+        adj.append([prawi.setdefault(imie, len(prawi)) for imie in kolejnosc])
+
+    imiona = list(prawi)
+    wynik = [
+        imiona[v] if v != -1 else None
+        for v in hopcroft_karp(adj, len(imiona))
+    ]
+
+    for imie in wynik:
+        if imie is not None:
+            obciazenie[imie] = obciazenie.get(imie, 0) + 1
+    return wynik
+
+
+# ============================================================
+# STATYSTYKI POKRYCIA
+# ============================================================
+
+def coverage(zastepstwa):
+    """Podsumowanie listy zastępstw jednego dnia (format data/zastepstwa/*.json)."""
+    statusy = {}
+    obciazenie = {}
+    for z in zastepstwa:
+        statusy[z["status"]] = statusy.get(z["status"], 0) + 1
+        if z["status"] == "zastępstwo":
+            imie = z["nauczyciel_zastepujacy"]
+            obciazenie[imie] = obciazenie.get(imie, 0) + 1
+
+    lekcje = len(zastepstwa)
+    pokryte = lekcje - statusy.get("odwołane", 0)
+    return {
+        "lekcje": lekcje,
+        "pokryte": pokryte,
+        "procent": round(100 * pokryte / lekcje, 1) if lekcje else 100.0,
+        "zastepstwa": statusy.get("zastępstwo", 0),
+        "laczenia": statusy.get("łączenie", 0),
+        "odwolane": statusy.get("odwołane", 0),
+        "zastepcy": len(obciazenie),
+        "max_na_osobe": max(obciazenie.values(), default=0)
+    }
+
+
+def format_coverage(stat):
+    return (f"📈 Pokrycie: {stat['pokryte']}/{stat['lekcje']} ({stat['procent']}%) — "
+            f"zastępstwa {stat['zastepstwa']}, łączenia {stat['laczenia']}, "
+            f"odwołane {stat['odwolane']}; zastępców {stat['zastepcy']}, "
+            f"najwięcej na osobę {stat['max_na_osobe']}")
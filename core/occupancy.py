@@ -0,0 +1,60 @@
+# 🗂 Indeks zajętości planów lekcji
+# Budowany raz na uruchomienie z data/plany/*.json, daje odpowiedź
+# "czy nauczyciel X ma lekcję w dniu D o godzinie G" w czasie O(1).
+# Dane trzyma Timetable (liczby zamiast napisów); słowniki lekcji powstają
+# dopiero przy zapytaniu, tylko dla zwracanych lekcji.
+
+from core.timetable import Timetable, EMPTY
+
+
+class OccupancyIndex:
+    """Indeks zajętości: (dzień, godzina) → lekcje oraz nauczyciel → lekcje."""
+
+    def __init__(self, plany):
+        # słownik planów z JSON albo gotowy Timetable
+        tt = plany if isinstance(plany, Timetable) else Timetable.from_plans(plany)
+        self.timetable = tt
+
+        # (dzien_idx, slot) → [(klasa_id, nauczyciel_id, k), ...] w kolejności klas;
+        # k — numer lekcji klasy w tej godzinie (kilka grup naraz)
+        self.by_slot = {}
+        # nauczyciel_id → {dzien_idx: [(klasa_id, slot, k), ...]}
+        self.by_teacher = {}
+        # {(nauczyciel_id, dzien_idx, slot)}
+        self.zajete = set()
+
+        puste = {t for t, imie in enumerate(tt.nauczyciele.names) if not imie}
+
+        for c, d, s, k, t in tt.entries():
+            if t == EMPTY or t in puste:
+                continue
+            self.by_slot.setdefault((d, s), []).append((c, t, k))
+            self.by_teacher.setdefault(t, {}).setdefault(d, []).append((c, s, k))
+            self.zajete.add((t, d, s))
+
+    def _ids(self, dzien, godzina):
+        return self.timetable.dzien_idx.get(dzien), self.timetable.slot_idx.get(godzina)
+
+    def _lesson(self, c, d, s, k):
+        tt = self.timetable
+        return tt.klasy.names[c], tt.lesson(c, d, s, k)
+
+    # ============================================================
+    # ZAPYTANIA
+    # ============================================================
+
+    def is_busy(self, nauczyciel, dzien, godzina):
+        d, s = self._ids(dzien, godzina)
+        t = self.timetable.nauczyciele.get(nauczyciel)
+        return t != EMPTY and (t, d, s) in self.zajete
+
+    def lessons_at(self, dzien, godzina):
+        """Lekcje (klasa, lekcja) prowadzone w danym dniu o danej godzinie."""
+        d, s = self._ids(dzien, godzina)
+        return [self._lesson(c, d, s, k) for c, _, k in self.by_slot.get((d, s), [])]
+
+    def lessons_of(self, nauczyciel, dzien):
+        """Lekcje (klasa, lekcja) nauczyciela w danym dniu."""
+        t = self.timetable.nauczyciele.get(nauczyciel)
+        d = self.timetable.dzien_idx.get(dzien)
+        return [self._lesson(c, d, s, k) for c, s, k in self.by_teacher.get(t, {}).get(d, [])]
@@ -0,0 +1,98 @@
+# 🔬 Profilowanie generatorów: cProfile + tracemalloc
+# Uruchamia generator pod profilerem i zapisuje w data/profiles/:
+#   <nazwa>-<czas>.prof      — statystyki cProfile (pstats, snakeviz, ...)
+#   <nazwa>-<czas>.snapshot  — zrzut alokacji tracemalloc (Snapshot.load)
+# Do logu trafiają najdroższe funkcje (czas skumulowany) i największe
+# miejsca alokacji — do diagnozy wolnych przebiegów na danych szkoły.
+
+import os
+import datetime
+import cProfile
+import pstats
+import tracemalloc
+
+from core.instrumentation import tracing
+
+PROFILES = "profiles"
+
+# ile pozycji pokazać w logu
+TOP_N = 15
+
+# głębokość stosu zapisywana przy każdej alokacji
+RAMKI = 25
+
+# alokacje samego profilera i importów nie są interesujące
+_POMIJANE = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def _short_path(sciezka):
+    """Ścieżka względem katalogu roboczego, jeśli leży wewnątrz niego."""
+    try:
+        wzgledna = os.path.relpath(sciezka)
+    except ValueError:
+        return sciezka
+    return sciezka if wzgledna.startswith("..") else wzgledna
+
+
+# ============================================================
+# PODSUMOWANIE
+# ============================================================
+
+def top_functions(profiler, top=TOP_N):
+    """Linie logu: funkcje o największym czasie skumulowanym."""
+    stats = pstats.Stats(profiler).stats
+    wiersze = sorted(stats.items(), key=lambda x: -x[1][3])[:top]
+
+    linie = [f"🔬 Najdroższe funkcje (czas skumulowany, top {len(wiersze)}):"]
+    for (plik, linia, funkcja), (_, wywolania, wlasny, skumulowany, _) in wiersze:
+        miejsce = funkcja if plik == "~" else f"{funkcja} ({_short_path(plik)}:{linia})"
+        linie.append(f"   {skumulowany * 1000:>10.1f} ms  {wlasny * 1000:>9.1f} ms  ×{wywolania:<8} {miejsce}")
+    return linie
+
+
+def top_allocations(snapshot, top=TOP_N):
+    """Linie logu: miejsca w kodzie, które zaalokowały najwięcej pamięci."""
+    statystyki = snapshot.statistics("lineno")[:top]
+
+    linie = [f"🧠 Największe alokacje (top {len(statystyki)}):"]
+    for s in statystyki:
+        ramka = s.traceback[0]
+        linie.append(f"   {s.size / 2 ** 10:>10.1f} KiB  ×{s.count:<8} {_short_path(ramka.filename)}:{ramka.lineno}")
+    return linie
+
+
+# ============================================================
+# URUCHOMIENIE
+# ============================================================
+
+def profile_call(data_dir, nazwa, func, args=(), kwargs=None, log=print, top=TOP_N):
+    """Wywołuje func(*args, **kwargs) pod cProfile i tracemalloc.
+    Po udanym przebiegu zapisuje .prof i .snapshot w data/profiles/
+    i wypisuje podsumowanie przez `log`. Zwraca wynik func."""
+    profiler = cProfile.Profile()
+
+    # tracing() — profilowane i mierzone przebiegi z innych zakładek idą po kolei,
+    # więc naraz działa tylko jeden profiler i nikt nie wyłączy tracemalloc w trakcie
+    with tracing(RAMKI):
+        profiler.enable()
+        try:
+            wynik = func(*args, **(kwargs or {}))
+        finally:
+            profiler.disable()
+        snapshot = tracemalloc.take_snapshot().filter_traces(_POMIJANE)
+
+    katalog = os.path.join(data_dir, PROFILES)
+    os.makedirs(katalog, exist_ok=True)
+    baza = os.path.join(katalog, f"{nazwa}-{datetime.datetime.now():%Y%m%d-%H%M%S}")
+    profiler.dump_stats(baza + ".prof")
+    snapshot.dump(baza + ".snapshot")
+
+    for linia in top_functions(profiler, top) + top_allocations(snapshot, top):
+        log(linia)
+    log(f"📁 Profil: {baza}.prof, {baza}.snapshot")
+    return wynik
@@ -0,0 +1,95 @@
+# 🎯 Ranking zastępców według kwalifikacji
+# Indeksy odwrócone budowane RAZ z nauczyciele.json (i etapy.json):
+#   przedmiot → nauczyciele, specjalizacja → nauczyciele,
+#   klasa → nauczyciele (pole "klasy"), etap → nauczyciele.
+# Ocena lekcji (klasa, przedmiot) liczona raz i zapamiętywana — przy rankingu
+# sprawdzani są tylko wolni kandydaci, bez przeglądania wszystkich nauczycieli.
+# qualified() — twardy filtr: kto w ogóle ma uprawnienia do danej lekcji.
+
+# punkty za dopasowanie; obciazenie — kara za każde zastępstwo w tym dniu,
+# historia — za każde zastępstwo z ostatnich tygodni (core/fairness.py)
+WAGI = {
+    "przedmiot": 4,
+    "specjalizacja": 3,
+    "klasa": 2,
+    "etap": 1,
+    "obciazenie": 2,
+    "historia": 0.5
+}
+
+
+class QualificationIndex:
+    def __init__(self, nauczyciele, etapy=None, wagi=None):
+        self.wagi = {**WAGI, **(wagi or {})}
+
+        self.po_przedmiocie = {}
+        self.po_specjalizacji = {}
+        self.po_klasie = {}
+        self.po_etapie = {}
+        self.wszystkie_etapy = set()     # bez etapu albo etap 0 — uczą na każdym
+
+        for n in nauczyciele:
+            imie = n["imie"]
+            if n.get("przedmiot"):
+                self.po_przedmiocie.setdefault(n["przedmiot"], set()).add(imie)
+            if n.get("specjalizacja"):
+                self.po_specjalizacji.setdefault(n["specjalizacja"], set()).add(imie)
+            for klasa in n.get("klasy") or []:
+                self.po_klasie.setdefault(klasa, set()).add(imie)
+            if n.get("etap") is not None:
+                self.po_etapie.setdefault(str(n["etap"]), set()).add(imie)
+            if not n.get("etap"):
+                self.wszystkie_etapy.add(imie)
+
+        # klasa → etap (jak class_etap w plans.py: domyślnie 1)
+        self.etap_klasy = {}
+        for eid, info in (etapy or {}).items():
+            for klasa in info.get("klasy", []):
+                self.etap_klasy.setdefault(klasa, str(eid))
+
+        self._oceny = {}
+        self._uprawnieni = {}
+
+    # ============================================================
+    # OCENA
+    # ============================================================
+
+    def fit(self, klasa, przedmiot):
+        """{imie: punkty} dla nauczycieli pasujących do lekcji (reszta ma 0)."""
+        klucz = (klasa, przedmiot)
+        if klucz in self._oceny:
+            return self._oceny[klucz]
+
+        w = self.wagi
+        oceny = {}
+        for zbior, punkty in (
+            (self.po_przedmiocie.get(przedmiot, ()), w["przedmiot"]),
+            (self.po_specjalizacji.get(przedmiot, ()), w["specjalizacja"]),
+            (self.po_klasie.get(klasa, ()), w["klasa"]),
+            (self.po_etapie.get(self.etap_klasy.get(klasa, "1"), ()), w["etap"])
+        ):
+            for imie in zbior:
+                oceny[imie] = oceny.get(imie, 0) + punkty
+
+        self._oceny[klucz] = oceny
+        return oceny
+
+    def qualified(self, klasa, przedmiot):
+        """Nauczyciele uprawnieni do lekcji: uczą przedmiotu (przedmiot albo
+        specjalizacja) na etapie klasy."""
+        klucz = (klasa, przedmiot)
+        if klucz not in self._uprawnieni:
+            przedmiotowi = self.po_przedmiocie.get(przedmiot, set()) | self.po_specjalizacji.get(przedmiot, set())
+            etap = self.po_etapie.get(self.etap_klasy.get(klasa, "1"), set()) | self.wszystkie_etapy
+            self._uprawnieni[klucz] = frozenset(przedmiotowi & etap)
+        return self._uprawnieni[klucz]
+
+    def sort_key(self, klasa, przedmiot, obciazenie, historia=None):
+        """Klucz sortowania kandydatów (mniejszy = lepszy) dla assign_slot.
+        `historia` — {imie: zastępstwa z ostatnich tygodni}."""
+        oceny = self.fit(klasa, przedmiot)
+        kara = self.wagi["obciazenie"]
+        kara_h = self.wagi["historia"]
+        historia = historia or {}
+        return lambda imie: (kara * obciazenie.get(imie, 0) + kara_h * historia.get(imie, 0)
+                             - oceny.get(imie, 0))
@@ -0,0 +1,357 @@
+# 🧩 Silnik układania planów lekcji — wszystkie klasy naraz
+# ✔ globalna mapa zajętości nauczyciel × dzień × godzina (bitmapa w int)
+# ✔ przebieg zachłanny + naprawa lokalna (łańcuchy przesunięć)
+# ✔ raport: ile lekcji nie udało się rozmieścić bez konfliktu
+# ✔ niezależne grupy klas (bez wspólnych nauczycieli) liczone równolegle
+
+import os, random, time, zlib
+from concurrent.futures import ProcessPoolExecutor
+
+from core.busy import iter_bits
+
+WYCHOWAWCZA = "Wychowawcza"
+
+
+def class_seed(seed, klasa):
+    """Stałe ziarno klasy — niezależne od kolejności i liczby procesów."""
+    return zlib.crc32(f"{seed}:{klasa}".encode("utf-8"))
+
+
+class TimetableScheduler:
+    """Układa lekcje (klasa, przedmiot, nauczyciel) w siatce dni × godzin tak,
+    by żaden nauczyciel ani klasa nie mieli dwóch lekcji naraz."""
+
+    def __init__(self, dni, godziny, seed=None, glebokosc=2, max_kandydatow=12):
+        self.dni = dni
+        self.godziny = godziny
+        self.S = len(godziny)
+        self.FULL = (1 << (len(dni) * self.S)) - 1
+        self.rng = random.Random(seed)
+        self.glebokosc = glebokosc
+        self.max_kandydatow = max_kandydatow
+
+        self.lekcje = []           # [klasa, przedmiot, nauczyciel_obj, bit|None]
+        self.priorytety = []       # losowy klucz kolejności każdej lekcji
+        self.maska_klasy = {}      # klasa → bitmapa zajętych godzin
+        self.maska_nauczyciela = {}  # imie → bitmapa zajętych godzin
+        self.slot_klasy = {}       # klasa → {bit: lekcja}
+        self.slot_nauczyciela = {}   # imie → {bit: lekcja}
+        self.na_dzien = {}         # klasa → [liczba lekcji w dniu]
+        self.przedmiot_dnia = {}   # (klasa, dzien, przedmiot) → liczba
+
+    # ============================================================
+    # DANE WEJŚCIOWE
+    # ============================================================
+
+    def add_class(self, klasa):
+        self.maska_klasy.setdefault(klasa, 0)
+        self.slot_klasy.setdefault(klasa, {})
+        self.na_dzien.setdefault(klasa, [0] * len(self.dni))
+
+    def add_lesson(self, klasa, przedmiot, nauczyciel, priorytet=0.0):
+        self.add_class(klasa)
+        imie = nauczyciel["imie"]
+        self.maska_nauczyciela.setdefault(imie, 0)
+        self.slot_nauczyciela.setdefault(imie, {})
+        self.lekcje.append([klasa, przedmiot, nauczyciel, None])
+        self.priorytety.append(priorytet)
+
+    def block(self, imie, dzien_idx, slot):
+        """Zajętość z zewnątrz (np. plan innej klasy, którego nie przebudowujemy)."""
+        self.maska_nauczyciela[imie] = self.maska_nauczyciela.get(imie, 0) | (1 << (dzien_idx * self.S + slot))
+        self.slot_nauczyciela.setdefault(imie, {})
+
+    # ============================================================
+    # OPERACJE NA SIATCE
+    # ============================================================
+
+    def _place(self, lekcja, bit):
+        klasa, przedmiot, nauc, _ = lekcja
+        imie = nauc["imie"]
+        d = bit // self.S
+
+        lekcja[3] = bit
+        self.maska_klasy[klasa] |= 1 << bit
+        self.maska_nauczyciela[imie] |= 1 << bit
+        self.slot_klasy[klasa][bit] = lekcja
+        self.slot_nauczyciela[imie][bit] = lekcja
+        self.na_dzien[klasa][d] += 1
+        klucz = (klasa, d, przedmiot)
+        self.przedmiot_dnia[klucz] = self.przedmiot_dnia.get(klucz, 0) + 1
+
+    def _remove(self, lekcja):
+        klasa, przedmiot, nauc, bit = lekcja
+        imie = nauc["imie"]
+        d = bit // self.S
+
+        lekcja[3] = None
+        self.maska_klasy[klasa] &= ~(1 << bit)
+        self.maska_nauczyciela[imie] &= ~(1 << bit)
+        del self.slot_klasy[klasa][bit]
+        del self.slot_nauczyciela[imie][bit]
+        self.na_dzien[klasa][d] -= 1
+        self.przedmiot_dnia[(klasa, d, przedmiot)] -= 1
+
+        return bit
+
+    def _best_bit(self, lekcja, wolne):
+        """Najlepsza wolna godzina: przedmiot nie powtarza się w dniu,
+        dni wypełniane równomiernie, lekcje od rana (bez okienek)."""
+        klasa, przedmiot = lekcja[0], lekcja[1]
+        na_dzien = self.na_dzien[klasa]
+
+        najlepszy, wynik = None, None
+        for bit in iter_bits(wolne):
+            d, s = divmod(bit, self.S)
+            ocena = (self.przedmiot_dnia.get((klasa, d, przedmiot), 0), na_dzien[d], s)
+            if wynik is None or ocena < wynik:
+                najlepszy, wynik = bit, ocena
+
+        return najlepszy
+
+    def _free_bits(self, lekcja):
+        klasa, imie = lekcja[0], lekcja[2]["imie"]
+        return ~(self.maska_klasy[klasa] | self.maska_nauczyciela[imie]) & self.FULL
+
+    # ============================================================
+    # NAPRAWA — łańcuch przesunięć (ejection chain)
+    # ============================================================
+
+    def _try_place(self, lekcja, glebokosc, zablokowane):
+        wolne = self._free_bits(lekcja)
+        if wolne:
+            self._place(lekcja, self._best_bit(lekcja, wolne))
+            return True
+
+        if glebokosc == 0:
+            return False
+
+        klasa, imie = lekcja[0], lekcja[2]["imie"]
+        maska_k = self.maska_klasy[klasa]
+        maska_n = self.maska_nauczyciela[imie]
+
+        kandydaci = []
+        # klasa wolna, nauczyciel zajęty gdzie indziej → przesuń tamtą lekcję
+        for bit in iter_bits(~maska_k & maska_n & self.FULL):
+            inna = self.slot_nauczyciela[imie].get(bit)
+            if inna is not None:
+                kandydaci.append((bit, inna))
+        # nauczyciel wolny, klasa ma inną lekcję → przesuń lekcję klasy
+        for bit in iter_bits(maska_k & ~maska_n & self.FULL):
+            kandydaci.append((bit, self.slot_klasy[klasa][bit]))
+
+        self.rng.shuffle(kandydaci)
+
+        for bit, inna in kandydaci[:self.max_kandydatow]:
+            if id(inna) in zablokowane:
+                continue
+
+            self._remove(inna)
+            self._place(lekcja, bit)
+
+            if self._try_place(inna, glebokosc - 1, zablokowane | {id(lekcja)}):
+                return True
+
+            self._remove(lekcja)
+            self._place(inna, bit)
+
+        return False
+
+    # ============================================================
+    # URUCHOMIENIE
+    # ============================================================
+
+    def run(self, max_rund=5):
+        start = time.perf_counter()
+
+        # najbardziej obciążeni nauczyciele najpierw
+        obciazenie = {}
+        for lekcja in self.lekcje:
+            imie = lekcja[2]["imie"]
+            obciazenie[imie] = obciazenie.get(imie, 0) + 1
+
+        kolejnosc = sorted(
+            range(len(self.lekcje)),
+            key=lambda i: (-obciazenie[self.lekcje[i][2]["imie"]], self.priorytety[i])
+        )
+        kolejnosc = [self.lekcje[i] for i in kolejnosc]
+
+        # 1) przebieg zachłanny
+        nierozmieszczone = []
+        for lekcja in kolejnosc:
+            wolne = self._free_bits(lekcja)
+            if wolne:
+                self._place(lekcja, self._best_bit(lekcja, wolne))
+            else:
+                nierozmieszczone.append(lekcja)
+
+        po_zachlannym = len(nierozmieszczone)
+
+        # 2) naprawa lokalna
+        for _ in range(max_rund):
+            if not nierozmieszczone:
+                break
+
+            self.rng.shuffle(nierozmieszczone)
+            zostaly = [
+                l for l in nierozmieszczone
+                if not self._try_place(l, self.glebokosc, frozenset())
+            ]
+
+            if len(zostaly) == len(nierozmieszczone):
+                break
+            nierozmieszczone = zostaly
+
+        return {
+            "lekcje": len(self.lekcje),
+            "po_zachlannym": po_zachlannym,
+            "konflikty": len(nierozmieszczone),
+            "nierozmieszczone": [(l[0], l[1], l[2]["imie"]) for l in nierozmieszczone],
+            "czas": time.perf_counter() - start,
+        }
+
+    # ============================================================
+    # WYNIK — format data/plany/<klasa>.json
+    # ============================================================
+
+    def plan(self, klasa):
+        plan = {
+            d: [
+                {
+                    "godzina": h,
+                    "przedmiot": None,
+                    "sala": None,
+                    "nauczyciel": None
+                }
+                for h in self.godziny
+            ] for d in self.dni
+        }
+
+        for bit, (_, przedmiot, nauc, _) in self.slot_klasy.get(klasa, {}).items():
+            d, s = divmod(bit, self.S)
+            plan[self.dni[d]][s] = {
+                "godzina": self.godziny[s],
+                "przedmiot": przedmiot,
+                "sala": nauc.get("sala", None),
+                "nauczyciel": nauc.get("imie", None)
+            }
+
+        return plan
+
+
+# ============================================================
+# 🏫 PLANY WSZYSTKICH KLAS
+# ============================================================
+
+def class_groups(klasy, class_teachers):
+    """Grupy klas połączone wspólnymi nauczycielami (w tym wychowawcą).
+    Grupy nie wpływają na siebie, więc można je układać osobno."""
+
+    rodzic = {k: k for k in klasy}
+
+    def find(k):
+        while rodzic[k] != k:
+            rodzic[k] = rodzic[rodzic[k]]
+            k = rodzic[k]
+        return k
+
+    pierwsza_klasa = {}
+    for klasa in klasy:
+        imiona = [n["imie"] for n in class_teachers.get(klasa, {}).values()]
+        if klasy[klasa].get("wychowawca"):
+            imiona.append(klasy[klasa]["wychowawca"])
+
+        for imie in imiona:
+            if imie in pierwsza_klasa:
+                rodzic[find(klasa)] = find(pierwsza_klasa[imie])
+            else:
+                pierwsza_klasa[imie] = klasa
+
+    grupy = {}
+    for klasa in klasy:
+        grupy.setdefault(find(klasa), []).append(klasa)
+
+    return sorted((sorted(g) for g in grupy.values()), key=lambda g: g[0])
+
+
+def schedule_group(zadanie):
+    """Układa jedną grupę klas (funkcja modułu — wywoływana też w procesach)."""
+    grupa, klasy, class_teachers, przedmioty, nauczyciele_po_imieniu, dni, godziny, seed, zajete = zadanie
+
+    sched = TimetableScheduler(dni, godziny, seed=class_seed(seed, grupa[0]))
+
+    for imie, d, slot in zajete:
+        sched.block(imie, d, slot)
+
+    for klasa in grupa:
+        sched.add_class(klasa)
+        rng = random.Random(class_seed(seed, klasa))
+
+        for subject, nauc in class_teachers.get(klasa, {}).items():
+            for _ in range(przedmioty[subject].get("godziny", 1)):
+                sched.add_lesson(klasa, subject, nauc, rng.random())
+
+        # lekcja wychowawcza
+        wych_obj = nauczyciele_po_imieniu.get(klasy[klasa].get("wychowawca"))
+        if wych_obj:
+            sched.add_lesson(klasa, WYCHOWAWCZA, wych_obj, rng.random())
+
+    raport = sched.run()
+    return {klasa: sched.plan(klasa) for klasa in grupa}, raport
+
+
+def schedule_plans(klasy, class_teachers, przedmioty, nauczyciele, dni, godziny,
+                   seed=None, workers=1, zajete=()):
+    """Układa plany wszystkich klas. Zwraca (plany, raport).
+
+    Wynik zależy tylko od `seed` — liczba procesów (`workers`) nie ma na
+    niego wpływu, bo każda grupa klas ma własne ziarno.
+    `zajete` — (imie, indeks_dnia, slot) zajęte przez plany spoza `klasy`."""
+
+    start = time.perf_counter()
+
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+
+    nauczyciele_po_imieniu = {n["imie"]: n for n in nauczyciele}
+    grupy = class_groups(klasy, class_teachers)
+
+    zajete_nauczyciela = {}
+    for imie, d, slot in zajete:
+        zajete_nauczyciela.setdefault(imie, []).append((imie, d, slot))
+
+    zadania = []
+    for grupa in grupy:
+        imiona = {n["imie"] for k in grupa for n in class_teachers.get(k, {}).values()}
+        imiona.update(klasy[k].get("wychowawca") for k in grupa)
+        zadania.append((
+            grupa,
+            {k: klasy[k] for k in grupa},
+            {k: class_teachers.get(k, {}) for k in grupa},
+            przedmioty,
+            {i: nauczyciele_po_imieniu[i] for i in imiona if i in nauczyciele_po_imieniu},
+            dni, godziny, seed,
+            [z for i in imiona for z in zajete_nauczyciela.get(i, ())]
+        ))
+
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(zadania) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(zadania))) as pool:
+            wyniki = list(pool.map(schedule_group, zadania))
+    else:
+        wyniki = [schedule_group(z) for z in zadania]
+
+    plany = {}
+    raport = {"lekcje": 0, "po_zachlannym": 0, "konflikty": 0,
+              "nierozmieszczone": [], "grupy": len(grupy), "seed": seed}
+
+    for plany_grupy, r in wyniki:
+        plany.update(plany_grupy)
+        for klucz in ("lekcje", "po_zachlannym", "konflikty"):
+            raport[klucz] += r[klucz]
+        raport["nierozmieszczone"] += r["nierozmieszczone"]
+
+    raport["czas"] = time.perf_counter() - start
+
+    # kolejność jak w klasy.json
+    return {k: plany[k] for k in klasy.keys()}, raport
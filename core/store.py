@@ -0,0 +1,215 @@
+# 💾 Wspólna warstwa dostępu do katalogu data/
+# ✔ cache w pamięci sprawdzany po (mtime, rozmiar) — niezmieniony plik nie jest parsowany ponownie
+# ✔ akcesory dla każdego rodzaju danych (nauczyciele, klasy, przedmioty, plany, kalendarz…)
+# ✔ jedna ścieżka zapisu — atomowa (tmp + fsync + rename), opcjonalnie odkładana
+#   i łączona w jeden zapis, po zapisie cache od razu zawiera nowe dane
+# ✔ tryb zwarty (bez wcięć) dla plików planów i zastępstw: ZASTEPSTWA_COMPACT_JSON=1
+#
+# Zwracane obiekty są współdzielone przez wszystkich użytkowników magazynu:
+# wolno je zmieniać tylko wtedy, gdy zaraz potem wywołuje się save().
+
+import os, json, threading
+
+from core.jsonio import WriteBatcher
+
+PLANY = "plany"
+ZASTEPSTWA = "zastepstwa"
+
+# katalogi z dużymi plikami, które w trybie zwartym zapisujemy bez wcięć
+COMPACT_DIRS = (PLANY, ZASTEPSTWA)
+
+
+class DataStore:
+    def __init__(self, data_dir, compact=None, write_delay=0):
+        # ścieżka bezwzględna — plan_path() i save() nie sklejają katalogu dwa razy
+        self.data_dir = os.path.abspath(data_dir)
+        self._cache = {}   # ścieżka → (mtime_ns, rozmiar, dane)
+        self._lock = threading.RLock()
+
+        if compact is None:
+            compact = os.environ.get("ZASTEPSTWA_COMPACT_JSON") == "1"
+        self.compact = compact
+
+        # > 0 → zapisy odkładane o tyle sekund i łączone (np. w menu)
+        self.write_delay = write_delay
+        self._batcher = WriteBatcher(on_written=self._written)
+
+    # ============================================================
+    # ŚCIEŻKI
+    # ============================================================
+
+    def path(self, name):
+        # znormalizowana — "menu/../data/x.json" i "<abs>/data/x.json" to ten sam
+        # klucz w cache i w kolejce zapisów
+        return os.path.abspath(os.path.join(self.data_dir, name))
+
+    def plan_path(self, klasa):
+        return self.path(os.path.join(PLANY, f"{klasa}.json"))
+
+    # ============================================================
+    # ODCZYT / ZAPIS
+    # ============================================================
+
+    def load(self, name, default=None, cache=True):
+        """Zawartość pliku JSON; `default` gdy pliku brak lub jest uszkodzony.
+        `cache=False` — wynik nie zostaje w pamięci (np. przy budowie Timetable)."""
+        path = self.path(name)
+
+        # zapis jeszcze czeka w kolejce → to są najnowsze dane
+        czeka, data = self._batcher.pending(path)
+        if czeka:
+            return data
+
+        try:
+            st = os.stat(path)
+        except OSError:
+            with self._lock:
+                self._cache.pop(path, None)
+            return default
+
+        with self._lock:
+            wpis = self._cache.get(path)
+            if wpis and wpis[0] == st.st_mtime_ns and wpis[1] == st.st_size:
+                return wpis[2]
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"❌ Błąd podczas wczytywania {path}: {e}")
+            return default
+
+        if cache:
+            with self._lock:
+                self._cache[path] = (st.st_mtime_ns, st.st_size, data)
+
+        return data
+
+    def is_compact(self, path, compact=False):
+        if not (self.compact or compact):
+            return False
+        wzgledna = os.path.relpath(path, self.data_dir)
+        return wzgledna.split(os.sep)[0] in COMPACT_DIRS
+
+    def save(self, name, data, delay=None, compact=False):
+        """Zapisuje plik atomowo. Przy `delay` > 0 (domyślnie `write_delay`)
+        zapis jest odkładany, a kolejne zapisy tego pliku w tym czasie łączone.
+        `compact=True` — tryb zwarty tylko dla tego zapisu (np. generator z --compact)."""
+        path = self.path(name)
+        delay = self.write_delay if delay is None else delay
+        compact = self.is_compact(path, compact)
+
+        if delay > 0:
+            self._batcher.delay = delay
+            self._batcher.schedule(path, data, compact)
+            return path
+
+        try:
+            self._batcher.write_now(path, data, compact)
+        except Exception:
+            with self._lock:
+                self._cache.pop(path, None)
+            raise
+
+        self._written(path, data)
+        return path
+
+    def _written(self, path, data):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return
+        with self._lock:
+            self._cache[path] = (st.st_mtime_ns, st.st_size, data)
+
+    def flush(self):
+        """Zapisuje od razu wszystkie odłożone pliki (np. przed uruchomieniem generatora)."""
+        self._batcher.flush()
+
+    def write_errors(self):
+        """dict ścieżka → wyjątek dla odłożonych zapisów, które się nie udały.
+        Takie pliki zostają w kolejce i są zapisywane ponownie."""
+        return self._batcher.take_errors()
+
+    def delete(self, name):
+        path = self.path(name)
+        self._batcher.discard(path)
+        with self._lock:
+            self._cache.pop(path, None)
+            os.remove(path)
+
+    def invalidate(self, name=None):
+        with self._lock:
+            if name is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(self.path(name), None)
+
+    # ============================================================
+    # AKCESORY
+    # ============================================================
+
+    def _typed(self, name, typ):
+        data = self.load(name)
+        return data if isinstance(data, typ) else typ()
+
+    def nauczyciele(self):
+        """list — nauczyciele.json"""
+        return self._typed("nauczyciele.json", list)
+
+    def klasy(self):
+        """dict klasa → {wychowawca, uczniowie} — klasy.json"""
+        return self._typed("klasy.json", dict)
+
+    def przedmioty(self):
+        """dict przedmiot → {godziny, klasy, etapy} — przedmioty.json"""
+        return self._typed("przedmioty.json", dict)
+
+    def etapy(self):
+        """dict etap → {klasy} — etapy.json"""
+        return self._typed("etapy.json", dict)
+
+    def szkola(self):
+        """dict — szkola.json"""
+        return self._typed("szkola.json", dict)
+
+    def calendar(self):
+        """dict {title, opis, swieta} — calendar.json"""
+        return self._typed("calendar.json", dict)
+
+    def plan_names(self):
+        """Nazwy klas, dla których istnieje plik w data/plany/."""
+        katalog = self.path(PLANY)
+        if not os.path.isdir(katalog):
+            return []
+        return [f[:-5] for f in os.listdir(katalog) if f.endswith(".json")]
+
+    def plan(self, klasa):
+        """dict dzien → [lekcje] — plany/<klasa>.json"""
+        return self._typed(self.plan_path(klasa), dict)
+
+    def plany(self):
+        """dict klasa → plan dla wszystkich plików w data/plany/."""
+        return {k: self.plan(k) for k in self.plan_names()}
+
+    def save_plan(self, klasa, plan, compact=False):
+        return self.save(self.plan_path(klasa), plan, compact=compact)
+
+    def delete_plan(self, klasa):
+        self.delete(self.plan_path(klasa))
+
+
+# ============================================================
+# JEDEN MAGAZYN NA KATALOG (wspólny dla zakładek i generatorów)
+# ============================================================
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(data_dir):
+    klucz = os.path.realpath(data_dir)
+    with _stores_lock:
+        if klucz not in _stores:
+            _stores[klucz] = DataStore(data_dir)
+        return _stores[klucz]
@@ -0,0 +1,265 @@
+# 🧮 Zwarty plan lekcji wszystkich klas
+# Nazwy (klasy, nauczyciele, przedmioty, sale) zamieniane na liczby (interning),
+# a plan to płaskie tablice `array` o kształcie klasy × dni × godziny:
+#   teacher / subject / room — id albo EMPTY (-1), present — czy w JSON jest wpis lekcji.
+# Zamiast tysięcy słowników po 4 napisy: 13 bajtów na komórkę siatki.
+# Rzadkie przypadki poza tablicami (nic z pliku nie ginie):
+#   extra   — kolejne lekcje tej samej godziny (np. grupy językowe),
+#   outside — wpisy z dniem albo godziną spoza osi siatki.
+#
+# load_timetable / save_timetable — odczyt i zapis w dotychczasowym formacie
+# data/plany/<klasa>.json (wpisy lekcji w dniu układane według godziny).
+# plans.py wpisuje nowe plany do siatki z planami klas bez zmian i zapisuje je stąd.
+
+from array import array
+
+EMPTY = -1
+
+# kolejność dni w plikach planów
+DNI = ["poniedzialek", "wtorek", "sroda", "czwartek", "piatek", "sobota", "niedziela"]
+
+
+def slot_key(godzina):
+    """"8:00-8:45" → minuty początku (do sortowania godzin lekcyjnych)."""
+    try:
+        h, m = godzina.split("-")[0].strip().split(":")
+        return int(h) * 60 + int(m), godzina
+    except (AttributeError, ValueError):
+        return 10 ** 6, str(godzina)
+
+
+class Interner:
+    """Dwustronne mapowanie nazwa ↔ kolejne liczby całkowite."""
+
+    def __init__(self, nazwy=()):
+        self.ids = {}
+        self.names = []
+        for n in nazwy:
+            self.id(n)
+
+    def id(self, nazwa):
+        """Id nazwy (dodaje nową); None → EMPTY."""
+        if nazwa is None:
+            return EMPTY
+        i = self.ids.get(nazwa)
+        if i is None:
+            i = self.ids[nazwa] = len(self.names)
+            self.names.append(nazwa)
+        return i
+
+    def get(self, nazwa):
+        """Id bez dodawania — EMPTY dla nieznanej nazwy."""
+        return self.ids.get(nazwa, EMPTY)
+
+    def name(self, i):
+        return None if i == EMPTY else self.names[i]
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, nazwa):
+        return nazwa in self.ids
+
+
+class Timetable:
+    def __init__(self, dni, godziny):
+        self.dni = list(dni)
+        self.godziny = list(godziny)
+        self.D = len(self.dni)
+        self.S = len(self.godziny)
+
+        self.dzien_idx = {d: i for i, d in enumerate(self.dni)}
+        self.slot_idx = {g: i for i, g in enumerate(self.godziny)}
+
+        self.klasy = Interner()
+        self.nauczyciele = Interner()
+        self.przedmioty = Interner()
+        self.sale = Interner()
+
+        self.teacher = array("i")
+        self.subject = array("i")
+        self.room = array("i")
+        self.present = array("b")      # 1 = w JSON jest wpis tej godziny
+        self.days = array("b")         # klasa × dzień: 1 = dzień jest w pliku
+
+        self.extra = {}                # indeks komórki → [(teacher, subject, room)] kolejnych lekcji
+        self.outside = {}              # klasa_id → {dzien: [wpisy JSON spoza osi]}
+
+    # ============================================================
+    # BUDOWA
+    # ============================================================
+
+    def add_class(self, klasa):
+        if klasa in self.klasy:
+            return self.klasy.get(klasa)
+
+        komorki = self.D * self.S
+        self.teacher.extend([EMPTY] * komorki)
+        self.subject.extend([EMPTY] * komorki)
+        self.room.extend([EMPTY] * komorki)
+        self.present.extend([0] * komorki)
+        self.days.extend([0] * self.D)
+        return self.klasy.id(klasa)
+
+    def index(self, c, d, s):
+        return (c * self.D + d) * self.S + s
+
+    def set_plan(self, klasa, plan):
+        """Wpisuje plan klasy w formacie JSON. Kilka lekcji o tej samej godzinie
+        trafia do `extra`, dni i godziny spoza osi — do `outside`."""
+        c = self.add_class(klasa)
+        baza = c * self.D * self.S
+
+        for i in range(baza, baza + self.D * self.S):
+            self.teacher[i] = self.subject[i] = self.room[i] = EMPTY
+            self.present[i] = 0
+            self.extra.pop(i, None)
+        for d in range(self.D):
+            self.days[c * self.D + d] = 0
+        self.outside.pop(c, None)
+
+        for dzien, lekcje in (plan or {}).items():
+            d = self.dzien_idx.get(dzien)
+            if d is not None:
+                self.days[c * self.D + d] = 1
+
+            for lekcja in lekcje:
+                s = self.slot_idx.get(lekcja.get("godzina"))
+                if d is None or s is None:
+                    self.outside.setdefault(c, {}).setdefault(dzien, []).append(dict(lekcja))
+                    continue
+
+                wpis = (
+                    self.nauczyciele.id(lekcja.get("nauczyciel")),
+                    self.przedmioty.id(lekcja.get("przedmiot")),
+                    self.sale.id(lekcja.get("sala"))
+                )
+                i = baza + d * self.S + s
+                if self.present[i]:
+                    self.extra.setdefault(i, []).append(wpis)
+                    continue
+                self.present[i] = 1
+                self.teacher[i], self.subject[i], self.room[i] = wpis
+
+        return c
+
+    @classmethod
+    def from_plans(cls, plany, dni=None, godziny=None):
+        """Oś dni i godzin wyznaczana z samych planów, jeśli nie podano."""
+        if dni is None or godziny is None:
+            wszystkie_dni, wszystkie_godziny = set(), set()
+            for plan in plany.values():
+                for dzien, lekcje in (plan or {}).items():
+                    wszystkie_dni.add(dzien)
+                    wszystkie_godziny.update(l.get("godzina") for l in lekcje if l.get("godzina"))
+
+            if dni is None:
+                dni = sorted(wszystkie_dni, key=lambda d: (DNI.index(d) if d in DNI else len(DNI), d))
+            if godziny is None:
+                godziny = sorted(wszystkie_godziny, key=slot_key)
+
+        tt = cls(dni, godziny)
+        for klasa, plan in plany.items():
+            if isinstance(plan, dict):
+                tt.set_plan(klasa, plan)
+        return tt
+
+    # ============================================================
+    # ODCZYT
+    # ============================================================
+
+    def _entries(self, i):
+        """(teacher, subject, room) wszystkich lekcji komórki i, w kolejności z pliku."""
+        if not self.present[i]:
+            return []
+        return [(self.teacher[i], self.subject[i], self.room[i])] + self.extra.get(i, [])
+
+    def lesson(self, c, d, s, k=0):
+        """k-ty wpis lekcji tej godziny jako słownik JSON (None, gdy go nie ma)."""
+        wpisy = self._entries(self.index(c, d, s))
+        if k >= len(wpisy):
+            return None
+        t, p, r = wpisy[k]
+        return {
+            "godzina": self.godziny[s],
+            "przedmiot": self.przedmioty.name(p),
+            "sala": self.sale.name(r),
+            "nauczyciel": self.nauczyciele.name(t)
+        }
+
+    def plan(self, klasa):
+        """Plan klasy w formacie data/plany/<klasa>.json."""
+        c = self.klasy.get(klasa)
+        if c == EMPTY:
+            return {}
+
+        poza = self.outside.get(c, {})
+        plan = {}
+        for d, dzien in enumerate(self.dni):
+            if not self.days[c * self.D + d]:
+                continue
+            lekcje = [
+                self.lesson(c, d, s, k)
+                for s in range(self.S)
+                for k in range(len(self._entries(self.index(c, d, s))))
+            ]
+            # godziny spoza osi — na swoje miejsce według początku lekcji
+            if poza.get(dzien):
+                lekcje = sorted(lekcje + [dict(l) for l in poza[dzien]],
+                                key=lambda l: slot_key(l.get("godzina")))
+            plan[dzien] = lekcje
+
+        for dzien, lekcje in poza.items():
+            if dzien not in self.dzien_idx:
+                plan[dzien] = [dict(l) for l in lekcje]
+        return plan
+
+    def entries(self):
+        """(klasa_id, dzien_idx, slot, k, nauczyciel_id) dla każdej lekcji na osi;
+        k — numer lekcji w tej godzinie (0, a dla kilku grup 1, 2…)."""
+        DS = self.D * self.S
+        for i, present in enumerate(self.present):
+            if present:
+                c, reszta = divmod(i, DS)
+                d, s = divmod(reszta, self.S)
+                yield c, d, s, 0, self.teacher[i]
+                for k, (t, _, _) in enumerate(self.extra.get(i, ()), 1):
+                    yield c, d, s, k, t
+
+    def lessons(self):
+        """(klasa_id, dzien_idx, slot, nauczyciel_id) dla każdej lekcji z nauczycielem."""
+        for c, d, s, _, t in self.entries():
+            if t != EMPTY:
+                yield c, d, s, t
+
+    def busy_slots(self):
+        """(imie, indeks_dnia, slot) zajęte w planach — wejście dla schedulera."""
+        imiona = self.nauczyciele.names
+        return [(imiona[t], d, s) for _, d, s, t in self.lessons() if imiona[t]]
+
+
+# ============================================================
+# ODCZYT / ZAPIS data/plany/
+# ============================================================
+
+def load_timetable(store, klasy=None, dni=None, godziny=None):
+    """Plany klas (domyślnie wszystkich z data/plany/) jako Timetable.
+    Pliki nie zostają w pamięci podręcznej magazynu — tylko tablice."""
+    klasy = store.plan_names() if klasy is None else list(klasy)
+
+    if dni is None or godziny is None:
+        plany = {k: store.load(store.plan_path(k), {}, cache=False) for k in klasy}
+        return Timetable.from_plans(plany, dni, godziny)
+
+    tt = Timetable(dni, godziny)
+    for k in klasy:
+        tt.set_plan(k, store.load(store.plan_path(k), {}, cache=False))
+    return tt
+
+
+def save_timetable(store, tt, klasy=None, compact=False):
+    """Zapisuje plany klas (domyślnie wszystkich z siatki); zwraca listę klas."""
+    klasy = list(tt.klasy.names if klasy is None else klasy)
+    for klasa in klasy:
+        store.save_plan(klasa, tt.plan(klasa), compact=compact)
+    return klasy
@@ -2,7 +2,10 @@
 # 🧰 ZastepstwaUI 2.0 — Menu główne (Python + Tkinter)
 # Autor: Kacper
 
-import sys, os
+import sys, os, time, importlib, traceback
+
+# początek startu — do pomiaru czasu otwarcia okna
+T0 = time.perf_counter()
 
 # Ustaw ROOT = katalog główny projektu
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
@@ -12,18 +15,34 @@ if ROOT not in sys.path:
 import tkinter as tk
 from tkinter import ttk, messagebox
 
-# === Zakładki UI ===
-from menu.ui.classes_tab import ClassesTab
-from menu.ui.teachers_tab import TeachersTab
-from menu.ui.subjects_tab import SubjectsTab
-from menu.ui.plans_tab import PlansTab
-from menu.ui.zast_tab import ZastepstwaTab
-from menu.ui.version_manager_tab import VersionManagerTab
+from core.store import get_store
+from menu.utils.tasks import TaskScheduler
 
 # === Ścieżki ===
 ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
 DATA_DIR = os.path.join(ROOT_DIR, "..", "data")
 
+# zapisy z menu odkładane o tyle sekund — seria kliknięć to jeden zapis pliku
+WRITE_DELAY = 0.25
+
+# co tyle ms menu sprawdza, czy odłożone zapisy się udały
+WRITE_CHECK_MS = 1000
+
+# okno powinno się pojawić w tym czasie — dłuższy start jest zgłaszany
+STARTUP_TARGET_MS = 1500
+
+# === Zakładki UI ===
+# (tytuł, moduł, klasa, czy dostaje wspólny TaskScheduler)
+# Moduł importowany i zakładka budowana dopiero przy pierwszym wybraniu.
+TABS = [
+    ("Klasy", "menu.ui.classes_tab", "ClassesTab", False),
+    ("Nauczyciele", "menu.ui.teachers_tab", "TeachersTab", False),
+    ("Przedmioty", "menu.ui.subjects_tab", "SubjectsTab", False),
+    ("Plany lekcji", "menu.ui.plans_tab", "PlansTab", True),
+    ("Zastępstwa", "menu.ui.zast_tab", "ZastepstwaTab", True),
+    ("Aktualizacje", "menu.ui.version_manager_tab", "VersionManagerTab", True),
+]
+
 def ensure_dirs():
     """Tworzy katalogi data/ oraz data/plany/ jeśli nie istnieją."""
     if not os.path.isdir(DATA_DIR):
@@ -48,6 +67,12 @@ class MainApp:
         except:
             pass
 
+        # === Zadania w tle (pliki, generatory, sieć) ===
+        self.tasks = TaskScheduler(root)
+
+        # czas budowy każdej zakładki [ms]
+        self.tab_times = {}
+
         # === Notebook (zakładki) ===
         self.tabs = ttk.Notebook(root)
         self.tabs.pack(fill="both", expand=True)
@@ -55,27 +80,129 @@ class MainApp:
         # === Dodanie zakładek ===
         self.load_tabs()
 
-    def load_tabs(self):
-        """Ładuje wszystkie zakładki menu."""
+        # === Błędy odłożonych zapisów (zgłaszane z wątku zapisu) ===
+        self.store = get_store(DATA_DIR)
+        self.root.after(WRITE_CHECK_MS, self.check_write_errors)
 
-        ClassesTab(self.tabs, DATA_DIR)
-        TeachersTab(self.tabs, DATA_DIR)
-        SubjectsTab(self.tabs, DATA_DIR)
-        PlansTab(self.tabs, DATA_DIR)
-        ZastepstwaTab(self.tabs, DATA_DIR)
-        VersionManagerTab(self.tabs, DATA_DIR)
+    def load_tabs(self):
+        """Rejestruje zakładki menu — na razie tylko puste ramki z tytułami.
+        Prawdziwa zakładka powstaje przy pierwszym wybraniu."""
+
+        self.lazy = {}           # ramka zastępcza → (moduł, klasa, tasks)
+        for tytul, modul, klasa, z_zadaniami in TABS:
+            ramka = ttk.Frame(self.tabs)
+            self.tabs.add(ramka, text=tytul)
+            self.lazy[str(ramka)] = (modul, klasa, z_zadaniami)
+
+        self.tabs.bind("<<NotebookTabChanged>>", self.on_tab_changed)
+        self.on_tab_changed()
+
+    def on_tab_changed(self, event=None):
+        wybrana = self.tabs.select()
+        if wybrana in self.lazy:
+            self.build_tab(wybrana)
+
+    def build_tab(self, ramka):
+        """Buduje zakładkę w miejscu ramki zastępczej. Przy błędzie ramka
+        zostaje z opisem błędu — kolejne wybranie zakładki próbuje ponownie."""
+        if ramka not in self.lazy:
+            return
+        modul, klasa, z_zadaniami = self.lazy[ramka]
+        indeks = self.tabs.index(ramka)
+        przed = set(self.tabs.tabs())
+
+        t0 = time.perf_counter()
+        try:
+            cls = getattr(importlib.import_module(modul), klasa)
+            if z_zadaniami:
+                cls(self.tabs, DATA_DIR, tasks=self.tasks)
+            else:
+                cls(self.tabs, DATA_DIR)
+        except Exception as e:
+            traceback.print_exc()
+            # zakładka mogła już dodać swoją ramkę do notesu — usuwamy niedokończoną
+            for nowa in set(self.tabs.tabs()) - przed:
+                self.tabs.forget(nowa)
+                self.root.nametowidget(nowa).destroy()
+            self.show_tab_error(ramka, e)
+            return
+
+        del self.lazy[ramka]
+        self.tab_times[klasa] = (time.perf_counter() - t0) * 1000
+
+        # zakładka dodała się na końcu — przenosimy ją na miejsce zastępczej
+        nowa = self.tabs.tabs()[-1]
+        self.tabs.insert(indeks, nowa)
+        self.tabs.select(nowa)
+        self.tabs.forget(ramka)
+
+    def show_tab_error(self, ramka, blad):
+        """Opis błędu i przycisk ponowienia w ramce zastępczej."""
+        tytul = self.tabs.tab(ramka, "text")
+        widget = self.root.nametowidget(ramka)
+        for w in widget.winfo_children():
+            w.destroy()
+
+        ttk.Label(widget, text=f"❌ Nie udało się otworzyć zakładki „{tytul}”:\n{blad}",
+                  justify="center").pack(pady=20)
+        ttk.Button(widget, text="Spróbuj ponownie",
+                   command=lambda: self.build_tab(ramka)).pack()
+
+        messagebox.showerror(
+            "Błąd zakładki",
+            f"Nie udało się otworzyć zakładki „{tytul}”:\n{blad}\n\n"
+            "Sprawdź pliki w katalogu data/ i spróbuj ponownie."
+        )
+
+    def check_write_errors(self):
+        bledy = self.store.write_errors()
+        if bledy:
+            pliki = "\n".join(f"• {os.path.basename(p)}: {e}" for p, e in bledy.items())
+            messagebox.showerror(
+                "Błąd zapisu",
+                f"Nie udało się zapisać zmian:\n{pliki}\n\n"
+                "Zmiany są w pamięci — zapis będzie ponawiany. "
+                "Sprawdź, czy plik nie jest otwarty w innym programie."
+            )
+        self.root.after(WRITE_CHECK_MS, self.check_write_errors)
+
+
+def report_startup(app, tylko_pomiar=False):
+    """Czas od uruchomienia do pokazania okna; przy --startup-time zamyka menu."""
+    app.root.update_idletasks()
+    czas = (time.perf_counter() - T0) * 1000
+    zakladki = ", ".join(f"{k} {ms:.0f} ms" for k, ms in app.tab_times.items())
+    print(f"⏱ Start menu: {czas:.0f} ms (cel {STARTUP_TARGET_MS} ms; {zakladki})")
+    if czas > STARTUP_TARGET_MS:
+        print("⚠️ Start menu dłuższy niż cel")
+    if tylko_pomiar:
+        app.startup_ok = czas <= STARTUP_TARGET_MS
+        app.root.quit()
 
 
 def main():
+    # --startup-time: zmierz czas otwarcia okna i zakończ (kod 1 gdy ponad cel)
+    tylko_pomiar = "--startup-time" in sys.argv[1:]
+
     ensure_dirs()
 
+    store = get_store(DATA_DIR)
+    store.write_delay = WRITE_DELAY
+
     root = tk.Tk()
     app = MainApp(root)
+    root.after_idle(report_startup, app, tylko_pomiar)
 
     try:
         root.mainloop()
     except KeyboardInterrupt:
         print("Zamknięto aplikację.")
+    finally:
+        app.tasks.shutdown()
+        store.flush()
+
+    if tylko_pomiar:
+        sys.exit(0 if getattr(app, "startup_ok", False) else 1)
 
 
 if __name__ == "__main__":
@@ -1,26 +1,16 @@
 import os
-import json
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
 
-
-def load_json(path):
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except:
-        return {}
-
-
-def save_json(path, data):
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+from core.store import get_store
+from menu.ui.virtual_tree import VirtualTree
 
 
 class ClassesTab:
     def __init__(self, notebook, data_dir):
         self.data_dir = data_dir
         self.file = os.path.join(data_dir, "klasy.json")
+        self.store = get_store(data_dir)
 
         frame = ttk.Frame(notebook)
         notebook.add(frame, text="Klasy")
@@ -29,7 +19,7 @@ class ClassesTab:
                   font=("Segoe UI", 14, "bold")).pack(pady=10)
 
         cols = ("klasa", "wychowawca", "uczniowie")
-        self.tree = ttk.Treeview(frame, columns=cols, show="headings", height=18)
+        self.tree = VirtualTree(frame, columns=cols, height=18)
 
         self.tree.heading("klasa", text="Klasa")
         self.tree.heading("wychowawca", text="Wychowawca")
@@ -63,17 +53,23 @@ class ClassesTab:
     # ŁADOWANIE
     # =======================
     def load(self):
-        for row in self.tree.get_children():
-            self.tree.delete(row)
+        klasy = self.store.klasy()
 
-        klasy = load_json(self.file)
+        self.tree.set_rows((klasa, self.row_values(klasa, data)) for klasa, data in klasy.items())
 
-        for klasa, data in klasy.items():
-            self.tree.insert("", "end", values=(
-                klasa,
-                data.get("wychowawca", "—"),
-                len(data.get("uczniowie", []))
-            ))
+    def row_values(self, klasa, data):
+        return (klasa, data.get("wychowawca", "—"), len(data.get("uczniowie", [])))
+
+    # =======================
+    # JEDEN WIERSZ PO EDYCJI
+    # =======================
+    def refresh_class(self, klasa, klasy):
+        """Podmienia, dodaje albo usuwa wiersz klasy — reszta tabeli bez zmian."""
+        data = klasy.get(klasa)
+        if data is None:
+            self.tree.delete(klasa)
+        else:
+            self.tree.upsert(klasa, self.row_values(klasa, data))
 
     # =======================
     # GET SELECTED
@@ -95,7 +91,7 @@ class ClassesTab:
         if not klasa:
             return
 
-        klasy = load_json(self.file)
+        klasy = self.store.klasy()
         uczniowie = klasy[klasa]["uczniowie"]
 
         win = tk.Toplevel()
@@ -137,7 +133,7 @@ class ClassesTab:
                 messagebox.showerror("Błąd", "Klasa musi mieć nazwę!")
                 return
 
-            klasy = load_json(self.file)
+            klasy = self.store.klasy()
 
             if name in klasy:
                 messagebox.showerror("Błąd", "Taka klasa już istnieje!")
@@ -148,8 +144,8 @@ class ClassesTab:
                 "uczniowie": []
             }
 
-            save_json(self.file, klasy)
-            self.load()
+            self.store.save(self.file, klasy)
+            self.refresh_class(name, klasy)
             win.destroy()
 
         ttk.Button(win, text="Zapisz", command=save_class).pack(pady=10)
@@ -162,7 +158,7 @@ class ClassesTab:
         if not klasa:
             return
 
-        klasy = load_json(self.file)
+        klasy = self.store.klasy()
         data = klasy.get(klasa)
 
         win = tk.Toplevel()
@@ -180,8 +176,8 @@ class ClassesTab:
             new_teacher = entry_teacher.get().strip()
             klasy[klasa]["wychowawca"] = new_teacher
 
-            save_json(self.file, klasy)
-            self.load()
+            self.store.save(self.file, klasy)
+            self.refresh_class(klasa, klasy)
             win.destroy()
 
         ttk.Button(win, text="Zapisz", command=save_edit).pack(pady=10)
@@ -197,11 +193,11 @@ class ClassesTab:
         if not messagebox.askyesno("Usuń klasę", f"Czy na pewno usunąć klasę {klasa}?"):
             return
 
-        klasy = load_json(self.file)
+        klasy = self.store.klasy()
         klasy.pop(klasa, None)
 
-        save_json(self.file, klasy)
-        self.load()
+        self.store.save(self.file, klasy)
+        self.refresh_class(klasa, klasy)
 
     # =======================
     # DODAJ UCZNIA
@@ -211,15 +207,15 @@ class ClassesTab:
         if not klasa:
             return
 
-        klasy = load_json(self.file)
+        klasy = self.store.klasy()
 
         name = simpledialog.askstring("Dodaj ucznia", "Podaj imię i nazwisko ucznia:")
         if not name:
             return
 
         klasy[klasa]["uczniowie"].append(name)
-        save_json(self.file, klasy)
-        self.load()
+        self.store.save(self.file, klasy)
+        self.refresh_class(klasa, klasy)
 
     # =======================
     # USUŃ UCZNIA
@@ -229,7 +225,7 @@ class ClassesTab:
         if not klasa:
             return
 
-        klasy = load_json(self.file)
+        klasy = self.store.klasy()
         uczniowie = klasy[klasa]["uczniowie"]
 
         if not uczniowie:
@@ -256,8 +252,8 @@ class ClassesTab:
             uczniowie.pop(idx)
             klasy[klasa]["uczniowie"] = uczniowie
 
-            save_json(self.file, klasy)
-            self.load()
+            self.store.save(self.file, klasy)
+            self.refresh_class(klasa, klasy)
             win.destroy()
 
         ttk.Button(win, text="Usuń", command=remove).pack(pady=10)
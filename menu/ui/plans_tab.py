@@ -1,31 +1,24 @@
 import os
-import json
-import subprocess
 import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog
+from tkinter import ttk, messagebox, simpledialog, scrolledtext
 
-
-def load_json(path):
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except:
-        return {}
-
-
-def save_json(path, data):
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+from core.store import get_store
+from menu.utils.tasks import TaskScheduler
+from menu.ui.virtual_tree import VirtualTree
 
 
 class PlansTab:
-    def __init__(self, notebook, data_dir):
+    def __init__(self, notebook, data_dir, tasks=None):
         self.data_dir = data_dir
         self.plany_dir = os.path.join(data_dir, "plany")
+        self.store = get_store(data_dir)
 
         frame = ttk.Frame(notebook)
         notebook.add(frame, text="Plany lekcji")
 
+        # wolne operacje (odczyt planów, generator) idą do puli zadań
+        self.tasks = tasks or TaskScheduler(frame)
+
         ttk.Label(
             frame,
             text="🗓 Wygenerowane plany lekcji",
@@ -36,7 +29,7 @@ class PlansTab:
         # TABELA
         # ================================
         cols = ("klasa", "dni")
-        self.tree = ttk.Treeview(frame, columns=cols, show="headings", height=18)
+        self.tree = VirtualTree(frame, columns=cols, height=18)
 
         self.tree.heading("klasa", text="Plik (klasa)")
         self.tree.heading("dni", text="Ilość dni")
@@ -66,12 +59,40 @@ class PlansTab:
         gen_frame = ttk.Frame(frame)
         gen_frame.pack(fill="x", pady=5)
 
-        ttk.Button(
+        self.gen_button = ttk.Button(
             gen_frame,
             text="🔄 Generuj plany lekcji",
             command=self.generate_plans
+        )
+        self.gen_button.pack(side="left", padx=5)
+
+        self.cancel_button = ttk.Button(
+            gen_frame,
+            text="⏹ Anuluj",
+            command=lambda: self.tasks.cancel("plany"),
+            state="disabled"
+        )
+        self.cancel_button.pack(side="left", padx=5)
+
+        self.profile = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            gen_frame,
+            text="🔬 Profilowanie",
+            variable=self.profile
         ).pack(side="left", padx=5)
 
+        self.progress = ttk.Progressbar(gen_frame, mode="determinate", length=200)
+        self.progress.pack(side="left", padx=5)
+
+        self.status = ttk.Label(gen_frame, text="")
+        self.status.pack(side="left", padx=5)
+
+        # ================================
+        # LOG GENERATORA
+        # ================================
+        self.log = scrolledtext.ScrolledText(frame, height=8, font=("Consolas", 9))
+        self.log.pack(fill="both", expand=False, padx=10, pady=(0, 10))
+
         # double click → edytuj
         self.tree.bind("<Double-1>", lambda e: self.edit_plan())
 
@@ -84,18 +105,18 @@ class PlansTab:
         if not os.path.isdir(self.plany_dir):
             return
 
-        for row in self.tree.get_children():
-            self.tree.delete(row)
-
-        for file in os.listdir(self.plany_dir):
-            if file.endswith(".json"):
-                path = os.path.join(self.plany_dir, file)
-                plan = load_json(path)
+        # pliki czytane w tle, tabela wypełniana w wątku Tk
+        self.tasks.submit(self.read_rows, name="Wczytywanie planów", on_done=self.show_rows)
 
-                klasa = file.replace(".json", "")
-                dni = len(plan.keys())
+    def read_rows(self, task):
+        wiersze = []
+        for klasa in self.store.plan_names():
+            task.check()
+            wiersze.append((klasa, len(self.store.plan(klasa).keys())))
+        return wiersze
 
-                self.tree.insert("", "end", values=(klasa, dni))
+    def show_rows(self, wiersze):
+        self.tree.set_rows((klasa, (klasa, dni)) for klasa, dni in wiersze)
 
     # ============================================
     # DODAJ PUSTY PLAN
@@ -105,9 +126,7 @@ class PlansTab:
         if not name:
             return
 
-        path = os.path.join(self.plany_dir, f"{name}.json")
-
-        if os.path.exists(path):
+        if os.path.exists(self.store.plan_path(name)):
             messagebox.showerror("Błąd", "Plan tej klasy już istnieje.")
             return
 
@@ -119,7 +138,7 @@ class PlansTab:
             "piatek": []
         }
 
-        save_json(path, empty)
+        self.store.save_plan(name, empty)
         self.load()
 
         messagebox.showinfo("OK", f"Utworzono pusty plan dla klasy {name}")
@@ -152,8 +171,7 @@ class PlansTab:
     # OKNO PODGLĄDU / EDYCJI
     # ============================================
     def open_plan_window(self, klasa, editable=False):
-        path = os.path.join(self.plany_dir, f"{klasa}.json")
-        plan = load_json(path)
+        plan = self.store.plan(klasa)
 
         win = tk.Toplevel()
         win.title(f"Plan lekcji — {klasa}")
@@ -167,7 +185,7 @@ class PlansTab:
 
         cols = ("dzien", "godzina", "przedmiot", "nauczyciel", "sala")
 
-        table = ttk.Treeview(win, columns=cols, show="headings", height=20)
+        table = VirtualTree(win, columns=cols, height=20)
 
         for c in cols:
             table.heading(c, text=c.capitalize())
@@ -181,15 +199,7 @@ class PlansTab:
         table.pack(fill="both", expand=True, padx=10, pady=10)
 
         # Wczytaj lekcje
-        for dzien, lekcje in plan.items():
-            for lekcja in lekcje:
-                table.insert("", "end", values=(
-                    dzien,
-                    lekcja.get("godzina"),
-                    lekcja.get("przedmiot"),
-                    lekcja.get("nauczyciel"),
-                    lekcja.get("sala")
-                ))
+        table.set_rows(self.lesson_rows(plan))
 
         # PRZYCISKI EDYCJI
         if editable:
@@ -207,12 +217,27 @@ class PlansTab:
 
         ttk.Button(win, text="Zamknij", command=win.destroy).pack(pady=10)
 
+    # ============================================
+    # WIERSZE TABELI PLANU — klucz (dzień, nr lekcji)
+    # ============================================
+    def lesson_rows(self, plan):
+        return [
+            ((dzien, i), (
+                dzien,
+                lekcja.get("godzina"),
+                lekcja.get("przedmiot") or "",
+                lekcja.get("nauczyciel") or "",
+                lekcja.get("sala") or ""
+            ))
+            for dzien, lekcje in plan.items()
+            for i, lekcja in enumerate(lekcje)
+        ]
+
     # ============================================
     # DODAJ LEKCJĘ
     # ============================================
     def add_lesson(self, table, klasa):
-        path = os.path.join(self.plany_dir, f"{klasa}.json")
-        plan = load_json(path)
+        plan = self.store.plan(klasa)
 
         win = tk.Toplevel()
         win.title("Dodaj lekcję")
@@ -251,9 +276,9 @@ class PlansTab:
             }
 
             plan[d].append(new_lesson)
-            save_json(path, plan)
+            self.store.save_plan(klasa, plan)
 
-            table.insert("", "end", values=(d, *new_lesson.values()))
+            table.set_rows(self.lesson_rows(plan))
             win.destroy()
 
         ttk.Button(win, text="Zapisz", command=save_new).pack(pady=10)
@@ -269,9 +294,9 @@ class PlansTab:
 
         values = table.item(sel[0])["values"]
         dzien, godzina, przedmiot, nauczyciel, sala = values
+        nr = sel[0][1]
 
-        path = os.path.join(self.plany_dir, f"{klasa}.json")
-        plan = load_json(path)
+        plan = self.store.plan(klasa)
 
         win = tk.Toplevel()
         win.title("Edytuj lekcję")
@@ -300,16 +325,15 @@ class PlansTab:
         e4.insert(0, sala)
 
         def save_edit():
-            for lesson in plan[dzien]:
-                if lesson["godzina"] == godzina:
-                    lesson["godzina"] = e1.get()
-                    lesson["przedmiot"] = e2.get()
-                    lesson["nauczyciel"] = e3.get()
-                    lesson["sala"] = e4.get()
-                    break
-
-            save_json(path, plan)
-            self.load()
+            lesson = plan[dzien][nr]
+            lesson["godzina"] = e1.get()
+            lesson["przedmiot"] = e2.get()
+            lesson["nauczyciel"] = e3.get()
+            lesson["sala"] = e4.get()
+
+            self.store.save_plan(klasa, plan)
+
+            table.update_row(sel[0], (dzien, e1.get(), e2.get(), e3.get(), e4.get()))
             win.destroy()
 
         ttk.Button(win, text="Zapisz", command=save_edit).pack(pady=10)
@@ -332,20 +356,17 @@ class PlansTab:
         ):
             return
 
-        path = os.path.join(self.plany_dir, f"{klasa}.json")
-        plan = load_json(path)
+        plan = self.store.plan(klasa)
 
         # wyczyść lekcję
-        for lesson in plan[dzien]:
-            if lesson["godzina"] == godzina:
-                lesson["przedmiot"] = None
-                lesson["nauczyciel"] = None
-                lesson["sala"] = None
-                break
+        lesson = plan[dzien][sel[0][1]]
+        lesson["przedmiot"] = None
+        lesson["nauczyciel"] = None
+        lesson["sala"] = None
 
-        save_json(path, plan)
+        self.store.save_plan(klasa, plan)
 
-        table.item(sel[0], values=(dzien, godzina, None, None, None))
+        table.update_row(sel[0], (dzien, godzina, "", "", ""))
 
     # ============================================
     # USUŃ CAŁY PLAN
@@ -357,43 +378,75 @@ class PlansTab:
             return
 
         klasa = self.tree.item(sel[0])["values"][0]
-        path = os.path.join(self.plany_dir, f"{klasa}.json")
 
         if not messagebox.askyesno("Usuń plan", f"Usunąć plan dla klasy {klasa}?"):
             return
 
         try:
-            os.remove(path)
+            self.store.delete_plan(klasa)
             self.load()
             messagebox.showinfo("OK", "Plan usunięty.")
         except Exception as e:
             messagebox.showerror("Błąd", f"Nie można usunąć pliku:\n{e}")
 
     # ============================================
-    # GENERATOR PLANÓW LEKCJI (plans.py)
+    # GENERATOR PLANÓW LEKCJI (plans.py) — w tle, w tym samym procesie
     # ============================================
     def generate_plans(self):
 
-        script = os.path.join(os.path.dirname(self.data_dir), "plans.py")
-
-        if not os.path.exists(script):
-            messagebox.showerror("Błąd", f"Nie znaleziono generatora:\n{script}")
+        # import dopiero przy pierwszym użyciu — szybszy start menu
+        import plans
+
+        profil = self.profile.get()
+
+        def job(task):
+            kwargs = dict(log=task.log, progress=task.progress)
+            if not profil:
+                return plans.run(self.data_dir, **kwargs)
+            from core.profiling import profile_call
+            return profile_call(self.data_dir, "plany", plans.run, (self.data_dir,), kwargs, log=task.log)
+
+        task = self.tasks.submit(
+            job,
+            name="Generator planów",
+            key="plany",
+            on_done=self.generate_done,
+            on_error=self.generate_failed,
+            on_log=self.append_log,
+            on_progress=self.show_progress,
+            on_cancel=self.generate_cancelled
+        )
+        if task is None:
             return
 
-        try:
-            result = subprocess.run(
-                ["python3", script],
-                cwd=os.path.dirname(self.data_dir),
-                capture_output=True,
-                text=True
-            )
+        self.log.delete(1.0, "end")
+        self.set_running(True)
 
-            # DEBUG - możesz zobaczyć log w terminalu
-            print(result.stdout)
-            print(result.stderr)
+    def set_running(self, trwa):
+        self.gen_button.state(["disabled" if trwa else "!disabled"])
+        self.cancel_button.state(["!disabled" if trwa else "disabled"])
+        if not trwa:
+            self.progress["value"] = 0
+            self.status.config(text="")
 
-            self.load()
-            messagebox.showinfo("Gotowe!", "Plany lekcji zostały wygenerowane ✔")
+    def show_progress(self, zrobione, wszystkie, opis):
+        if wszystkie:
+            self.progress["value"] = 100 * zrobione / wszystkie
+        self.status.config(text=opis or "")
 
-        except Exception as e:
-            messagebox.showerror("Błąd", f"Nie udało się uruchomić generatora:\n{e}")
+    def append_log(self, tekst):
+        self.log.insert("end", tekst + "\n")
+        self.log.see("end")
+
+    def generate_done(self, wynik):
+        self.set_running(False)
+        self.load()
+        messagebox.showinfo("Gotowe!", "Plany lekcji zostały wygenerowane ✔")
+
+    def generate_failed(self, blad):
+        self.set_running(False)
+        messagebox.showerror("Błąd", f"Nie udało się wygenerować planów:\n{blad}")
+
+    def generate_cancelled(self):
+        self.set_running(False)
+        self.append_log("⏹ Anulowano — plany nie zostały zmienione.")
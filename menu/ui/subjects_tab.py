@@ -1,26 +1,16 @@
 import os
-import json
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
 
-
-def load_json(path):
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except:
-        return {}
-
-
-def save_json(path, data):
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+from core.store import get_store
+from menu.ui.virtual_tree import VirtualTree
 
 
 class SubjectsTab:
     def __init__(self, notebook, data_dir):
         self.data_dir = data_dir
         self.file = os.path.join(data_dir, "przedmioty.json")
+        self.store = get_store(data_dir)
 
         frame = ttk.Frame(notebook)
         notebook.add(frame, text="Przedmioty")
@@ -32,7 +22,7 @@ class SubjectsTab:
         # TABELA
         # ========================
         cols = ("nazwa", "godziny", "klasy")
-        self.tree = ttk.Treeview(frame, columns=cols, show="headings", height=20)
+        self.tree = VirtualTree(frame, columns=cols, height=20)
 
         self.tree.heading("nazwa", text="Przedmiot")
         self.tree.heading("godziny", text="Godziny / tydz.")
@@ -77,17 +67,12 @@ class SubjectsTab:
     # ŁADOWANIE DANYCH
     # ========================
     def load(self):
-        for row in self.tree.get_children():
-            self.tree.delete(row)
+        przedmioty = self.store.przedmioty()
 
-        przedmioty = load_json(self.file)
+        self.tree.set_rows((nazwa, self.row_values(nazwa, info)) for nazwa, info in przedmioty.items())
 
-        for nazwa, info in przedmioty.items():
-            self.tree.insert("", "end", values=(
-                nazwa,
-                info.get("godziny", "?"),
-                ", ".join(info.get("klasy", []))
-            ))
+    def row_values(self, nazwa, info):
+        return (nazwa, info.get("godziny", "?"), ", ".join(info.get("klasy", [])))
 
     # ========================
     # DODAWANIE
@@ -114,11 +99,11 @@ class SubjectsTab:
         if not messagebox.askyesno("Usuń przedmiot", f"Czy chcesz usunąć przedmiot: {subject['nazwa']}?"):
             return
 
-        przedmioty = load_json(self.file)
+        przedmioty = self.store.przedmioty()
         przedmioty.pop(subject["nazwa"], None)
 
-        save_json(self.file, przedmioty)
-        self.load()
+        self.store.save(self.file, przedmioty)
+        self.tree.delete(subject["nazwa"])
 
 
 # =========================================================
@@ -171,7 +156,7 @@ class AddEditSubject:
             messagebox.showerror("Błąd", "Nazwa przedmiotu nie może być pusta.")
             return
 
-        przedmioty = load_json(self.parent.file)
+        przedmioty = self.parent.store.przedmioty()
 
         data = {
             "godziny": godziny,
@@ -184,6 +169,6 @@ class AddEditSubject:
         else:
             przedmioty[nazwa] = data
 
-        save_json(self.parent.file, przedmioty)
-        self.parent.load()
+        self.parent.store.save(self.parent.file, przedmioty)
+        self.parent.tree.upsert(nazwa, self.parent.row_values(nazwa, data))
         self.win.destroy()
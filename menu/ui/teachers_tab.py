@@ -1,26 +1,22 @@
 import os
-import json
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
+from datetime import date, datetime, timedelta
 
-
-def load_json(path):
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except:
-        return []
-
-
-def save_json(path, data):
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+from core.absences import AbsenceLedger, ledger_path
+from core.store import get_store
+from menu.ui.virtual_tree import VirtualTree
 
 
 class TeachersTab:
     def __init__(self, notebook, data_dir):
         self.data_dir = data_dir
         self.file = os.path.join(data_dir, "nauczyciele.json")
+        self.store = get_store(data_dir)
+        self.ledger = AbsenceLedger(ledger_path(data_dir))
+
+        # imie → rekord z nauczyciele.json (imię jest też kluczem wiersza tabeli)
+        self.teachers = {}
 
         self.frame = ttk.Frame(notebook)
         notebook.add(self.frame, text="Nauczyciele")
@@ -37,10 +33,9 @@ class TeachersTab:
             "obecnosc", "powod", "wychowawca"
         )
 
-        self.tree = ttk.Treeview(
+        self.tree = VirtualTree(
             self.frame,
             columns=cols,
-            show="headings",
             height=18,
             selectmode="extended"  # 🔥 MULTI-SELECT
         )
@@ -53,7 +48,7 @@ class TeachersTab:
             "etap": "Etap",
             "klasy": "Klasy",
             "specjalizacja": "Specjalizacja",
-            "obecnosc": "Obecność",
+            "obecnosc": "Obecność (jutro)",
             "powod": "Powód",
             "wychowawca": "Wychowawca?"
         }
@@ -71,6 +66,7 @@ class TeachersTab:
         self.menu.add_separator()
         self.menu.add_command(label="Zmień status", command=self.toggle_status_multiple)
         self.menu.add_command(label="Ustaw powód nieobecności", command=self.set_reason_multiple)
+        self.menu.add_command(label="Nieobecność w terminie…", command=self.add_absence_range)
 
         self.tree.bind("<Button-3>", self.show_context_menu)
 
@@ -85,6 +81,7 @@ class TeachersTab:
         ttk.Button(btn_frame, text="Usuń", command=self.delete_multiple).pack(side="left", padx=5)
         ttk.Button(btn_frame, text="Zmień status", command=self.toggle_status_multiple).pack(side="left", padx=5)
         ttk.Button(btn_frame, text="Powód nieobecności", command=self.set_reason_multiple).pack(side="left", padx=5)
+        ttk.Button(btn_frame, text="Nieobecność w terminie…", command=self.add_absence_range).pack(side="left", padx=5)
 
         self.load()
 
@@ -113,6 +110,7 @@ class TeachersTab:
         self.menu.entryconfig(1, label=f"Usuń ({count})")
         self.menu.entryconfig(3, label=f"Zmień status ({count})")
         self.menu.entryconfig(4, label=f"Ustaw powód ({count})")
+        self.menu.entryconfig(5, label=f"Nieobecność w terminie… ({count})")
 
         # pokaż menu
         self.menu.tk_popup(event.x_root, event.y_root)
@@ -166,25 +164,72 @@ class TeachersTab:
 
         return teachers
 
+    # ==================================================
+    # Dzień, dla którego pokazujemy obecność (jutro)
+    # ==================================================
+    def target_date(self):
+        return date.today() + timedelta(days=1)
+
+    # ==================================================
+    # Wartości wiersza (obecność = stara flaga + rejestr)
+    # ==================================================
+    def row_values(self, n):
+        powod = ""
+        nieobecny = n.get("obecnosc") == "no"
+
+        if nieobecny:
+            powod = n.get("powod", "")
+        else:
+            wpis = self.ledger.is_absent(n.get("imie"), self.target_date())
+            if wpis:
+                nieobecny = True
+                powod = wpis.get("powod", "")
+
+        return (
+            n.get("imie"),
+            n.get("przedmiot"),
+            n.get("sala"),
+            n.get("etap"),
+            ", ".join(n.get("klasy", [])),
+            n.get("specjalizacja", ""),
+            "Nieobecny" if nieobecny else "Obecny",
+            powod,
+            "TAK" if n.get("moze_byc_wychowawca") else "NIE"
+        )
+
+    # ==================================================
+    # Odświeżenie tylko wskazanych wierszy
+    # ==================================================
+    def refresh_rows(self, names):
+        for imie in names:
+            if imie in self.teachers:
+                self.tree.update_row(imie, self.row_values(self.teachers[imie]))
+
+    # ==================================================
+    # Wstawienie / podmiana jednego wiersza (bez przeładowania)
+    # ==================================================
+    def apply_teacher(self, n, stare_imie=None):
+        index = None
+
+        # zmiana imienia = nowy klucz wiersza w tym samym miejscu
+        if stare_imie is not None and stare_imie != n["imie"]:
+            index = self.tree.index(stare_imie)
+            self.teachers.pop(stare_imie, None)
+            self.tree.delete(stare_imie)
+
+        self.teachers[n["imie"]] = n
+        self.tree.upsert(n["imie"], self.row_values(n), index)
+
     # ==================================================
     # Ładowanie tabeli
     # ==================================================
     def load(self):
-        for row in self.tree.get_children():
-            self.tree.delete(row)
-
-        for n in load_json(self.file):
-            self.tree.insert("", "end", values=(
-                n.get("imie"),
-                n.get("przedmiot"),
-                n.get("sala"),
-                n.get("etap"),
-                ", ".join(n.get("klasy", [])),
-                n.get("specjalizacja", ""),
-                "Obecny" if n.get("obecnosc") == "yes" else "Nieobecny",
-                n.get("powod", "") if n.get("obecnosc") == "no" else "",
-                "TAK" if n.get("moze_byc_wychowawca") else "NIE"
-            ))
+        # menu jest jedynym piszącym do rejestru — tu też go porządkuje
+        self.ledger.maybe_compact()
+        self.teachers = {n.get("imie"): n for n in self.store.nauczyciele()}
+
+        # tabela zmienia tylko wiersze, które faktycznie się różnią
+        self.tree.set_rows((imie, self.row_values(n)) for imie, n in self.teachers.items())
 
     # ==================================================
     # Dodawanie
@@ -214,13 +259,55 @@ class TeachersTab:
                                    f"Czy chcesz usunąć nauczycieli:\n\n{names}\n"):
             return
 
-        data = load_json(self.file)
+        data = self.store.nauczyciele()
         selected_names = {t["imie"] for t in teachers}
 
         data = [n for n in data if n["imie"] not in selected_names]
 
-        save_json(self.file, data)
-        self.load()
+        self.store.save(self.file, data)
+
+        for imie in selected_names:
+            self.teachers.pop(imie, None)
+        self.tree.delete(*selected_names)
+
+    # ==================================================
+    # Zdjęcie starej flagi "obecnosc: no" z nauczyciele.json
+    # ==================================================
+    def clear_legacy_absence(self, names, reason=None):
+        """Jedyny przypadek przepisania nauczyciele.json przy zmianie
+        obecności — nauczyciel oznaczony jeszcze starą flagą."""
+        legacy = [i for i in names if self.teachers.get(i, {}).get("obecnosc") == "no"]
+        if not legacy:
+            return
+
+        data = self.store.nauczyciele()
+
+        for n in data:
+            if n["imie"] in legacy:
+                if reason is None:
+                    n["obecnosc"] = "yes"
+                    n.pop("powod", None)
+                else:
+                    n["powod"] = reason
+                self.teachers[n["imie"]] = n
+
+        self.store.save(self.file, data)
+
+    # ==================================================
+    # Usunięcie nieobecności z rejestru na jeden dzień
+    # ==================================================
+    def remove_absence_on(self, imie, dzien):
+        """Wycina `dzien` z wpisów rejestru (wpis wielodniowy zostaje rozcięty)."""
+        for w in self.ledger.entries_on(imie, dzien):
+            self.ledger.remove(w["id"])
+
+            przed = dzien - timedelta(days=1)
+            po = dzien + timedelta(days=1)
+
+            if w["od"] <= przed.isoformat():
+                self.ledger.add(imie, w["od"], przed, w["powod"])
+            if po.isoformat() <= w["do"]:
+                self.ledger.add(imie, po, w["do"], w["powod"])
 
     # ==================================================
     # Zmiana statusu dla wielu
@@ -230,21 +317,20 @@ class TeachersTab:
         if not teachers:
             return
 
-        data = load_json(self.file)
-
-        for t in teachers:
-            for n in data:
-                if n["imie"] == t["imie"]:
-                    if n["obecnosc"] == "yes":
-                        n["obecnosc"] = "no"
-                        n["powod"] = "Brak powodu"
-                    else:
-                        n["obecnosc"] = "yes"
-                        n.pop("powod", None)
-                    break
+        dzien = self.target_date()
+        self.ledger.reload()
 
-        save_json(self.file, data)
-        self.load()
+        obecni = [t["imie"] for t in teachers if t["obecnosc"] == "yes"]
+        nieobecni = [t["imie"] for t in teachers if t["obecnosc"] == "no"]
+
+        for imie in obecni:
+            self.ledger.add(imie, dzien, powod="Brak powodu")
+
+        for imie in nieobecni:
+            self.remove_absence_on(imie, dzien)
+
+        self.clear_legacy_absence(nieobecni)
+        self.refresh_rows(obecni + nieobecni)
 
     # ==================================================
     # Powód dla wielu
@@ -265,16 +351,52 @@ class TeachersTab:
         if not reason:
             return
 
-        data = load_json(self.file)
+        dzien = self.target_date()
+        self.ledger.reload()
+        names = [t["imie"] for t in nieobecni]
 
-        for t in nieobecni:
-            for n in data:
-                if n["imie"] == t["imie"]:
-                    n["powod"] = reason
-                    break
+        for imie in names:
+            for w in self.ledger.entries_on(imie, dzien):
+                self.ledger.set_reason(w["id"], reason)
 
-        save_json(self.file, data)
-        self.load()
+        self.clear_legacy_absence(names, reason)
+        self.refresh_rows(names)
+
+    # ==================================================
+    # Nieobecność w zadanym terminie (np. szkolenie, L4)
+    # ==================================================
+    def add_absence_range(self):
+        teachers = self.get_selected_multiple()
+        if not teachers:
+            return
+
+        jutro = self.target_date().isoformat()
+
+        od = simpledialog.askstring("Nieobecność", "Od (RRRR-MM-DD):", initialvalue=jutro)
+        if not od:
+            return
+        do = simpledialog.askstring("Nieobecność", "Do (RRRR-MM-DD):", initialvalue=od)
+        if not do:
+            return
+
+        try:
+            od_d = datetime.strptime(od.strip(), "%Y-%m-%d").date()
+            do_d = datetime.strptime(do.strip(), "%Y-%m-%d").date()
+        except ValueError:
+            messagebox.showerror("Błąd", "Niepoprawna data — użyj formatu RRRR-MM-DD.")
+            return
+
+        if do_d < od_d:
+            messagebox.showerror("Błąd", "Data końcowa jest wcześniejsza niż początkowa.")
+            return
+
+        reason = simpledialog.askstring("Powód nieobecności", "Podaj powód:") or "Brak powodu"
+
+        names = [t["imie"] for t in teachers]
+        for imie in names:
+            self.ledger.add(imie, od_d, do_d, reason)
+
+        self.refresh_rows(names)
 
 
 # ==================================================
@@ -333,7 +455,7 @@ class AddEditTeacher:
             self.wychowawca_var.set(teacher["moze_byc_wychowawca"])
 
     def save(self):
-        data = load_json(self.parent.file)
+        data = self.parent.store.nauczyciele()
 
         entry = {
             "imie": self.imie.get(),
@@ -354,6 +476,11 @@ class AddEditTeacher:
                     data[i] = entry
                     break
 
-        save_json(self.parent.file, data)
-        self.parent.load()
+        self.parent.store.save(self.parent.file, data)
+
+        # nieobecności z rejestru idą za nauczycielem
+        if self.mode == "edit" and entry["imie"] != self.teacher["imie"]:
+            self.parent.ledger.rename(self.teacher["imie"], entry["imie"])
+
+        self.parent.apply_teacher(entry, self.teacher["imie"] if self.mode == "edit" else None)
         self.win.destroy()
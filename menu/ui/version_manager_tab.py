@@ -10,10 +10,11 @@ from menu.utils.version_manager_utils import (
     download_zip,
     install_zip
 )
+from menu.utils.tasks import TaskScheduler
 
 
 class VersionManagerTab:
-    def __init__(self, notebook, data_dir):
+    def __init__(self, notebook, data_dir, tasks=None):
         self.base_dir = os.path.abspath(os.path.join(data_dir, ".."))
         self.data_dir = data_dir
         self.version_file = os.path.join(data_dir, "version.json")
@@ -21,6 +22,9 @@ class VersionManagerTab:
         frame = ttk.Frame(notebook)
         notebook.add(frame, text="Aktualizacje")
 
+        # sieć i rozpakowywanie w tle — okno nie zamarza przy wolnym łączu
+        self.tasks = tasks or TaskScheduler(frame)
+
         ttk.Label(frame, text="🔧 Menedżer aktualizacji",
                   font=("Segoe UI", 14, "bold")).pack(pady=10)
 
@@ -53,6 +57,9 @@ class VersionManagerTab:
             command=self.install_from_zip
         ).pack(side="left", padx=5)
 
+        self.status = ttk.Label(btns, text="")
+        self.status.pack(side="left", padx=10)
+
         # --- CHANGELOG ---
         ttk.Label(frame, text="📄 Changelog", font=("Segoe UI", 11, "bold")).pack(pady=(5, 0))
 
@@ -73,9 +80,20 @@ class VersionManagerTab:
     # SPRAWDZANIE AKTUALIZACJI
     # ===============================
     def check_update(self):
+        task = self.tasks.submit(
+            lambda task: fetch_latest_release(),
+            name="Sprawdzanie aktualizacji",
+            key="aktualizacje",
+            on_done=self.show_release
+        )
+        if task is None:
+            return
+
         self.changelog.delete(1.0, "end")
+        self.status.config(text="⏳ Sprawdzanie…")
 
-        data = fetch_latest_release()
+    def show_release(self, data):
+        self.status.config(text="")
 
         if "error" in data:
             messagebox.showerror("Błąd", f"Nie udało się pobrać danych:\n{data['error']}")
@@ -96,13 +114,34 @@ class VersionManagerTab:
             messagebox.showwarning("Brak danych", "Kliknij najpierw: Sprawdź aktualizację")
             return
 
-        zip_bytes = download_zip(self.remote_url)
-        if not zip_bytes:
+        def pobierz_i_zainstaluj(task):
+            task.progress(0, 2, "⏳ Pobieranie…")
+            zip_bytes = download_zip(self.remote_url)
+            if not zip_bytes:
+                return None
+
+            # po pobraniu anulowanie nic nie psuje, w trakcie rozpakowywania już nie przerywamy
+            task.progress(1, 2, "⏳ Instalowanie…")
+            return install_zip(zip_bytes, self.base_dir)
+
+        task = self.tasks.submit(
+            pobierz_i_zainstaluj,
+            name="Aktualizacja",
+            key="aktualizacje",
+            on_done=self.update_done,
+            on_progress=lambda z, w, opis: self.status.config(text=opis),
+            on_cancel=lambda: self.status.config(text="⏹ Anulowano")
+        )
+        if task is None:
+            messagebox.showinfo("Trwa", "Poprzednia operacja jeszcze trwa.")
+
+    def update_done(self, ok):
+        self.status.config(text="")
+
+        if ok is None:
             messagebox.showerror("Błąd", "Nie udało się pobrać ZIP aktualizacji.")
             return
 
-        ok = install_zip(zip_bytes, self.base_dir)
-
         if ok:
             messagebox.showinfo("Sukces", "Aktualizacja została zainstalowana.")
 
@@ -125,14 +164,32 @@ class VersionManagerTab:
         if not path:
             return
 
-        try:
-            with open(path, "rb") as f:
-                zip_bytes = BytesIO(f.read())
-        except:
-            messagebox.showerror("Błąd", "Nie można odczytać pliku ZIP.")
+        def zainstaluj(task):
+            try:
+                with open(path, "rb") as f:
+                    zip_bytes = BytesIO(f.read())
+            except:
+                return None
+            return install_zip(zip_bytes, self.base_dir)
+
+        task = self.tasks.submit(
+            zainstaluj,
+            name="Instalacja z pliku",
+            key="aktualizacje",
+            on_done=self.install_done
+        )
+        if task is None:
+            messagebox.showinfo("Trwa", "Poprzednia operacja jeszcze trwa.")
             return
 
-        ok = install_zip(zip_bytes, self.base_dir)
+        self.status.config(text="⏳ Instalowanie…")
+
+    def install_done(self, ok):
+        self.status.config(text="")
+
+        if ok is None:
+            messagebox.showerror("Błąd", "Nie można odczytać pliku ZIP.")
+            return
 
         if ok:
             messagebox.showinfo("Sukces", "Ręczna instalacja zakończona.")
@@ -0,0 +1,314 @@
+# 📜 Wirtualna tabela (Treeview) dla dużych list
+# ✔ w Treeview istnieją tylko wiersze widoczne + mały zapas — nie cała lista
+# ✔ przewijanie nie tworzy nowych wierszy, tylko podmienia wartości w istniejących
+# ✔ set_rows() porównuje z tym, co jest na ekranie, i zmienia tylko różnice
+# ✔ wiersze i zaznaczenie identyfikowane kluczem (np. imię nauczyciela), nie iid
+#
+# API zbliżone do ttk.Treeview: selection(), item(klucz)["values"], identify_row(),
+# selection_set(), heading(), column(), bind() — zakładki zmieniają się minimalnie.
+
+import tkinter as tk
+from tkinter import ttk
+
+
+class VirtualTree(ttk.Frame):
+    def __init__(self, parent, columns, height=18, selectmode="browse", buffer=5):
+        super().__init__(parent)
+
+        self.tree = ttk.Treeview(self, columns=columns, show="headings",
+                                 height=height, selectmode=selectmode)
+        self.scroll = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.scroll.pack(side="right", fill="y")
+
+        self.buffer = buffer
+
+        self._keys = []          # kolejność wierszy (klucze)
+        self._values = {}        # klucz → wartości kolumn
+        self._pos = {}           # klucz → indeks w _keys
+
+        self._top = 0            # indeks pierwszego widocznego wiersza
+        self._visible = height   # ile wierszy mieści się w oknie
+        self._pool = []          # iid wierszy Treeview (używane ponownie)
+        self._shown = []         # (klucz, wartości) pokazane w _pool[i]
+        self._selected = set()   # zaznaczone klucze (także poza ekranem)
+
+        self.tree.bind("<Configure>", self._on_configure)
+        self.tree.bind("<<TreeviewSelect>>", self._on_select, add="+")
+        self.tree.bind("<ButtonPress-1>", self._on_click, add="+")
+        self.tree.bind("<MouseWheel>", self._on_wheel)
+        self.tree.bind("<Button-4>", lambda e: self.scroll_by(-3))
+        self.tree.bind("<Button-5>", lambda e: self.scroll_by(3))
+
+        for klawisz, krok in (("<Up>", -1), ("<Down>", 1), ("<Prior>", "-page"),
+                              ("<Next>", "page"), ("<Home>", "home"), ("<End>", "end")):
+            self.tree.bind(klawisz, lambda e, k=krok: self._on_key(k))
+
+    # ============================================================
+    # DANE
+    # ============================================================
+
+    def set_rows(self, rows):
+        """`rows` — lista (klucz, wartości). Pozycja przewinięcia trzyma się
+        pierwszego widocznego wiersza, zaznaczenie — kluczy."""
+        kotwica = self._keys[self._top] if self._top < len(self._keys) else None
+
+        self._keys = []
+        self._values = {}
+        for klucz, wartosci in rows:
+            if klucz not in self._values:
+                self._keys.append(klucz)
+            self._values[klucz] = tuple(wartosci)
+
+        self._pos = {k: i for i, k in enumerate(self._keys)}
+        self._selected &= self._values.keys()
+
+        top = self._pos.get(kotwica, self._top)
+        self._top = max(0, min(top, len(self._keys) - self._visible))
+        self._render()
+
+    def update_row(self, klucz, wartosci):
+        """Zmienia wartości jednego istniejącego wiersza."""
+        if klucz not in self._values:
+            return
+        self._values[klucz] = tuple(wartosci)
+
+        i = self._pos[klucz] - self._top
+        if 0 <= i < len(self._pool):
+            self._show(i)
+
+    def upsert(self, klucz, wartosci, index=None):
+        """Dodaje wiersz (na końcu albo na pozycji `index`) lub zmienia istniejący.
+        Po edycji jednego rekordu Treeview dostaje najwyżej jedno okno zmian."""
+        if klucz in self._values:
+            self.update_row(klucz, wartosci)
+            return
+
+        if index is None or index >= len(self._keys):
+            index = len(self._keys)
+            self._keys.append(klucz)
+            self._pos[klucz] = index
+        else:
+            self._keys.insert(index, klucz)
+            self._reindex(index)
+
+        self._values[klucz] = tuple(wartosci)
+
+        if index < self._top + self._visible + self.buffer:
+            self._render()
+        else:
+            self._update_scrollbar()
+
+    def delete(self, *klucze):
+        """Usuwa wiersze o podanych kluczach (nieistniejące są pomijane)."""
+        klucze = [k for k in klucze if k in self._values]
+        if not klucze:
+            return
+
+        od = min(self._pos[k] for k in klucze)
+        for k in klucze:
+            del self._values[k]
+            del self._pos[k]
+            self._selected.discard(k)
+
+        self._keys = [k for k in self._keys if k in self._values]
+        self._reindex(od)
+
+        self._top = max(0, min(self._top, len(self._keys) - self._visible))
+        if od < self._top + self._visible + self.buffer:
+            self._render()
+        else:
+            self._update_scrollbar()
+
+    def index(self, klucz):
+        return self._pos.get(klucz)
+
+    def _reindex(self, od):
+        for i in range(od, len(self._keys)):
+            self._pos[self._keys[i]] = i
+
+    def item(self, klucz):
+        return {"values": self._values.get(klucz, ())}
+
+    def get_children(self):
+        return list(self._keys)
+
+    def row_count(self):
+        # nie __len__ — pusta tabela byłaby fałszywa w `if self.tree:`
+        return len(self._keys)
+
+    # ============================================================
+    # ZAZNACZENIE
+    # ============================================================
+
+    def selection(self):
+        return sorted(self._selected, key=self._pos.__getitem__)
+
+    def selection_set(self, klucze):
+        # krotka to pojedynczy klucz (np. (dzień, nr lekcji)), lista/zbiór — wiele
+        if not isinstance(klucze, (list, set, frozenset)):
+            klucze = [klucze]
+        self._selected = {k for k in klucze if k in self._values}
+        self._sync_selection()
+
+    def identify_row(self, y):
+        iid = self.tree.identify_row(y)
+        if not iid:
+            return ""
+        return self._shown[self._pool.index(iid)][0]
+
+    def see(self, klucz):
+        i = self._pos.get(klucz)
+        if i is None:
+            return
+        if i < self._top:
+            self.scroll_to(i)
+        elif i >= self._top + self._visible:
+            self.scroll_to(i - self._visible + 1)
+
+    # ============================================================
+    # PRZEKAZYWANE DO TREEVIEW
+    # ============================================================
+
+    def heading(self, *args, **kw):
+        return self.tree.heading(*args, **kw)
+
+    def column(self, *args, **kw):
+        return self.tree.column(*args, **kw)
+
+    def bind(self, sekwencja=None, func=None, add=None):
+        return self.tree.bind(sekwencja, func, add)
+
+    # ============================================================
+    # PRZEWIJANIE
+    # ============================================================
+
+    def scroll_to(self, top):
+        top = max(0, min(top, len(self._keys) - self._visible))
+        if top != self._top:
+            self._top = top
+            self._render()
+
+    def scroll_by(self, ile):
+        self.scroll_to(self._top + ile)
+        return "break"
+
+    def _on_scrollbar(self, *args):
+        if args[0] == "moveto":
+            self.scroll_to(round(float(args[1]) * len(self._keys)))
+        elif args[0] == "scroll":
+            krok = int(args[1]) * (self._visible if args[2] == "pages" else 1)
+            self.scroll_by(krok)
+
+    def _on_wheel(self, event):
+        # Windows: wielokrotności 120, macOS: małe wartości
+        krok = -event.delta // 120 if abs(event.delta) >= 120 else -event.delta
+        return self.scroll_by(krok * 3)
+
+    def _on_key(self, krok):
+        if not self._keys:
+            return "break"
+
+        wybrane = self.selection()
+        i = self._pos[wybrane[-1]] if wybrane else self._top - 1
+
+        if krok == "page":
+            i += self._visible
+        elif krok == "-page":
+            i -= self._visible
+        elif krok == "home":
+            i = 0
+        elif krok == "end":
+            i = len(self._keys) - 1
+        else:
+            i += krok
+
+        i = max(0, min(i, len(self._keys) - 1))
+        self.see(self._keys[i])
+        self.selection_set(self._keys[i])
+        self.tree.event_generate("<<TreeviewSelect>>")
+        return "break"
+
+    def _on_configure(self, event=None):
+        wysokosc = self.tree.winfo_height()
+
+        naglowek, wiersz = 0, 20
+        if self._pool:
+            bbox = self.tree.bbox(self._pool[0])
+            if bbox:
+                naglowek, wiersz = bbox[1], bbox[3]
+        else:
+            try:
+                wiersz = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+            except (tk.TclError, ValueError):
+                pass
+
+        widoczne = max(1, (wysokosc - naglowek) // max(1, wiersz))
+        if widoczne != self._visible:
+            self._visible = widoczne
+            self._top = max(0, min(self._top, len(self._keys) - self._visible))
+            self._render()
+
+    # ============================================================
+    # RYSOWANIE — tylko okno [top, top + widoczne + zapas)
+    # ============================================================
+
+    def _render(self):
+        potrzeba = max(0, min(self._visible + self.buffer, len(self._keys) - self._top))
+
+        while len(self._pool) < potrzeba:
+            self._pool.append(self.tree.insert("", "end"))
+            self._shown.append(None)
+        while len(self._pool) > potrzeba:
+            self.tree.delete(self._pool.pop())
+            self._shown.pop()
+
+        for i in range(len(self._pool)):
+            self._show(i)
+
+        # Treeview nie przewija się sam — pozycję trzymamy w _top
+        self.tree.yview_moveto(0)
+        self._sync_selection()
+        self._update_scrollbar()
+
+    def _show(self, i):
+        klucz = self._keys[self._top + i]
+        wiersz = (klucz, self._values[klucz])
+        if self._shown[i] != wiersz:
+            self.tree.item(self._pool[i], values=wiersz[1])
+            self._shown[i] = wiersz
+
+    def _sync_selection(self):
+        iids = [iid for iid, wiersz in zip(self._pool, self._shown)
+                if wiersz and wiersz[0] in self._selected]
+        if set(iids) != set(self.tree.selection()):
+            self.tree.selection_set(iids)
+
+    def _on_click(self, event):
+        # tylko kliknięcie w wiersz zmienia zaznaczenie (nagłówek i puste pole — nie)
+        if self.tree.identify_region(event.x, event.y) not in ("cell", "tree"):
+            return
+        # zwykłe kliknięcie (bez Ctrl/Shift) zastępuje zaznaczenie — także to poza ekranem
+        if self.tree.cget("selectmode") != "extended" or not event.state & 0x0005:
+            self._selected.clear()
+
+    def _on_select(self, event=None):
+        widoczne = {w[0]: iid for iid, w in zip(self._pool, self._shown) if w}
+        zaznaczone = set(self.tree.selection())
+
+        for klucz, iid in widoczne.items():
+            if iid in zaznaczone:
+                self._selected.add(klucz)
+            else:
+                self._selected.discard(klucz)
+
+        # kliknięcie w częściowo widoczny wiersz przewija Treeview — cofamy
+        self.tree.yview_moveto(0)
+
+    def _update_scrollbar(self):
+        n = len(self._keys)
+        if n <= self._visible:
+            self.scroll.set(0, 1)
+        else:
+            self.scroll.set(self._top / n, (self._top + self._visible) / n)
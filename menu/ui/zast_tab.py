@@ -1,26 +1,37 @@
 import os
-import json
-import subprocess
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
-from datetime import datetime, date, timedelta
+from datetime import date, timedelta
+
+from core.store import get_store
+from core.history import SubstitutionIndex
+from core.instrumentation import enabled_by_env
+from menu.utils.tasks import TaskScheduler
+from menu.ui.virtual_tree import VirtualTree
+
+
+# ile dni historii dokładamy do tabeli na raz
+PAGE_SIZE = 60
 
 
 class ZastepstwaTab:
-    def __init__(self, notebook, data_dir):
+    def __init__(self, notebook, data_dir, tasks=None):
 
         # Katalog główny projektu
         self.base_dir = os.path.abspath(os.path.join(data_dir, ".."))
 
         self.data_dir = os.path.join(self.base_dir, "data")
         self.zastepstwa_dir = os.path.join(self.data_dir, "zastepstwa")
-        self.script = os.path.join(self.base_dir, "zastepstwa.py")
+        self.store = get_store(self.data_dir)
 
         os.makedirs(self.zastepstwa_dir, exist_ok=True)
 
         frame = ttk.Frame(notebook)
         notebook.add(frame, text="Zastępstwa")
 
+        # wolne operacje (lista dni, generator) idą do puli zadań
+        self.tasks = tasks or TaskScheduler(frame)
+
         ttk.Label(frame, text="📅 Zastępstwa",
                   font=("Segoe UI", 14, "bold")).pack(pady=10)
 
@@ -30,11 +41,20 @@ class ZastepstwaTab:
         top_buttons = ttk.Frame(frame)
         top_buttons.pack(fill="x", padx=10)
 
-        ttk.Button(
+        self.gen_button = ttk.Button(
             top_buttons,
             text="🔄 Generuj zastępstwa na jutro",
             command=self.generate
-        ).pack(side="left", padx=5)
+        )
+        self.gen_button.pack(side="left", padx=5)
+
+        self.cancel_button = ttk.Button(
+            top_buttons,
+            text="⏹ Anuluj",
+            command=lambda: self.tasks.cancel("zastepstwa"),
+            state="disabled"
+        )
+        self.cancel_button.pack(side="left", padx=5)
 
         ttk.Button(
             top_buttons,
@@ -42,11 +62,32 @@ class ZastepstwaTab:
             command=self.refresh
         ).pack(side="left", padx=5)
 
+        # raport czasów faz i liczników generatora — trafia do logu poniżej
+        self.instrument = tk.BooleanVar(value=enabled_by_env())
+        ttk.Checkbutton(
+            top_buttons,
+            text="📊 Raport wydajności",
+            variable=self.instrument
+        ).pack(side="left", padx=5)
+
+        self.profile = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            top_buttons,
+            text="🔬 Profilowanie",
+            variable=self.profile
+        ).pack(side="left", padx=5)
+
+        self.progress = ttk.Progressbar(top_buttons, mode="determinate", length=160)
+        self.progress.pack(side="left", padx=5)
+
+        self.status = ttk.Label(top_buttons, text="")
+        self.status.pack(side="left", padx=5)
+
         # ------------------------------------------------
         # TABELA Z DNIAMI
         # ------------------------------------------------
         cols = ("dzien", "ilosc")
-        self.tree = ttk.Treeview(frame, columns=cols, show="headings", height=14)
+        self.tree = VirtualTree(frame, columns=cols, height=14)
 
         self.tree.heading("dzien", text="Dzień")
         self.tree.heading("ilosc", text="Ilość zastępstw / Wolne")
@@ -58,6 +99,24 @@ class ZastepstwaTab:
 
         self.tree.bind("<Double-1>", self.on_day_double_click)
 
+        # historia stronicowana — najnowsze dni na górze, starsze na żądanie
+        page_frame = ttk.Frame(frame)
+        page_frame.pack(fill="x", padx=10)
+
+        self.more_button = ttk.Button(
+            page_frame,
+            text="⬇ Starsze dni",
+            command=self.load_more,
+            state="disabled"
+        )
+        self.more_button.pack(side="left", padx=5)
+
+        self.page_info = ttk.Label(page_frame, text="")
+        self.page_info.pack(side="left", padx=5)
+
+        self.history = None
+        self.shown = 0
+
         # ------------------------------------------------
         # LOG
         # ------------------------------------------------
@@ -70,86 +129,49 @@ class ZastepstwaTab:
         self.load()
 
     # ============================================================
-    # ODCZYT KALENDARZA
-    # ============================================================
-    def load_calendar(self):
-        path = os.path.join(self.data_dir, "calendar.json")
-        if not os.path.exists(path):
-            return None
-
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except:
-            return None
-
-    # ============================================================
-    # SPRAWDZENIE, CZY DZIEŃ JEST WOLNY
-    # ============================================================
-    def is_day_free(self, date_str):
-        """Zwraca False jeśli dzień szkolny,
-           lub dict jeśli dzień wolny."""
-
-        calendar = self.load_calendar()
-        if not calendar:
-            return False
-
-        d = datetime.strptime(date_str, "%Y-%m-%d").date()
-
-        # WEEKEND
-        if d.weekday() >= 5:
-            return {"powod": "Weekend"}
-
-        swieta = calendar.get("swieta", {})
-
-        for nazwa, wartosc in swieta.items():
-
-            # Jednodniowe
-            if isinstance(wartosc, str):
-                if wartosc == date_str:
-                    return {"powod": nazwa}
-
-            # Wielodniowe
-            elif isinstance(wartosc, list) and len(wartosc) == 2:
-                start = datetime.strptime(wartosc[0], "%Y-%m-%d").date()
-                end = datetime.strptime(wartosc[1], "%Y-%m-%d").date()
-
-                if start <= d <= end:
-                    return {"powod": nazwa, "od": wartosc[0], "do": wartosc[1]}
-
-        return False
-
-    # ============================================================
-    # ŁADOWANIE LISTY PLIKÓW
+    # ŁADOWANIE LISTY DNI (z indeksu historii, bez parsowania plików)
     # ============================================================
-    def load(self):
-        for row in self.tree.get_children():
-            self.tree.delete(row)
-
-        files = [f for f in os.listdir(self.zastepstwa_dir) if f.endswith(".json")]
-        files.sort()
-
-        for fname in files:
-            path = os.path.join(self.zastepstwa_dir, fname)
-            try:
-                with open(path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
+    def load(self, on_loaded=None):
+        """Indeks sprawdzany w tle; tabela dostaje pierwszą stronę dni."""
+
+        def gotowe(historia):
+            self.history = historia
+            self.shown = min(max(self.shown, PAGE_SIZE), len(historia))
+            self.tree.set_rows(self.row(d, s) for d, s in historia.page(0, self.shown))
+            self.update_page_info()
+            if on_loaded:
+                on_loaded()
+
+        self.tasks.submit(
+            lambda task: SubstitutionIndex(self.data_dir).sync(),
+            name="Wczytywanie zastępstw",
+            on_done=gotowe
+        )
+
+    def load_more(self):
+        if self.history is None:
+            return
 
-                if isinstance(data, dict) and data.get("status") == "wolne":
-                    ilosc = f"— (wolne: {data.get('powod')})"
-                else:
-                    ilosc = len(data)
+        for dzien, skrot in self.history.page(self.shown, PAGE_SIZE):
+            self.tree.upsert(*self.row(dzien, skrot))
+            self.shown += 1
 
-                dzien = fname.replace(".json", "")
+        self.update_page_info()
 
-                self.tree.insert("", "end", values=(dzien, ilosc))
+    def row(self, dzien, skrot):
+        if skrot.get("wolne"):
+            ilosc = f"— (wolne: {skrot.get('powod')})"
+        else:
+            ilosc = skrot.get("ilosc", 0)
+        return dzien, (dzien, ilosc)
 
-            except:
-                continue
+    def update_page_info(self):
+        wszystkie = len(self.history)
+        self.page_info.config(text=f"Pokazano {self.shown} z {wszystkie} dni")
+        self.more_button.state(["!disabled" if self.shown < wszystkie else "disabled"])
 
     def refresh(self):
-        self.load()
-        messagebox.showinfo("Odświeżono", "Lista została odświeżona.")
+        self.load(lambda: messagebox.showinfo("Odświeżono", "Lista została odświeżona."))
 
     # ============================================================
     # DOUBLE CLICK NA DZIEŃ
@@ -159,7 +181,7 @@ class ZastepstwaTab:
         if not item:
             return
 
-        dzien = self.tree.item(item)["values"][0]
+        dzien = item[0]
         self.show_day_details(dzien)
 
     # ============================================================
@@ -168,10 +190,8 @@ class ZastepstwaTab:
     def show_day_details(self, dzien):
         path = os.path.join(self.zastepstwa_dir, f"{dzien}.json")
 
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-        except:
+        data = self.store.load(path)
+        if data is None:
             messagebox.showerror("Błąd", f"Nie można otworzyć:\n{path}")
             return
 
@@ -189,7 +209,7 @@ class ZastepstwaTab:
             return
 
         cols = ("godzina", "klasa", "przedmiot", "status", "zastepujacy")
-        tree = ttk.Treeview(win, columns=cols, show="headings", height=18)
+        tree = VirtualTree(win, columns=cols, height=18)
 
         for c in cols:
             tree.heading(c, text=c.capitalize())
@@ -197,69 +217,84 @@ class ZastepstwaTab:
 
         tree.pack(fill="both", expand=True, padx=10, pady=10)
 
-        for z in data:
-            tree.insert("", "end", values=(
+        tree.set_rows(
+            (i, (
                 z.get("godzina"),
                 z.get("klasa"),
                 z.get("przedmiot"),
                 z.get("status"),
                 z.get("nauczyciel_zastepujacy") or "—"
             ))
+            for i, z in enumerate(data)
+        )
 
     # ============================================================
-    # GENEROWANIE ZASTĘPSTW
+    # GENEROWANIE ZASTĘPSTW — w tle, w tym samym procesie
     # ============================================================
     def generate(self):
 
-        jutro = date.today() + timedelta(days=1)
-        jutro_str = jutro.strftime("%Y-%m-%d")
-
-        free = self.is_day_free(jutro_str)
+        # import dopiero przy pierwszym użyciu — szybszy start menu
+        import zastepstwa
 
-        # Jeśli wolne — zapisujemy plik i kończymy
-        if free:
-            out_path = os.path.join(self.zastepstwa_dir, f"{jutro_str}.json")
+        jutro = date.today() + timedelta(days=1)
+        raport = self.instrument.get()
+        profil = self.profile.get()
+
+        def job(task):
+            args = (self.data_dir, [jutro])
+            kwargs = dict(log=task.log, progress=task.progress, instrument=raport)
+            if not profil:
+                return zastepstwa.run(*args, **kwargs)
+            from core.profiling import profile_call
+            return profile_call(self.data_dir, "zastepstwa", zastepstwa.run, args, kwargs, log=task.log)
+
+        task = self.tasks.submit(
+            job,
+            name="Generator zastępstw",
+            key="zastepstwa",
+            on_done=self.generate_done,
+            on_error=self.generate_failed,
+            on_log=self.append_log,
+            on_progress=self.show_progress,
+            on_cancel=self.generate_cancelled
+        )
+        if task is None:
+            return
 
-            data = {
-                "status": "wolne",
-                "powod": free.get("powod"),
-            }
+        self.log.delete(1.0, "end")
+        self.set_running(True)
 
-            if "od" in free and "do" in free:
-                data["od"] = free["od"]
-                data["do"] = free["do"]
+    def set_running(self, trwa):
+        self.gen_button.state(["disabled" if trwa else "!disabled"])
+        self.cancel_button.state(["!disabled" if trwa else "disabled"])
+        if not trwa:
+            self.progress["value"] = 0
+            self.status.config(text="")
 
-            with open(out_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+    def show_progress(self, zrobione, wszystkie, opis):
+        if wszystkie:
+            self.progress["value"] = 100 * zrobione / wszystkie
+        self.status.config(text=opis or "")
 
-            self.load()
-            self.log.delete(1.0, "end")
-            self.log.insert("end", f"{jutro_str} — dzień wolny.\nPowód: {free['powod']}")
-            messagebox.showinfo("Dzień wolny", f"{jutro_str} — {free['powod']}")
-            return
+    def append_log(self, tekst):
+        self.log.insert("end", tekst + "\n")
+        self.log.see("end")
 
-        # Normalne generowanie
-        if not os.path.exists(self.script):
-            messagebox.showerror("Błąd", f"Brak pliku:\n{self.script}")
-            return
-
-        try:
-            result = subprocess.run(
-                ["python3", self.script],
-                cwd=self.base_dir,
-                capture_output=True,
-                text=True
-            )
+    def generate_done(self, wynik):
+        self.set_running(False)
+        self.load()
 
-            self.log.delete(1.0, "end")
-            self.log.insert("end", result.stdout)
+        for dzien, dane in wynik:
+            if isinstance(dane, dict):
+                messagebox.showinfo("Dzień wolny", f"{dzien.strftime('%Y-%m-%d')} — {dane['powod']}")
+                return
 
-            if result.stderr:
-                self.log.insert("end", "\n[BŁĄD]\n" + result.stderr)
+        messagebox.showinfo("Gotowe!", "Zastępstwa wygenerowane.")
 
-        except Exception as e:
-            messagebox.showerror("Błąd", f"Nie można wygenerować:\n{e}")
-            return
+    def generate_failed(self, blad):
+        self.set_running(False)
+        messagebox.showerror("Błąd", f"Nie można wygenerować:\n{blad}")
 
-        self.load()
-        messagebox.showinfo("Gotowe!", "Zastępstwa wygenerowane.")
+    def generate_cancelled(self):
+        self.set_running(False)
+        self.append_log("⏹ Anulowano.")
@@ -0,0 +1,192 @@
+# ⏳ Zadania w tle dla menu (Tkinter)
+# ✔ pula wątków — pliki, generatory i sieć nie blokują okna
+# ✔ wyniki, logi i postęp wracają przez kolejkę czytaną w root.after
+# ✔ anulowanie: zadanie sprawdza task.check() / task.cancelled w bezpiecznych miejscach
+#
+# Tk wolno dotykać tylko z wątku głównego — wszystkie callbacki (on_done,
+# on_error, on_log, on_progress) wywoływane są właśnie tam.
+
+import queue
+import itertools
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+
+class TaskCancelled(Exception):
+    """Zgłaszany przez task.check() po anulowaniu zadania."""
+
+
+class Task:
+    _ids = itertools.count(1)
+
+    def __init__(self, scheduler, name, key=None):
+        self.id = next(self._ids)
+        self.name = name
+        self.key = key
+        self.postep = None          # (zrobione, wszystkie, opis)
+        self.future = None
+        self._scheduler = scheduler
+        self._cancel = threading.Event()
+
+    # --- wołane z wątku roboczego ---
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def check(self):
+        if self._cancel.is_set():
+            raise TaskCancelled(self.name)
+
+    def log(self, *teksty):
+        self._scheduler._put(self, "log", " ".join(str(t) for t in teksty))
+
+    def progress(self, zrobione, wszystkie=None, opis=None):
+        """Zgłasza postęp i przy okazji sprawdza anulowanie."""
+        self._scheduler._put(self, "progress", (zrobione, wszystkie, opis))
+        self.check()
+
+    # --- wołane z wątku Tk ---
+
+    def cancel(self):
+        self._cancel.set()
+        # zadanie jeszcze nie wystartowało → nie wystartuje wcale
+        if self.future is not None and self.future.cancel():
+            self._scheduler._put(self, "cancelled", None)
+
+    def running(self):
+        return self.future is not None and not self.future.done()
+
+
+class TaskScheduler:
+    def __init__(self, root, workers=4, interval=50):
+        self.root = root
+        self.interval = interval
+        self.tasks = {}             # id → Task (niezakończone)
+        self.listeners = []         # callback(scheduler) po każdej zmianie listy / postępu
+
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="menu-task")
+        self._queue = queue.Queue()
+        self._callbacks = {}        # id → dict callbacków
+        self._polling = False
+
+    # ============================================================
+    # ZLECANIE ZADAŃ
+    # ============================================================
+
+    def submit(self, func, *args, name="Zadanie", key=None, on_done=None,
+               on_error=None, on_log=None, on_progress=None, on_cancel=None):
+        """Uruchamia `func(task, *args)` w puli. Zadanie z `key` nie ruszy,
+        jeśli poprzednie o tym samym kluczu jeszcze trwa (zwraca wtedy None)."""
+
+        if key is not None and self.busy(key):
+            return None
+
+        task = Task(self, name, key)
+        self.tasks[task.id] = task
+        self._callbacks[task.id] = {
+            "done": on_done, "error": on_error, "log": on_log,
+            "progress": on_progress, "cancelled": on_cancel
+        }
+
+        task.future = self._pool.submit(self._run, task, func, args)
+
+        self._notify()
+        self._ensure_polling()
+        return task
+
+    def _run(self, task, func, args):
+        try:
+            task.check()
+            wynik = func(task, *args)
+        except TaskCancelled:
+            self._put(task, "cancelled", None)
+        except Exception as e:
+            self._put(task, "error", (e, traceback.format_exc()))
+        else:
+            self._put(task, "done", wynik)
+
+    def _put(self, task, rodzaj, dane):
+        self._queue.put((task.id, rodzaj, dane))
+
+    # ============================================================
+    # STAN
+    # ============================================================
+
+    def busy(self, key):
+        return any(t.key == key for t in self.tasks.values())
+
+    def cancel(self, key=None):
+        """Anuluje zadania o danym kluczu (albo wszystkie)."""
+        for t in list(self.tasks.values()):
+            if key is None or t.key == key:
+                t.cancel()
+
+    def shutdown(self):
+        self.cancel()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _notify(self):
+        for f in self.listeners:
+            f(self)
+
+    # ============================================================
+    # KOLEJKA → WĄTEK TK
+    # ============================================================
+
+    def _ensure_polling(self):
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.interval, self._poll)
+
+    def _poll(self):
+        zmiana = False
+
+        while True:
+            try:
+                task_id, rodzaj, dane = self._queue.get_nowait()
+            except queue.Empty:
+                break
+
+            task = self.tasks.get(task_id)
+            if task is None:
+                continue
+
+            callbacki = self._callbacks[task_id]
+
+            if rodzaj == "progress":
+                task.postep = dane
+                zmiana = True
+            elif rodzaj != "log":
+                # zadanie zakończone — znika z listy przed wywołaniem callbacku
+                del self.tasks[task_id]
+                del self._callbacks[task_id]
+                zmiana = True
+
+            f = callbacki.get(rodzaj)
+            try:
+                if rodzaj == "error":
+                    blad, slad = dane
+                    if f:
+                        f(blad)
+                    else:
+                        print(slad)
+                elif rodzaj == "progress":
+                    if f:
+                        f(*dane)
+                elif rodzaj == "cancelled":
+                    if f:
+                        f()
+                elif f:
+                    f(dane)
+            except Exception:
+                traceback.print_exc()
+
+        if zmiana:
+            self._notify()
+
+        if self.tasks or not self._queue.empty():
+            self.root.after(self.interval, self._poll)
+        else:
+            self._polling = False
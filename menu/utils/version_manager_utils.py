@@ -1,9 +1,9 @@
 import os
 import json
-import zipfile
-import requests
 from io import BytesIO
 
+# requests i zipfile importowane dopiero w funkcjach — nie spowalniają startu menu
+
 
 GITHUB_API_RELEASES = "https://api.github.com/repos/WaleonGames/ZastepstwaUI20/releases/latest"
 
@@ -21,6 +21,7 @@ def load_local_version(version_path):
 def fetch_latest_release():
     """Pobiera dane o najnowszym Release z GitHuba."""
     try:
+        import requests
         r = requests.get(GITHUB_API_RELEASES, timeout=5)
         data = r.json()
 
@@ -39,6 +40,7 @@ def fetch_latest_release():
 def download_zip(url):
     """Pobiera ZIP aktualizacji z GitHuba."""
     try:
+        import requests
         r = requests.get(url, timeout=10)
         return BytesIO(r.content)
     except Exception as e:
@@ -48,6 +50,7 @@ def download_zip(url):
 def install_zip(zip_bytes, target_folder):
     """Rozpakowuje ZIP do głównego folderu projektu."""
     try:
+        import zipfile
         with zipfile.ZipFile(zip_bytes, "r") as z:
             z.extractall(target_folder)
         return True
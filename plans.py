@@ -1,42 +1,20 @@
 #!/usr/bin/env python3
-# 🎓 Generator planów lekcji v13 — pełna siatka godzin 8:00–16:00
+# 🎓 Generator planów lekcji v14 — pełna siatka godzin 8:00–16:00
 # ✔ Obsługa klas z wychowawcą
 # ✔ Automatyczna lekcja wychowawcza w planie
+# ✔ Wspólne układanie wszystkich klas — bez podwójnych lekcji nauczyciela
 # Autor: Kacper
 
-import os, json, random
-
-DATA_DIR = "data"
-PLANY_DIR = os.path.join(DATA_DIR, "plany")
-
-# GLOBALNE (udostępniane do generate_plan)
-klasy_global = {}
-nauczyciele_global = []
-
-
-# ============================================
-# ⚙️ ŁADOWANIE / ZAPIS JSON
-# ============================================
-
-def load_all_json(directory):
-    data = {}
-    for file in os.listdir(directory):
-        if not file.endswith(".json"):
-            continue
-        name = file[:-5]
-        path = os.path.join(directory, file)
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                data[name] = json.load(f)
-        except Exception as e:
-            print(f"❌ Błąd podczas wczytywania {file}: {e}")
-    return data
+import os, copy, json, random, argparse, hashlib
+from concurrent.futures import ProcessPoolExecutor
 
+from core.scheduler import schedule_plans, class_seed
+from core.store import get_store, PLANY
+from core.instrumentation import Instrumentation
+from core.timetable import load_timetable, save_timetable
 
-def save_json(path, content):
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(content, f, indent=2, ensure_ascii=False)
+DATA_DIR = "data"
+MANIFEST_NAME = os.path.join("cache", "plany_manifest.json")
 
 
 # ============================================
@@ -68,7 +46,13 @@ def class_etap(klasa, etapy):
 # 👩‍🏫 PRZYPISYWANIE NAUCZYCIELI DO PRZEDMIOTÓW
 # ============================================
 
-def assign_teachers_to_classes(klasy, nauczyciele, przedmioty, etapy):
+def assign_teachers_to_classes(klasy, nauczyciele, przedmioty, etapy, poprzednie=None, log=print,
+                               rng=None):
+    """`poprzednie` — {klasa: {przedmiot: imie}} z poprzedniego uruchomienia;
+    jeśli dawny nauczyciel nadal pasuje, zostaje przy klasie.
+    `rng` — random.Random (domyślnie globalny moduł random)."""
+    rng = rng or random
+    poprzednie = poprzednie or {}
     subject_teachers = {}
 
     for n in nauczyciele:
@@ -94,10 +78,15 @@ def assign_teachers_to_classes(klasy, nauczyciele, przedmioty, etapy):
             ]
 
             if not nauczyciele_lista:
-                print(f"⚠️ Brak nauczyciela {subject} — {klasa}")
+                log(f"⚠️ Brak nauczyciela {subject} — {klasa}")
                 continue
 
-            chosen = random.choice(nauczyciele_lista)
+            dawny = poprzednie.get(klasa, {}).get(subject)
+            chosen = next((n for n in nauczyciele_lista if n["imie"] == dawny), None)
+
+            if chosen is None:
+                chosen = rng.choice(nauczyciele_lista)
+
             class_teacher_map[klasa][subject] = chosen
 
     return class_teacher_map
@@ -107,8 +96,9 @@ def assign_teachers_to_classes(klasy, nauczyciele, przedmioty, etapy):
 # 📚 GENERATOR PLANU — PEŁNA SIATKA 8–16
 # ============================================
 
-def generate_plan(klasa, class_teachers, przedmioty, dni, godziny):
-    global klasy_global, nauczyciele_global
+def generate_plan(klasa, class_teachers, przedmioty, dni, godziny,
+                  klasy, nauczyciele, rng=None):
+    rng = rng or random
 
     # pusta siatka godzin
     plan = {
@@ -130,7 +120,7 @@ def generate_plan(klasa, class_teachers, przedmioty, dni, godziny):
     for subj in subjects:
         weekly += [subj] * przedmioty[subj].get("godziny", 1)
 
-    random.shuffle(weekly)
+    rng.shuffle(weekly)
 
     # ile lekcji dziennie
     num_days = len(dni)
@@ -148,7 +138,7 @@ def generate_plan(klasa, class_teachers, przedmioty, dni, godziny):
     # --- przypisywanie lekcji ---
     for i, dzien in enumerate(dni):
         slots = list(range(len(godziny)))
-        random.shuffle(slots)
+        rng.shuffle(slots)
         slots = slots[:lessons_per_day[i]]
 
         for slot in slots:
@@ -173,14 +163,14 @@ def generate_plan(klasa, class_teachers, przedmioty, dni, godziny):
     # 🟩 DODANIE LEKCJI WYCHOWAWCZEJ
     # =====================================================================
 
-    wychowawca = klasy_global[klasa]["wychowawca"]
+    wychowawca = klasy[klasa]["wychowawca"]
 
-    wych_obj = next((n for n in nauczyciele_global if n["imie"] == wychowawca), None)
+    wych_obj = next((n for n in nauczyciele if n["imie"] == wychowawca), None)
 
     if wych_obj:
 
         dni_shuffle = dni[:]
-        random.shuffle(dni_shuffle)
+        rng.shuffle(dni_shuffle)
 
         inserted = False
 
@@ -192,19 +182,12 @@ def generate_plan(klasa, class_teachers, przedmioty, dni, godziny):
             if not wolne_sloty:
                 continue
 
-            random.shuffle(wolne_sloty)
+            rng.shuffle(wolne_sloty)
 
             for slot in wolne_sloty:
 
-                # sprawdź czy wychowawca nie ma lekcji w innej klasie o tej godzinie
-                zajety = False
-                for p in class_teachers.values():
-                    for subj, nauc in p.items():
-                        if nauc["imie"] == wychowawca:
-                            # tu zakładamy zgodną siatkę — OK
-                            pass
-
-                # wstawiamy wychowawczą
+                # wstawiamy wychowawczą (silnik "random" układa klasy osobno —
+                # bez konfliktów wychowawcy między klasami dba tylko "solver")
                 plan[d][slot] = {
                     "godzina": godziny[slot],
                     "przedmiot": "Wychowawcza",
@@ -222,37 +205,228 @@ def generate_plan(klasa, class_teachers, przedmioty, dni, godziny):
 
 
 # ============================================
-# 🧠 GŁÓWNA FUNKCJA
+# ⚡ RÓWNOLEGŁE GENEROWANIE (silnik "random")
 # ============================================
 
-def main():
-    global klasy_global, nauczyciele_global
+def generate_plan_job(zadanie):
+    """Plan jednej klasy z własnym ziarnem — wywoływane w procesach puli."""
+    klasa, class_teachers, przedmioty, dni, godziny, klasy, nauczyciele, seed = zadanie
+    rng = random.Random(class_seed(seed, klasa))
+    return klasa, generate_plan(klasa, class_teachers, przedmioty, dni, godziny,
+                                klasy=klasy, nauczyciele=nauczyciele, rng=rng)
 
-    data = load_all_json(DATA_DIR)
 
-    szkola = data["szkola"]
-    klasy = data["klasy"]
-    nauczyciele = data["nauczyciele"]
-    przedmioty = data["przedmioty"]
-    etapy = data["etapy"]
+def generate_plans_parallel(klasy, class_teachers, przedmioty, nauczyciele, dni, godziny,
+                            seed, workers=1):
+    """Plany wszystkich klas niezależnie, po jednej klasie na zadanie.
+    Ziarno klasy nie zależy od liczby procesów → wynik zawsze ten sam."""
 
-    klasy_global = klasy
-    nauczyciele_global = nauczyciele
+    wychowawcy = {klasy[k].get("wychowawca") for k in klasy}
+    nauczyciele_wych = [n for n in nauczyciele if n["imie"] in wychowawcy]
 
-    dni = ["poniedzialek", "wtorek", "sroda", "czwartek", "piatek"]
-    godziny = [g for g in szkola["godziny_szkolne"] if time_in_range(g)]
+    zadania = [
+        (klasa, {klasa: class_teachers[klasa]}, przedmioty, dni, godziny,
+         {klasa: klasy[klasa]}, nauczyciele_wych, seed)
+        for klasa in klasy.keys()
+    ]
 
-    print(f"🏫 Generowanie planów…")
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(zadania) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            wyniki = list(pool.map(generate_plan_job, zadania, chunksize=max(1, len(zadania) // (workers * 4))))
+    else:
+        wyniki = [generate_plan_job(z) for z in zadania]
 
-    class_teachers = assign_teachers_to_classes(klasy, nauczyciele, przedmioty, etapy)
+    return dict(wyniki)
+
+
+# ============================================
+# 🔁 TRYB PRZYROSTOWY — MANIFEST WEJŚĆ KLAS
+# ============================================
+
+def load_manifest(store):
+    manifest = store.load(MANIFEST_NAME)
+    return manifest if isinstance(manifest, dict) and "klasy" in manifest else {"klasy": {}}
+
+
+def class_hash(klasa, klasy, class_teachers, przedmioty, nauczyciele_po_imieniu,
+               dni, godziny, engine):
+    """Skrót wszystkiego, od czego zależy plan jednej klasy."""
+
+    def nauc(n):
+        return {"imie": n.get("imie"), "sala": n.get("sala")} if n else None
+
+    wejscie = {
+        "engine": engine,
+        "dni": dni,
+        "godziny": godziny,
+        "przedmioty": {
+            subj: {"godziny": przedmioty[subj].get("godziny", 1),
+                   "nauczyciel": nauc(n)}
+            for subj, n in class_teachers.get(klasa, {}).items()
+        },
+        "wychowawca": nauc(nauczyciele_po_imieniu.get(klasy[klasa].get("wychowawca"))),
+    }
+
+    tekst = json.dumps(wejscie, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(tekst.encode("utf-8")).hexdigest()
+
+
+# ============================================
+# 🧠 GŁÓWNA FUNKCJA
+# ============================================
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generator planów lekcji")
+    parser.add_argument("--engine", choices=["solver", "random"], default="solver",
+                        help="solver — wszystkie klasy naraz bez konfliktów (domyślnie), "
+                             "random — dawny losowy generator klasa po klasie")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="ziarno losowania — ten sam wynik przy każdym uruchomieniu")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="liczba procesów (0 = wszystkie rdzenie)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="przebuduj tylko klasy, których dane się zmieniły")
+    parser.add_argument("--compact", action="store_true",
+                        help="zapisuj plany bez wcięć (mniejsze pliki, szybszy zapis)")
+    parser.add_argument("--instrument", action="store_true", default=None,
+                        help="raport czasów faz i liczników (też ZASTEPSTWA_INSTRUMENT=1)")
+    return parser.parse_args(argv)
+
+
+def run(data_dir=DATA_DIR, engine="solver", seed=None, workers=1,
+        incremental=False, compact=False, log=print, progress=None, instrument=None):
+    """Generuje plany wszystkich klas w `data_dir`. Komunikaty idą do `log`
+    (menu przekazuje tu własną funkcję), etapy pracy do `progress(krok, kroki, opis)`
+    — menu może tam przerwać pracę wyjątkiem, zanim cokolwiek zostanie zapisane.
+    `instrument` — raport wydajności (None: wg ZASTEPSTWA_INSTRUMENT).
+    Zwraca {seed, klasy}."""
+    progress = progress or (lambda *a: None)
+    with Instrumentation("plany", instrument) as instr:
+        store = get_store(data_dir)
+
+        with instr.phase("wczytanie"):
+            # zmiany z menu czekające w kolejce zapisu trafiają na dysk przed startem
+            store.flush()
+            szkola = store.szkola()
+            # kopie — zakładki menu zmieniają wspólne obiekty magazynu w wątku Tk
+            klasy = copy.deepcopy(store.klasy())
+            nauczyciele = copy.deepcopy(store.nauczyciele())
+            przedmioty = copy.deepcopy(store.przedmioty())
+            etapy = store.etapy()
+
+        dni = ["poniedzialek", "wtorek", "sroda", "czwartek", "piatek"]
+        godziny = [g for g in szkola["godziny_szkolne"] if time_in_range(g)]
+
+        manifest = load_manifest(store) if incremental else {"klasy": {}}
+
+        if seed is None:
+            seed = manifest.get("seed", random.randrange(2 ** 32))
+        # własny generator — menu działa w tym samym procesie, globalny random zostaje nietknięty
+        rng = random.Random(seed)
+
+        log(f"🏫 Generowanie planów… (ziarno: {seed})")
+        progress(0, 3, "Przydział nauczycieli")
+
+        # przydział nauczycieli ustalony PRZED podziałem na procesy
+        poprzednie = {k: m.get("nauczyciele", {}) for k, m in manifest["klasy"].items()}
+        with instr.phase("przydział"):
+            class_teachers = assign_teachers_to_classes(klasy, nauczyciele, przedmioty, etapy, poprzednie, log, rng)
+
+        nauczyciele_po_imieniu = {n["imie"]: n for n in nauczyciele}
+        skroty = {
+            k: class_hash(k, klasy, class_teachers, przedmioty, nauczyciele_po_imieniu,
+                          dni, godziny, engine)
+            for k in klasy.keys()
+        }
+
+        # klasy do przebudowania
+        do_zrobienia = {
+            k: v for k, v in klasy.items()
+            if manifest["klasy"].get(k, {}).get("hash") != skroty[k]
+            or not os.path.exists(store.plan_path(k))
+        }
+
+        if incremental:
+            log(f"🔁 Zmienione klasy: {len(do_zrobienia)}/{len(klasy)}")
+
+        progress(1, 3, f"Układanie planów ({len(do_zrobienia)} klas)")
+        instr.count("klasy", len(klasy))
+        instr.count("klasy do ułożenia", len(do_zrobienia))
+
+        # siatka z planami klas bez zmian — nowe plany trafiają do niej przed zapisem
+        with instr.phase("plany bez zmian"):
+            siatka = load_timetable(
+                store, [k for k in klasy if k not in do_zrobienia], dni, godziny
+            )
+
+        if engine == "solver":
+            # plany klas bez zmian blokują godziny swoich nauczycieli
+            with instr.phase("układanie"):
+                plany, raport = schedule_plans(
+                    do_zrobienia, class_teachers, przedmioty, nauczyciele, dni, godziny,
+                    seed=seed, workers=workers,
+                    zajete=siatka.busy_slots()
+                )
+            instr.count("lekcje", raport["lekcje"])
+            instr.count("konflikty", raport["konflikty"])
+            instr.count("brakujące po zachłannym", raport["po_zachlannym"])
+
+            log(f"🧩 Rozmieszczono {raport['lekcje'] - raport['konflikty']}/{raport['lekcje']} lekcji "
+                  f"w {raport['czas']:.2f} s (grupy klas: {raport['grupy']}, "
+                  f"po przebiegu zachłannym brakowało {raport['po_zachlannym']})")
+
+            if raport["konflikty"]:
+                log(f"⚠️ Pozostałe konflikty: {raport['konflikty']}")
+                for klasa, przedmiot, imie in raport["nierozmieszczone"]:
+                    log(f"   • {klasa}: {przedmiot} ({imie})")
+
+        else:
+            with instr.phase("układanie"):
+                plany = generate_plans_parallel(
+                    do_zrobienia, class_teachers, przedmioty, nauczyciele, dni, godziny,
+                    seed=seed, workers=workers
+                )
+
+        # zapis wszystkich plików na końcu
+        progress(2, 3, "Zapis planów")
+        with instr.phase("zapis"):
+            for klasa, plan in plany.items():
+                siatka.set_plan(klasa, plan)
+            for klasa in save_timetable(store, siatka, plany, compact):
+                log(f"✔️ {klasa}")
+
+            store.save(MANIFEST_NAME, {
+                "seed": seed,
+                "klasy": {
+                    k: {
+                        "hash": skroty[k],
+                        "nauczyciele": {s: n["imie"] for s, n in class_teachers[k].items()}
+                    }
+                    for k in klasy.keys()
+                }
+            })
+
+            # menu zaraz czyta katalog plany/ — nic nie może czekać w kolejce zapisu
+            store.flush()
+
+        log("\n🎓 Wszystkie plany wygenerowane!")
+
+        if instr.enabled:
+            instr.stop()
+            sciezka = instr.save(store, PLANY, "plany")
+            log("")
+            for linia in instr.summary():
+                log(linia)
+            log(f"📁 Raport: {sciezka}")
+
+        return {"seed": seed, "klasy": list(plany.keys())}
 
-    for klasa in klasy.keys():
-        plan = generate_plan(klasa, class_teachers, przedmioty, dni, godziny)
-        out_path = os.path.join(PLANY_DIR, f"{klasa}.json")
-        save_json(out_path, plan)
-        print(f"✔️ {klasa}")
 
-    print("\n🎓 Wszystkie plany wygenerowane!")
+def main(argv=None):
+    args = parse_args(argv)
+    run(DATA_DIR, engine=args.engine, seed=args.seed, workers=args.workers,
+        incremental=args.incremental, compact=args.compact, instrument=args.instrument)
 
 
 # ============================================
@@ -1,10 +1,12 @@
 const express = require("express");
 const router = express.Router();
 const { loadJSON } = require("../utils/json");
+const { withAbsences } = require("../utils/absences");
 
 // Strona główna
 router.get("/", (req, res) => {
-  const nauczyciele = loadJSON("nauczyciele.json");
+  // obecność na jutro — flaga z nauczyciele.json + rejestr nieobecności
+  const nauczyciele = withAbsences(loadJSON("nauczyciele.json"));
 
   const nieobecni = nauczyciele.filter(n => n.obecnosc === "no");
   const powody = {};
@@ -2,9 +2,11 @@ const express = require("express");
 const router = express.Router();
 
 const { loadJSON } = require("../utils/json");
+const { withAbsences } = require("../utils/absences");
 
 router.get("/", (req, res) => {
-  const nauczyciele = loadJSON("nauczyciele.json");
+  // obecność na jutro — flaga z nauczyciele.json + rejestr nieobecności
+  const nauczyciele = withAbsences(loadJSON("nauczyciele.json"));
 
   res.render("nauczyciele", {
     title: "👩‍🏫 Nauczyciele",
@@ -0,0 +1,191 @@
+# 🧪 Rejestr nieobecności — core/absences.py
+# Dopisywanie, odczyt przyrostowy, wykrywanie przepisanego pliku, compact().
+#
+# Uruchomienie: python -m pytest -q
+
+import os, sys, json, datetime
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import pytest
+
+import core.absences as absences
+from core.absences import AbsenceLedger, absent_teachers, ledger_path
+
+D = datetime.date
+
+
+@pytest.fixture
+def path(tmp_path):
+    return ledger_path(str(tmp_path))
+
+
+def test_entries_follow_operations(path):
+    ledger = AbsenceLedger(path)
+    w = ledger.add("Jan Kowalski", D(2026, 3, 2), D(2026, 3, 4), "L4")
+    ledger.add("Anna Nowak", "2026-03-03")
+
+    assert ledger.is_absent("Jan Kowalski", D(2026, 3, 3))["powod"] == "L4"
+    assert ledger.is_absent("Jan Kowalski", D(2026, 3, 5)) is None
+    assert set(ledger.absent_on(D(2026, 3, 3))) == {"Jan Kowalski", "Anna Nowak"}
+
+    ledger.set_reason(w["id"], "szkolenie")
+    assert ledger.is_absent("Jan Kowalski", "2026-03-02")["powod"] == "szkolenie"
+
+    ledger.remove(w["id"])
+    assert ledger.absent_on("2026-03-02") == {}
+
+
+def test_rename_moves_entries(path):
+    ledger = AbsenceLedger(path)
+    ledger.add("Jan Kowalski", "2026-03-02", "2026-03-04")
+    ledger.add("Anna Nowak", "2026-03-02")
+
+    ledger.rename("Jan Kowalski", "Jan Kowalski-Nowak")
+
+    assert ledger.is_absent("Jan Kowalski", "2026-03-03") is None
+    assert ledger.is_absent("Jan Kowalski-Nowak", "2026-03-03")
+    # inny czytelnik widzi to samo po odczycie pliku
+    assert set(AbsenceLedger(path).absent_on("2026-03-02")) == {"Jan Kowalski-Nowak", "Anna Nowak"}
+
+
+def test_reload_reads_only_new_lines(path):
+    pisarz = AbsenceLedger(path)
+    czytelnik = AbsenceLedger(path)
+
+    pisarz.add("Jan Kowalski", "2026-03-02")
+    czytelnik.reload()
+    assert czytelnik.is_absent("Jan Kowalski", "2026-03-02")
+
+    pisarz.add("Anna Nowak", "2026-03-02")
+    czytelnik.reload()
+    assert set(czytelnik.absent_on("2026-03-02")) == {"Jan Kowalski", "Anna Nowak"}
+    assert czytelnik._linie == 2
+
+
+def test_partial_last_line_waits_for_newline(path):
+    ledger = AbsenceLedger(path)
+    linia = json.dumps({"op": "dodaj", "id": "a", "imie": "Jan", "od": "2026-03-02"})
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(linia[:10])
+    ledger.reload()
+    assert ledger.wpisy == {}
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(linia + "\n")
+    ledger.reload()
+    assert "a" in ledger.wpisy
+
+
+def test_replaced_file_is_read_again(path):
+    czytelnik = AbsenceLedger(path)
+    pisarz = AbsenceLedger(path)
+    w = pisarz.add("Jan Kowalski", "2026-03-02")
+    pisarz.add("Anna Nowak", "2026-03-02")
+    pisarz.remove(w["id"])
+    czytelnik.reload()
+
+    # compact() podmienia plik (nowy i-węzeł, krótsza treść)
+    pisarz.compact()
+    pisarz.add("Ewa Lis", "2026-03-02")
+    czytelnik.reload()
+
+    assert set(czytelnik.absent_on("2026-03-02")) == {"Anna Nowak", "Ewa Lis"}
+    assert czytelnik._linie == 2
+
+
+def test_rewrite_in_place_is_detected(path):
+    ledger = AbsenceLedger(path)
+    ledger.add("Jan Kowalski", "2026-03-02")
+
+    # ta sama długość, inna treść, a na końcu dopisana linia
+    with open(path, "rb") as f:
+        stare = f.read()
+    nowe = stare.replace(b"Jan Kowalski", b"Jan Nowakows")
+    with open(path, "r+b") as f:
+        f.write(nowe)
+        f.write(json.dumps({"op": "dodaj", "id": "b", "imie": "Anna", "od": "2026-03-02"}).encode() + b"\n")
+
+    ledger.reload()
+    assert set(ledger.absent_on("2026-03-02")) == {"Jan Nowakows", "Anna"}
+
+
+def test_truncated_file_is_read_again(path):
+    ledger = AbsenceLedger(path)
+    ledger.add("Jan Kowalski", "2026-03-02")
+    ledger.add("Anna Nowak", "2026-03-02")
+
+    with open(path, "rb") as f:
+        pierwsza = f.readline()
+    with open(path, "wb") as f:
+        f.write(pierwsza)
+
+    ledger.reload()
+    assert set(ledger.absent_on("2026-03-02")) == {"Jan Kowalski"}
+
+
+def test_compact_keeps_current_entries(path):
+    ledger = AbsenceLedger(path)
+    a = ledger.add("Jan Kowalski", "2026-03-02", powod="L4")
+    ledger.set_reason(a["id"], "szkolenie")
+    b = ledger.add("Anna Nowak", "2026-03-02")
+    ledger.remove(b["id"])
+
+    ledger.compact()
+
+    with open(path, encoding="utf-8") as f:
+        linie = [json.loads(l) for l in f]
+    assert linie == [{"op": "dodaj", **ledger.wpisy[a["id"]]}]
+
+    # po compact() dopisywanie działa dalej, także dla nowego czytelnika
+    ledger.add("Ewa Lis", "2026-03-03")
+    swiezy = AbsenceLedger(path)
+    assert swiezy.wpisy == ledger.wpisy
+    assert swiezy.is_absent("Jan Kowalski", "2026-03-02")["powod"] == "szkolenie"
+
+
+def test_maybe_compact_thresholds(path, monkeypatch):
+    monkeypatch.setattr(absences, "COMPACT_MIN_LINES", 6)
+    ledger = AbsenceLedger(path)
+
+    for _ in range(3):
+        w = ledger.add("Jan Kowalski", "2026-03-02")
+        ledger.remove(w["id"])
+    ledger.add("Anna Nowak", "2026-03-02")
+    ledger.add("Ewa Lis", "2026-03-02")
+
+    # 8 linii, 2 aktualne wpisy
+    assert ledger.maybe_compact()
+    assert ledger._linie == 2
+    assert not ledger.maybe_compact()
+
+
+def test_maybe_compact_skips_small_or_current_files(path, monkeypatch):
+    monkeypatch.setattr(absences, "COMPACT_MIN_LINES", 4)
+    ledger = AbsenceLedger(path)
+
+    w = ledger.add("Jan Kowalski", "2026-03-02")
+    ledger.remove(w["id"])
+    assert not ledger.maybe_compact()        # za mało linii
+
+    for imie in ("Anna", "Ewa", "Piotr"):
+        ledger.add(imie, "2026-03-02")
+    assert not ledger.maybe_compact()        # 5 linii, 3 aktualne — połowa nie jest nieaktualna
+
+
+def test_absent_teachers_merges_legacy_flag(path):
+    ledger = AbsenceLedger(path)
+    ledger.add("Anna Nowak", "2026-03-02", powod="L4")
+    nauczyciele = [
+        {"imie": "Jan Kowalski", "obecnosc": "no", "powod": "urlop"},
+        {"imie": "Anna Nowak", "obecnosc": "yes"},
+        {"imie": "Ewa Lis", "obecnosc": "yes"},
+    ]
+
+    assert absent_teachers(nauczyciele, ledger, "2026-03-02") == {
+        "Jan Kowalski": "urlop", "Anna Nowak": "L4"
+    }
+    assert absent_teachers(nauczyciele, ledger, "2026-03-03") == {"Jan Kowalski": "urlop"}
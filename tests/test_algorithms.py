@@ -0,0 +1,176 @@
+# 🧪 Algorytmy generatora zastępstw kontra przeszukiwanie wyczerpujące
+# Małe losowe przypadki (stałe ziarna): wynik szybkiej wersji musi być
+# równy wynikowi brute force.
+#
+# Uruchomienie: python -m pytest -q
+
+import os, sys, random, itertools
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import pytest
+
+from core.cascade import solve_slot, evaluate
+from core.intervals import IntervalIndex
+from core.matching import hopcroft_karp, assign_slot
+
+PRZYPADKI = 300
+
+
+# ============================================================
+# KASKADY — core/cascade.py
+# ============================================================
+
+def random_slot(rng):
+    n = rng.randint(1, 6)
+    sasiedzi = [
+        [j for j in range(n) if j != i and rng.random() < 0.4]
+        for i in range(n)
+    ]
+    return n, sasiedzi, rng.randint(0, n)
+
+
+def valid(decyzje, sasiedzi, wolnych):
+    """Zastępców nie więcej niż wolnych, a dołączyć można tylko do klasy z zastępcą."""
+    if sum(1 for d in decyzje if d == "S") > wolnych:
+        return False
+    for i, d in enumerate(decyzje):
+        if isinstance(d, tuple):
+            _, j = d
+            if j not in sasiedzi[i] or decyzje[j] != "S":
+                return False
+        elif d not in ("S", "X"):
+            return False
+    return True
+
+
+def brute_force_slot(n, sasiedzi, wolnych):
+    opcje = [["S", "X"] + [("C", j) for j in sasiedzi[i]] for i in range(n)]
+    return max(
+        evaluate(decyzje)
+        for decyzje in itertools.product(*opcje)
+        if valid(decyzje, sasiedzi, wolnych)
+    )
+
+
+@pytest.mark.parametrize("seed", range(PRZYPADKI))
+def test_solve_slot_matches_brute_force(seed):
+    rng = random.Random(seed)
+    n, sasiedzi, wolnych = random_slot(rng)
+
+    decyzje, pelne = solve_slot(n, sasiedzi, wolnych)
+
+    assert pelne
+    assert len(decyzje) == n
+    assert valid(decyzje, sasiedzi, wolnych)
+    assert evaluate(decyzje) == brute_force_slot(n, sasiedzi, wolnych)
+
+
+def brute_force_slot_preferred(n, sasiedzi, wolnych, premiowane):
+    opcje = [["S", "X"] + [("C", j) for j in sasiedzi[i]] for i in range(n)]
+    return max(
+        evaluate(decyzje, premiowane)
+        for decyzje in itertools.product(*opcje)
+        if valid(decyzje, sasiedzi, wolnych)
+    )
+
+
+@pytest.mark.parametrize("seed", range(PRZYPADKI))
+def test_solve_slot_prefers_given_lessons(seed):
+    rng = random.Random(seed)
+    n, sasiedzi, wolnych = random_slot(rng)
+    premiowane = {i for i in range(n) if rng.random() < 0.5}
+
+    decyzje, pelne = solve_slot(n, sasiedzi, wolnych, premiowane=premiowane)
+
+    assert pelne
+    assert valid(decyzje, sasiedzi, wolnych)
+    assert evaluate(decyzje, premiowane) == brute_force_slot_preferred(n, sasiedzi, wolnych, premiowane)
+
+
+def test_solve_slot_timeout_returns_valid_solution():
+    rng = random.Random(1)
+    n = 14
+    sasiedzi = [[j for j in range(n) if j != i and rng.random() < 0.5] for i in range(n)]
+
+    # termin już minął — wynik to najlepsze rozwiązanie znalezione do tej pory
+    decyzje, pelne = solve_slot(n, sasiedzi, 4, deadline=0)
+
+    assert not pelne
+    assert valid(decyzje, sasiedzi, 4)
+
+
+# ============================================================
+# PRZEDZIAŁY DAT — core/intervals.py
+# ============================================================
+
+def day(d):
+    return f"2026-01-{d:02d}"
+
+
+def random_intervals(rng):
+    przedzialy = []
+    for nr in range(rng.randint(0, 8)):
+        od = rng.randint(1, 25)
+        przedzialy.append((day(od), day(od + rng.randint(0, 5)), nr))
+    return przedzialy
+
+
+@pytest.mark.parametrize("seed", range(PRZYPADKI))
+def test_interval_index_matches_brute_force(seed):
+    rng = random.Random(seed)
+    przedzialy = random_intervals(rng)
+    indeks = IntervalIndex(przedzialy)
+
+    # kolejność jak w indeksie: po początku, przy remisie — kolejność wejścia
+    posortowane = sorted(przedzialy, key=lambda p: p[0])
+
+    for d in range(1, 31):
+        x = day(d)
+        zawierajace = [p[2] for p in posortowane if p[0] <= x <= p[1]]
+        assert indeks.find(x) == (zawierajace[-1] if zawierajace else None)
+
+    for _ in range(20):
+        a = rng.randint(1, 30)
+        b = rng.randint(a, 30)
+        oczekiwane = [p[2] for p in posortowane if p[0] <= day(b) and p[1] >= day(a)]
+        assert indeks.overlapping(day(a), day(b)) == oczekiwane
+
+
+# ============================================================
+# SKOJARZENIA — core/matching.py
+# ============================================================
+
+def brute_force_matching(adj, n_right):
+    """Rozmiar największego skojarzenia — wszystkie przypisania lewych wierzchołków."""
+    najlepszy = 0
+    for wybor in itertools.product(*[[-1] + list(s) for s in adj]):
+        uzyte = [v for v in wybor if v != -1]
+        if len(uzyte) == len(set(uzyte)):
+            najlepszy = max(najlepszy, len(uzyte))
+    return najlepszy
+
+
+@pytest.mark.parametrize("seed", range(PRZYPADKI))
+def test_hopcroft_karp_matches_brute_force(seed):
+    rng = random.Random(seed)
+    n_left, n_right = rng.randint(0, 6), rng.randint(0, 6)
+    adj = [rng.sample(range(n_right), rng.randint(0, n_right)) for _ in range(n_left)]
+
+    wynik = hopcroft_karp(adj, n_right)
+
+    prawi = [v for v in wynik if v != -1]
+    assert len(prawi) == len(set(prawi))
+    assert all(v == -1 or v in adj[u] for u, v in enumerate(wynik))
+    assert len(prawi) == brute_force_matching(adj, n_right)
+
+
+def test_assign_slot_respects_candidates_and_updates_load():
+    obciazenie = {"A": 1}
+    wynik = assign_slot([["A", "B"], ["A"], ["C"]], obciazenie)
+
+    # lekcja 1 może dostać tylko A, więc lekcja 0 musi wziąć B
+    assert wynik == ["B", "A", "C"]
+    assert obciazenie == {"A": 2, "B": 1, "C": 1}
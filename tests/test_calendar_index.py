@@ -0,0 +1,117 @@
+# 🧪 Indeks kalendarza — core/calendar_index.py kontra dawne sprawdzanie dzień po dniu
+# Losowe kalendarze (stałe ziarna): święta jednodniowe, przerwy, nakładające
+# się wpisy i wpisy w złym formacie.
+#
+# Uruchomienie: python -m pytest -q
+
+import os, sys, json, random, datetime
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import pytest
+
+from core.calendar_index import CalendarIndex, calendar_index
+
+PRZYPADKI = 200
+POCZATEK = datetime.date(2026, 1, 1)
+
+
+def is_day_free(calendar, data):
+    """Dawne is_day_free() z zastepstwa.py — liniowy przegląd calendar.json."""
+
+    if data.weekday() >= 5:
+        return {"powod": "Weekend"}
+
+    data_str = data.strftime("%Y-%m-%d")
+
+    for nazwa, wartosc in (calendar or {}).get("swieta", {}).items():
+
+        if isinstance(wartosc, str):
+            if wartosc == data_str:
+                return {"powod": nazwa}
+
+        elif isinstance(wartosc, list) and len(wartosc) == 2:
+            if wartosc[0] <= data_str <= wartosc[1]:
+                return {"powod": nazwa, "od": wartosc[0], "do": wartosc[1]}
+
+    return None
+
+
+def day(n):
+    return POCZATEK + datetime.timedelta(days=n)
+
+
+def random_calendar(rng):
+    swieta = {}
+    for nr in range(rng.randint(0, 10)):
+        od = day(rng.randint(0, 60))
+        rodzaj = rng.random()
+        if rodzaj < 0.4:
+            swieta[f"Święto {nr}"] = od.isoformat()
+        elif rodzaj < 0.9:
+            swieta[f"Przerwa {nr}"] = [od.isoformat(), (od + datetime.timedelta(days=rng.randint(0, 14))).isoformat()]
+        else:
+            swieta[f"Zły wpis {nr}"] = [od.isoformat()]
+    return {"swieta": swieta}
+
+
+@pytest.mark.parametrize("seed", range(PRZYPADKI))
+def test_free_days_between_matches_day_by_day_scan(seed):
+    rng = random.Random(seed)
+    kalendarz = random_calendar(rng)
+    indeks = CalendarIndex(kalendarz)
+
+    for _ in range(5):
+        a = rng.randint(0, 70)
+        od, do = day(a), day(a + rng.randint(0, 30))
+
+        oczekiwane = {}
+        d = od
+        while d <= do:
+            wolny = is_day_free(kalendarz, d)
+            if wolny:
+                oczekiwane[d] = wolny
+            d += datetime.timedelta(days=1)
+
+        wynik = indeks.free_days_between(od, do)
+        assert wynik == oczekiwane
+        assert list(wynik) == sorted(wynik)
+
+
+@pytest.mark.parametrize("seed", range(PRZYPADKI))
+def test_is_free_matches_day_by_day_scan(seed):
+    rng = random.Random(seed)
+    kalendarz = random_calendar(rng)
+    indeks = CalendarIndex(kalendarz)
+
+    for n in range(75):
+        assert indeks.is_free(day(n)) == is_day_free(kalendarz, day(n))
+
+
+def test_empty_or_missing_calendar():
+    for kalendarz in (None, {}, {"swieta": {}}):
+        indeks = CalendarIndex(kalendarz)
+        # 2026-01-02 to piątek, 2026-01-03 sobota
+        assert indeks.is_free(datetime.date(2026, 1, 2)) is None
+        assert indeks.free_days_between("2026-01-02", "2026-01-04") == {
+            datetime.date(2026, 1, 3): {"powod": "Weekend"},
+            datetime.date(2026, 1, 4): {"powod": "Weekend"},
+        }
+
+
+def test_calendar_index_rebuilt_after_file_change(tmp_path):
+    path = tmp_path / "calendar.json"
+    path.write_text(json.dumps({"swieta": {"A": "2026-01-05"}}), encoding="utf-8")
+
+    pierwszy = calendar_index(str(tmp_path))
+    assert calendar_index(str(tmp_path)) is pierwszy
+    assert pierwszy.is_free("2026-01-05") == {"powod": "A"}
+
+    path.write_text(json.dumps({"swieta": {"Inne": "2026-01-06"}}), encoding="utf-8")
+    drugi = calendar_index(str(tmp_path))
+
+    assert drugi is not pierwszy
+    assert drugi.is_free("2026-01-05") is None
+    assert drugi.is_free("2026-01-06") == {"powod": "Inne"}
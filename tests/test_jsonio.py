@@ -0,0 +1,200 @@
+# 🧪 Bezpieczny zapis JSON — core/jsonio.py
+# Zapis atomowy (treść, uprawnienia, sprzątanie po błędzie) oraz WriteBatcher
+# (łączenie zapisów, migawka danych, ponawianie nieudanych zapisów).
+#
+# Uruchomienie: python -m pytest -q
+
+import os, sys, json, stat
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import pytest
+
+import core.jsonio as jsonio
+from core.jsonio import WriteBatcher, write_atomic, write_json_atomic
+
+# odłożony zapis, który w trakcie testu na pewno nie zdąży się wykonać sam
+DLUGO = 60
+
+
+def mode(path):
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+
+def read_disk(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+# ============================================================
+# ZAPIS ATOMOWY
+# ============================================================
+
+def test_write_json_atomic_formats(tmp_path):
+    path = str(tmp_path / "a" / "x.json")
+
+    write_json_atomic(path, {"ą": [1, 2]})
+    with open(path, encoding="utf-8") as f:
+        assert f.read() == '{\n  "ą": [\n    1,\n    2\n  ]\n}'
+
+    write_json_atomic(path, {"ą": [1, 2]}, compact=True)
+    with open(path, encoding="utf-8") as f:
+        assert f.read() == '{"ą":[1,2]}'
+
+    assert os.listdir(tmp_path / "a") == ["x.json"]
+
+
+@pytest.mark.skipif(not hasattr(os, "fchmod"), reason="uprawnienia POSIX")
+def test_new_file_gets_default_mode(tmp_path):
+    path = str(tmp_path / "x.json")
+    write_atomic(path, b"{}")
+    assert mode(path) == 0o666 & ~jsonio._UMASK
+
+
+@pytest.mark.skipif(not hasattr(os, "fchmod"), reason="uprawnienia POSIX")
+@pytest.mark.parametrize("uprawnienia", [0o644, 0o640, 0o664])
+def test_existing_file_keeps_its_mode(tmp_path, uprawnienia):
+    path = str(tmp_path / "x.json")
+    with open(path, "wb") as f:
+        f.write(b"[]")
+    os.chmod(path, uprawnienia)
+
+    write_atomic(path, b"{}")
+
+    assert mode(path) == uprawnienia
+    assert read_disk(path) == {}
+
+
+def test_failed_write_keeps_old_file_and_no_temp(tmp_path, monkeypatch):
+    path = str(tmp_path / "x.json")
+    write_atomic(path, b"[1]")
+
+    def awaria(*args):
+        raise OSError("dysk pełny")
+    monkeypatch.setattr(jsonio.os, "replace", awaria)
+
+    with pytest.raises(OSError):
+        write_atomic(path, b"[2]")
+
+    assert read_disk(path) == [1]
+    assert os.listdir(tmp_path) == ["x.json"]
+
+
+# ============================================================
+# ŁĄCZENIE ZAPISÓW
+# ============================================================
+
+@pytest.fixture
+def batcher():
+    b = WriteBatcher(delay=DLUGO)
+    yield b
+    if b._timer is not None:
+        b._timer.cancel()
+
+
+def test_schedule_writes_last_data_on_flush(tmp_path, batcher):
+    path = str(tmp_path / "x.json")
+    zapisane = []
+    batcher.on_written = lambda p, d: zapisane.append((p, d))
+
+    batcher.schedule(path, [1])
+    batcher.schedule(path, [2])
+    assert batcher.pending(path) == (True, [2])
+    assert not os.path.exists(path)
+
+    batcher.flush()
+
+    assert read_disk(path) == [2]
+    assert zapisane == [(path, [2])]
+    assert batcher.pending(path) == (False, None)
+
+
+def test_schedule_snapshots_data(tmp_path, batcher):
+    path = str(tmp_path / "x.json")
+    dane = [1]
+
+    batcher.schedule(path, dane)
+    dane.append(2)
+    batcher.flush()
+
+    assert read_disk(path) == [1]
+
+
+def test_failed_write_is_retried(tmp_path, batcher, monkeypatch, capsys):
+    path = str(tmp_path / "x.json")
+    prawdziwy = jsonio.write_atomic
+    proby = []
+
+    def zawodny(p, payload):
+        proby.append(p)
+        if len(proby) < 3:
+            raise PermissionError("plik otwarty w innym programie")
+        prawdziwy(p, payload)
+    monkeypatch.setattr(jsonio, "write_atomic", zawodny)
+
+    batcher.schedule(path, [1])
+    batcher.flush()
+
+    # zapis czeka dalej, błąd zgłoszony raz
+    assert batcher.pending(path) == (True, [1])
+    assert list(batcher.take_errors()) == [path]
+    assert batcher._timer is not None
+
+    batcher.flush()
+    assert batcher.take_errors() == {}
+    assert capsys.readouterr().out.count("Błąd zapisu") == 1
+
+    batcher.flush()
+    assert read_disk(path) == [1]
+    assert batcher.pending(path) == (False, None)
+    assert len(proby) == 3
+
+
+def test_newer_data_wins_over_failed_write(tmp_path, batcher, monkeypatch):
+    path = str(tmp_path / "x.json")
+    prawdziwy = jsonio.write_atomic
+
+    def nowsze_w_trakcie(p, payload):
+        # w czasie nieudanego zapisu menu zdążyło zapisać nowsze dane
+        monkeypatch.setattr(jsonio, "write_atomic", prawdziwy)
+        batcher.schedule(p, [2])
+        raise OSError("błąd")
+    monkeypatch.setattr(jsonio, "write_atomic", nowsze_w_trakcie)
+
+    batcher.schedule(path, [1])
+    batcher.flush()
+    assert batcher.pending(path) == (True, [2])
+
+    batcher.flush()
+    assert read_disk(path) == [2]
+
+
+def test_retry_delay_is_capped(tmp_path, batcher, monkeypatch):
+    path = str(tmp_path / "x.json")
+    opoznienia = []
+    monkeypatch.setattr(batcher, "_arm", lambda d: opoznienia.append(d))
+
+    def awaria(p, payload):
+        raise OSError("błąd")
+    monkeypatch.setattr(jsonio, "write_atomic", awaria)
+
+    batcher.delay = 1
+    batcher.schedule(path, [1])
+    for _ in range(5):
+        batcher.flush()
+
+    # pierwsze _arm z schedule(), potem kolejne ponowienia
+    assert opoznienia == [1, 2, 4, WriteBatcher.RETRY_MAX, WriteBatcher.RETRY_MAX, WriteBatcher.RETRY_MAX]
+
+
+def test_write_now_replaces_pending(tmp_path, batcher):
+    path = str(tmp_path / "x.json")
+
+    batcher.schedule(path, [1])
+    batcher.write_now(path, [2])
+    batcher.flush()
+
+    assert read_disk(path) == [2]
+    assert batcher.pending(path) == (False, None)
@@ -0,0 +1,252 @@
+# 🧪 Generator planów — plans.py i core/scheduler.py
+# Syntetyczna szkoła (benchmarks/synthetic.py) w katalogu tymczasowym.
+#
+# Uruchomienie: python -m pytest -q
+
+import os, sys, random
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import pytest
+
+import plans
+from benchmarks.synthetic import generate_school
+from core.scheduler import TimetableScheduler, schedule_plans, WYCHOWAWCZA
+from core.store import get_store
+
+
+def cisza(*args):
+    pass
+
+
+def school(katalog, klasy=16, seed=3):
+    generate_school(str(katalog), klasy=klasy, seed=seed)
+    return str(katalog)
+
+
+def read_plans(data_dir):
+    store = get_store(data_dir)
+    store.invalidate()
+    return store.plany()
+
+
+def double_bookings(plany):
+    """(nauczyciel, dzien, godzina) prowadzone w więcej niż jednej klasie."""
+    zajete, podwojne = {}, []
+    for klasa, plan in plany.items():
+        for dzien, lekcje in plan.items():
+            for l in lekcje:
+                if not l.get("nauczyciel"):
+                    continue
+                klucz = (l["nauczyciel"], dzien, l["godzina"])
+                if klucz in zajete:
+                    podwojne.append((klucz, zajete[klucz], klasa))
+                zajete[klucz] = klasa
+    return podwojne
+
+
+# ============================================================
+# SILNIK "solver" — bez podwójnych lekcji nauczyciela
+# ============================================================
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_solver_never_double_books_a_teacher(tmp_path, seed):
+    data_dir = school(tmp_path, seed=seed)
+
+    plans.run(data_dir, engine="solver", seed=seed, log=cisza)
+    plany = read_plans(data_dir)
+
+    assert len(plany) == 16
+    assert double_bookings(plany) == []
+
+
+def test_solver_places_every_lesson_and_homeroom(tmp_path):
+    data_dir = school(tmp_path)
+    store = get_store(data_dir)
+
+    plans.run(data_dir, engine="solver", seed=5, log=cisza)
+
+    godziny_tygodniowo = sum(p["godziny"] for p in store.przedmioty().values())
+    for klasa, plan in read_plans(data_dir).items():
+        lekcje = [l for dzien in plan.values() for l in dzien if l["przedmiot"]]
+        wychowawcze = [l for l in lekcje if l["przedmiot"] == WYCHOWAWCZA]
+
+        assert len(lekcje) == godziny_tygodniowo + 1
+        assert [l["nauczyciel"] for l in wychowawcze] == [store.klasy()[klasa]["wychowawca"]]
+
+
+def test_scheduler_respects_blocked_slots():
+    dni, godziny = ["poniedzialek", "wtorek"], ["8:00-8:45", "8:55-9:40"]
+    nauc = {"imie": "Jan", "sala": "1"}
+
+    sched = TimetableScheduler(dni, godziny, seed=1)
+    sched.block("Jan", 0, 0)
+    sched.block("Jan", 1, 1)
+    for klasa in ("1A", "1B"):
+        sched.add_lesson(klasa, "Matematyka", nauc)
+
+    raport = sched.run()
+
+    assert raport["konflikty"] == 0
+    zajete = {(d, l["godzina"]) for k in ("1A", "1B")
+              for d, dzien in sched.plan(k).items() for l in dzien if l["nauczyciel"]}
+    assert zajete == {("poniedzialek", "8:55-9:40"), ("wtorek", "8:00-8:45")}
+
+
+def test_scheduler_reports_lessons_that_cannot_fit():
+    dni, godziny = ["poniedzialek"], ["8:00-8:45", "8:55-9:40"]
+    nauc = {"imie": "Jan"}
+
+    plany, raport = schedule_plans(
+        {k: {} for k in ("1A", "1B", "1C")},
+        {k: {"Matematyka": nauc} for k in ("1A", "1B", "1C")},
+        {"Matematyka": {"godziny": 1}}, [nauc], dni, godziny, seed=1
+    )
+
+    assert raport["lekcje"] == 3
+    assert raport["konflikty"] == 1
+    assert len(raport["nierozmieszczone"]) == 1
+    assert double_bookings(plany) == []
+
+
+# ============================================================
+# ZIARNO — wynik niezależny od liczby procesów
+# ============================================================
+
+@pytest.mark.parametrize("engine", ["solver", "random"])
+def test_same_seed_same_plans_for_any_worker_count(tmp_path, engine):
+    wyniki = []
+    for workers in (1, 3):
+        data_dir = school(tmp_path / f"w{workers}")
+        plans.run(data_dir, engine=engine, seed=42, workers=workers, log=cisza)
+        wyniki.append(read_plans(data_dir))
+
+    assert wyniki[0] == wyniki[1]
+
+
+def test_independent_groups_same_result_for_any_worker_count():
+    dni, godziny = ["poniedzialek", "wtorek"], ["8:00-8:45", "8:55-9:40", "9:50-10:35"]
+    klasy = {f"{i}A": {"wychowawca": f"N{i}"} for i in range(1, 5)}
+    nauczyciele = [{"imie": f"N{i}", "sala": str(i)} for i in range(1, 5)]
+    # każda klasa ma własnego nauczyciela → cztery niezależne grupy
+    class_teachers = {k: {"Matematyka": nauczyciele[i]} for i, k in enumerate(klasy)}
+    przedmioty = {"Matematyka": {"godziny": 3}}
+
+    wyniki = [
+        schedule_plans(klasy, class_teachers, przedmioty, nauczyciele, dni, godziny,
+                       seed=9, workers=w)
+        for w in (1, 4)
+    ]
+
+    assert wyniki[0][1]["grupy"] == 4
+    assert wyniki[0][0] == wyniki[1][0]
+
+
+def test_different_seeds_give_different_plans(tmp_path):
+    wyniki = []
+    for seed in (1, 2):
+        data_dir = school(tmp_path / f"s{seed}")
+        plans.run(data_dir, seed=seed, log=cisza)
+        wyniki.append(read_plans(data_dir))
+
+    assert wyniki[0] != wyniki[1]
+
+
+def test_run_leaves_global_random_untouched(tmp_path):
+    data_dir = school(tmp_path)
+
+    random.seed(7)
+    oczekiwane = random.random()
+
+    random.seed(7)
+    plans.run(data_dir, engine="random", seed=1, log=cisza)
+    assert random.random() == oczekiwane
+
+
+# ============================================================
+# TRYB PRZYROSTOWY — tylko zmienione klasy
+# ============================================================
+
+def test_incremental_without_changes_rebuilds_nothing(tmp_path):
+    data_dir = school(tmp_path)
+    pierwszy = plans.run(data_dir, seed=4, log=cisza)
+    przed = read_plans(data_dir)
+
+    drugi = plans.run(data_dir, incremental=True, log=cisza)
+
+    assert len(pierwszy["klasy"]) == 16
+    assert drugi == {"seed": 4, "klasy": []}
+    assert read_plans(data_dir) == przed
+
+
+def test_incremental_rebuilds_only_changed_class(tmp_path):
+    data_dir = school(tmp_path)
+    store = get_store(data_dir)
+    plans.run(data_dir, seed=4, log=cisza)
+    przed = read_plans(data_dir)
+
+    klasy = store.klasy()
+    inny = next(n["imie"] for n in store.nauczyciele() if n["imie"] != klasy["3A"]["wychowawca"])
+    klasy["3A"]["wychowawca"] = inny
+    store.save("klasy.json", klasy)
+
+    wynik = plans.run(data_dir, incremental=True, log=cisza)
+    po = read_plans(data_dir)
+
+    assert wynik["klasy"] == ["3A"]
+    assert {k for k in po if po[k] != przed[k]} <= {"3A"}
+    assert any(l["nauczyciel"] == inny and l["przedmiot"] == WYCHOWAWCZA
+               for dzien in po["3A"].values() for l in dzien)
+    # nowy plan omija godziny nauczycieli zajęte w planach bez zmian
+    assert double_bookings(po) == []
+
+
+def test_incremental_rebuilds_missing_plan_file(tmp_path):
+    data_dir = school(tmp_path)
+    store = get_store(data_dir)
+    plans.run(data_dir, seed=4, log=cisza)
+
+    store.delete_plan("2B")
+    wynik = plans.run(data_dir, incremental=True, log=cisza)
+
+    assert wynik["klasy"] == ["2B"]
+    assert os.path.exists(store.plan_path("2B"))
+
+
+def test_full_run_ignores_manifest(tmp_path):
+    data_dir = school(tmp_path)
+    plans.run(data_dir, seed=4, log=cisza)
+
+    wynik = plans.run(data_dir, seed=5, log=cisza)
+
+    assert wynik["seed"] == 5
+    assert len(wynik["klasy"]) == 16
+
+
+# ============================================================
+# WĄTEK MENU — run() pracuje na kopiach danych magazynu
+# ============================================================
+
+def test_generate_plan_requires_school_data():
+    with pytest.raises(TypeError):
+        plans.generate_plan("1A", {"1A": {}}, {}, ["poniedzialek"], ["8:00-8:45"])
+
+
+def test_run_ignores_edits_made_while_it_works(tmp_path):
+    data_dir = school(tmp_path)
+    store = get_store(data_dir)
+
+    def edycja_w_menu(krok, kroki, opis):
+        # zakładka Klasy zmienia wspólne obiekty magazynu w trakcie pracy generatora
+        if krok == 1:
+            store.klasy()["9Z"] = {"wychowawca": None, "uczniowie": []}
+            store.nauczyciele().clear()
+            store.przedmioty().clear()
+
+    wynik = plans.run(data_dir, seed=1, log=cisza, progress=edycja_w_menu)
+
+    assert len(wynik["klasy"]) == 16
+    assert "9Z" not in wynik["klasy"]
+    assert "9Z" not in store.load(plans.MANIFEST_NAME)["klasy"]
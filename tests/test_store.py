@@ -0,0 +1,212 @@
+# 🧪 Wspólny magazyn danych — core/store.py
+# Cache po (mtime, rozmiar), odłożone zapisy widoczne przed zapisem na dysk,
+# jedna ścieżka na plik niezależnie od zapisu ścieżki.
+#
+# Uruchomienie: python -m pytest -q
+
+import os, sys, json, datetime
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import pytest
+
+import plans, zastepstwa
+from benchmarks.synthetic import generate_school
+from core.store import DataStore
+
+# odłożony zapis, który w trakcie testu na pewno nie zdąży się wykonać sam
+DLUGO = 60
+
+
+def cisza(*args):
+    pass
+
+
+def read_disk(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    katalog = tmp_path / "data"
+    katalog.mkdir()
+    (katalog / "nauczyciele.json").write_text(json.dumps([{"imie": "Jan"}]), encoding="utf-8")
+    return str(katalog)
+
+
+# ============================================================
+# CACHE
+# ============================================================
+
+def test_unchanged_file_is_parsed_once(data_dir):
+    store = DataStore(data_dir)
+    assert store.nauczyciele() is store.nauczyciele()
+
+
+def test_external_change_is_seen(data_dir):
+    store = DataStore(data_dir)
+    assert store.nauczyciele() == [{"imie": "Jan"}]
+
+    with open(os.path.join(data_dir, "nauczyciele.json"), "w", encoding="utf-8") as f:
+        json.dump([{"imie": "Jan"}, {"imie": "Anna"}], f)
+
+    assert [n["imie"] for n in store.nauczyciele()] == ["Jan", "Anna"]
+
+
+def test_missing_or_broken_file_gives_default(data_dir, capsys):
+    store = DataStore(data_dir)
+    assert store.klasy() == {}
+
+    with open(os.path.join(data_dir, "klasy.json"), "w", encoding="utf-8") as f:
+        f.write("{ucięty")
+    assert store.klasy() == {}
+    assert "klasy.json" in capsys.readouterr().out
+
+    # akcesor pilnuje typu: lista w pliku słownika → pusty słownik
+    with open(os.path.join(data_dir, "klasy.json"), "w", encoding="utf-8") as f:
+        json.dump([], f)
+    assert store.klasy() == {}
+
+
+def test_save_updates_cache_without_reparse(data_dir):
+    store = DataStore(data_dir)
+    nowe = [{"imie": "Ewa"}]
+
+    store.save("nauczyciele.json", nowe)
+
+    assert store.nauczyciele() is nowe
+    assert read_disk(os.path.join(data_dir, "nauczyciele.json")) == nowe
+
+
+def test_delete_and_invalidate(data_dir):
+    store = DataStore(data_dir)
+    store.save_plan("1A", {"poniedzialek": []})
+    assert store.plan_names() == ["1A"]
+
+    store.delete_plan("1A")
+    assert store.plan_names() == []
+    assert store.plan("1A") == {}
+
+    stare = store.nauczyciele()
+    store.invalidate("nauczyciele.json")
+    assert store.nauczyciele() is not stare
+
+
+# ============================================================
+# ŚCIEŻKI
+# ============================================================
+
+def test_path_is_normalized(data_dir):
+    store = DataStore(data_dir)
+    okrezna = os.path.join(data_dir, "..", os.path.basename(data_dir), "nauczyciele.json")
+
+    assert store.path(okrezna) == store.path("nauczyciele.json")
+    assert store.path("nauczyciele.json") == os.path.join(os.path.abspath(data_dir), "nauczyciele.json")
+
+
+# ============================================================
+# ODŁOŻONE ZAPISY
+# ============================================================
+
+def test_pending_write_is_returned_before_flush(data_dir):
+    store = DataStore(data_dir, write_delay=DLUGO)
+    plik = os.path.join(data_dir, "nauczyciele.json")
+    nowe = [{"imie": "Ewa"}]
+
+    store.save("nauczyciele.json", nowe)
+
+    assert store.nauczyciele() is nowe
+    assert read_disk(plik) == [{"imie": "Jan"}]
+
+    store.flush()
+    assert read_disk(plik) == nowe
+    assert store.nauczyciele() is nowe
+
+
+def test_pending_write_under_other_spelling_of_path(data_dir):
+    # zakładki menu zapisują pod menu/../data/…, akcesory czytają <abs>/data/…
+    store = DataStore(data_dir, write_delay=DLUGO)
+    okrezna = os.path.join(data_dir, "..", os.path.basename(data_dir), "nauczyciele.json")
+    nowe = [{"imie": "Ewa"}]
+
+    store.save(okrezna, nowe)
+
+    assert store.nauczyciele() is nowe
+    store.flush()
+
+
+def test_later_save_replaces_pending_one(data_dir):
+    store = DataStore(data_dir, write_delay=DLUGO)
+
+    store.save("nauczyciele.json", [{"imie": "A"}])
+    store.save("nauczyciele.json", [{"imie": "B"}])
+    store.flush()
+
+    assert read_disk(os.path.join(data_dir, "nauczyciele.json")) == [{"imie": "B"}]
+
+
+def test_immediate_save_drops_pending_one(data_dir):
+    store = DataStore(data_dir, write_delay=DLUGO)
+
+    store.save("nauczyciele.json", [{"imie": "A"}])
+    store.save("nauczyciele.json", [{"imie": "B"}], delay=0)
+    store.flush()
+
+    assert read_disk(os.path.join(data_dir, "nauczyciele.json")) == [{"imie": "B"}]
+
+
+# ============================================================
+# GENERATORY — odłożone zmiany na dysku przed startem
+# ============================================================
+
+@pytest.fixture
+def school(tmp_path):
+    katalog = str(tmp_path / "szkola")
+    generate_school(katalog, klasy=8, seed=2)
+    return katalog
+
+
+def on_disk_at_start(store, name, data):
+    """progress() sprawdzający, że odłożony zapis jest już w pliku."""
+    widziane = []
+
+    def progress(*args):
+        if not widziane:
+            widziane.append(read_disk(store.path(name)) == data)
+    return progress, widziane
+
+
+def test_plans_run_flushes_pending_writes_first(school):
+    store = plans.get_store(school)
+    store.write_delay = DLUGO
+    try:
+        klasy = store.klasy()
+        klasy["1A"]["wychowawca"] = store.nauczyciele()[1]["imie"]
+        store.save("klasy.json", klasy)
+
+        progress, widziane = on_disk_at_start(store, "klasy.json", klasy)
+        plans.run(school, seed=1, log=cisza, progress=progress)
+    finally:
+        store.write_delay = 0
+
+    assert widziane == [True]
+
+
+def test_zastepstwa_run_flushes_pending_writes_first(school):
+    store = zastepstwa.get_store(school)
+    plans.run(school, seed=1, log=cisza)
+    store.write_delay = DLUGO
+    try:
+        nauczyciele = store.nauczyciele()
+        nauczyciele[0]["obecnosc"] = "no"
+        store.save("nauczyciele.json", nauczyciele)
+
+        progress, widziane = on_disk_at_start(store, "nauczyciele.json", nauczyciele)
+        zastepstwa.run(school, [datetime.date(2026, 3, 2)], log=cisza, progress=progress)
+    finally:
+        store.write_delay = 0
+
+    assert widziane == [True]
@@ -0,0 +1,77 @@
+# 🧪 Zwarty plan lekcji — core/timetable.py
+# Plan zapisany do Timetable i odczytany z powrotem musi być taki sam jak w pliku:
+# także kilka lekcji o jednej godzinie i wpisy spoza osi dni/godzin.
+#
+# Uruchomienie: python -m pytest -q
+
+import os, sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from core.timetable import Timetable
+
+DNI = ["poniedzialek", "wtorek"]
+GODZINY = ["8:00-8:45", "8:55-9:40"]
+
+
+def lesson(godzina, przedmiot, nauczyciel, sala=None):
+    return {"godzina": godzina, "przedmiot": przedmiot, "sala": sala, "nauczyciel": nauczyciel}
+
+
+def test_round_trip_keeps_lessons_sharing_an_hour():
+    plan = {"poniedzialek": [
+        lesson("8:00-8:45", "Angielski", "A", "12"),
+        lesson("8:00-8:45", "Niemiecki", "B", "14"),
+        lesson("8:55-9:40", "Matematyka", "C"),
+    ]}
+    tt = Timetable(DNI, GODZINY)
+    tt.set_plan("1A", plan)
+
+    assert tt.plan("1A") == plan
+    assert sorted(t for _, _, _, t in tt.lessons()) == sorted(tt.nauczyciele.get(n) for n in "ABC")
+    assert tt.lesson(0, 0, 0, 1)["przedmiot"] == "Niemiecki"
+    assert tt.lesson(0, 0, 0, 2) is None
+
+
+def test_round_trip_keeps_entries_outside_the_grid():
+    plan = {
+        "poniedzialek": [
+            lesson("7:10-7:55", "Religia", "R"),
+            lesson("8:00-8:45", "Matematyka", "C"),
+            lesson("16:30-17:15", "Koło", "K"),
+        ],
+        "sobota": [lesson("9:00-9:45", "Zajęcia dodatkowe", "Z")],
+    }
+    tt = Timetable(DNI, GODZINY)
+    tt.set_plan("1A", plan)
+
+    assert tt.plan("1A") == plan
+    # poza osią — bez wpływu na zajętość godzin siatki
+    assert [tt.nauczyciele.name(t) for _, _, _, t in tt.lessons()] == ["C"]
+
+
+def test_set_plan_replaces_previous_plan():
+    tt = Timetable(DNI, GODZINY)
+    tt.set_plan("1A", {
+        "poniedzialek": [lesson("8:00-8:45", "Angielski", "A"), lesson("8:00-8:45", "Niemiecki", "B")],
+        "sobota": [lesson("9:00-9:45", "Koło", "K")],
+    })
+
+    nowy = {"wtorek": [lesson("8:55-9:40", "Fizyka", "F")]}
+    tt.set_plan("1A", nowy)
+
+    assert tt.plan("1A") == nowy
+    assert tt.extra == {}
+
+
+def test_from_plans_builds_axis_from_all_entries():
+    plany = {
+        "1A": {"poniedzialek": [lesson("8:00-8:45", "Angielski", "A"), lesson("8:00-8:45", "Niemiecki", "B")]},
+        "2A": {"sroda": [lesson("10:00-10:45", "Fizyka", "F")]},
+    }
+    tt = Timetable.from_plans(plany)
+
+    assert tt.dni == ["poniedzialek", "sroda"]
+    assert {k: tt.plan(k) for k in plany} == plany
@@ -0,0 +1,154 @@
+# 🧪 Generator zastępstw — zastepstwa.py
+# generate_day() na małym ręcznie ułożonym planie oraz run() na syntetycznej szkole.
+#
+# Uruchomienie: python -m pytest -q
+
+import os, sys, datetime
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import plans, zastepstwa
+from benchmarks.synthetic import generate_school
+from core.absences import AbsenceLedger, ledger_path
+from core.occupancy import OccupancyIndex
+from core.store import get_store
+
+
+def cisza(*args):
+    pass
+
+
+def lesson(godzina, przedmiot, nauczyciel):
+    return {"godzina": godzina, "przedmiot": przedmiot, "sala": None, "nauczyciel": nauczyciel}
+
+
+def teacher(imie, przedmiot):
+    return {"imie": imie, "przedmiot": przedmiot, "specjalizacja": "", "klasy": [], "obecnosc": "yes"}
+
+
+def by_class(wynik):
+    return {z["klasa"]: (z["status"], z["nauczyciel_zastepujacy"]) for z in wynik}
+
+
+# ============================================================
+# PRZYDZIAŁ — uprawnieni zastępcy
+# ============================================================
+
+def test_qualified_substitute_goes_to_lesson_they_can_teach():
+    # 1A i 5A nie mogą się połączyć, wolny jest tylko fizyk
+    plany = {
+        "1A": {"poniedzialek": [lesson("8:00-8:45", "Matematyka", "Mat")]},
+        "5A": {"poniedzialek": [lesson("8:00-8:45", "Fizyka", "Fiz")]},
+        "3C": {"poniedzialek": [lesson("8:55-9:40", "Fizyka", "Fiz2")]},
+    }
+    nauczyciele = [teacher("Mat", "Matematyka"), teacher("Fiz", "Fizyka"), teacher("Fiz2", "Fizyka")]
+
+    wynik = zastepstwa.generate_day("poniedzialek", nauczyciele, OccupancyIndex(plany),
+                                    frozenset({"Mat", "Fiz"}), cisza)
+
+    assert by_class(wynik) == {
+        "1A": ("odwołane", None),
+        "5A": ("zastępstwo", "Fiz2"),
+    }
+
+
+def test_unqualified_substitute_still_covers_a_lesson():
+    plany = {
+        "1A": {"poniedzialek": [lesson("8:00-8:45", "Matematyka", "Mat")]},
+        "5A": {"poniedzialek": [lesson("8:00-8:45", "Fizyka", "Fiz")]},
+        "3C": {"poniedzialek": [lesson("8:55-9:40", "Historia", "His")]},
+    }
+    nauczyciele = [teacher("Mat", "Matematyka"), teacher("Fiz", "Fizyka"), teacher("His", "Historia")]
+
+    wynik = zastepstwa.generate_day("poniedzialek", nauczyciele, OccupancyIndex(plany),
+                                    frozenset({"Mat", "Fiz"}), cisza)
+
+    statusy = sorted(s for s, _ in by_class(wynik).values())
+    assert statusy == ["odwołane", "zastępstwo"]
+    assert "His" in {z for _, z in by_class(wynik).values()}
+
+
+def test_cascade_keeps_qualified_substitute():
+    # 1A i 2A mogą się połączyć: jeden wolny fizyk wystarcza na obie klasy,
+    # zastępcę dostaje lekcja fizyki, matematyka dołącza do niej
+    plany = {
+        "1A": {"poniedzialek": [lesson("8:00-8:45", "Matematyka", "Mat")]},
+        "2A": {"poniedzialek": [lesson("8:00-8:45", "Fizyka", "Fiz")]},
+        "3C": {"poniedzialek": [lesson("8:55-9:40", "Fizyka", "Fiz2")]},
+    }
+    nauczyciele = [teacher("Mat", "Matematyka"), teacher("Fiz", "Fizyka"), teacher("Fiz2", "Fizyka")]
+
+    wynik = zastepstwa.generate_day("poniedzialek", nauczyciele, OccupancyIndex(plany),
+                                    frozenset({"Mat", "Fiz"}), cisza)
+
+    assert by_class(wynik) == {
+        "1A": ("łączenie", "Fiz2"),
+        "2A": ("zastępstwo", "Fiz2"),
+    }
+
+
+def test_every_lesson_of_a_shared_hour_is_covered(tmp_path):
+    # grupy językowe 1A: dwie lekcje o 8:00, nieobecna tylko nauczycielka angielskiego
+    data_dir = str(tmp_path)
+    store = get_store(data_dir)
+    store.save("nauczyciele.json", [teacher("Ang", "Angielski"), teacher("Nie", "Niemiecki"),
+                                    teacher("Ang2", "Angielski")])
+    store.save_plan("1A", {"poniedzialek": [
+        lesson("8:00-8:45", "Angielski", "Ang"),
+        lesson("8:00-8:45", "Niemiecki", "Nie"),
+    ]})
+    store.save_plan("2A", {"poniedzialek": [lesson("8:55-9:40", "Angielski", "Ang2")]})
+    dzien = datetime.date(2026, 3, 2)
+    AbsenceLedger(ledger_path(data_dir)).add("Ang", dzien)
+
+    [(_, wynik)] = zastepstwa.run(data_dir, [dzien], log=cisza)
+
+    assert [(z["klasa"], z["przedmiot"], z["status"], z["nauczyciel_zastepujacy"]) for z in wynik] == [
+        ("1A", "Angielski", "zastępstwo", "Ang2")
+    ]
+
+
+def test_teacher_of_second_group_is_not_free():
+    plany = {
+        "1A": {"poniedzialek": [lesson("8:00-8:45", "Angielski", "Ang"),
+                                lesson("8:00-8:45", "Niemiecki", "Nie")]},
+        "5A": {"poniedzialek": [lesson("8:00-8:45", "Niemiecki", "Nie2")]},
+    }
+    nauczyciele = [teacher("Ang", "Angielski"), teacher("Nie", "Niemiecki"), teacher("Nie2", "Niemiecki")]
+
+    wynik = zastepstwa.generate_day("poniedzialek", nauczyciele, OccupancyIndex(plany),
+                                    frozenset({"Nie2"}), cisza)
+
+    # Nie uczy o 8:00 drugą grupę 1A — nie jest wolny, a 5A nie połączy się z 1A
+    assert by_class(wynik) == {"5A": ("odwołane", None)}
+
+
+# ============================================================
+# WĄTEK MENU — run() pracuje na kopiach danych magazynu
+# ============================================================
+
+def test_run_ignores_edits_made_while_it_works(tmp_path):
+    data_dir = str(tmp_path)
+    generate_school(data_dir, klasy=8, seed=2)
+    plans.run(data_dir, seed=1, log=cisza)
+    store = get_store(data_dir)
+
+    nieobecny = store.nauczyciele()[0]["imie"]
+    daty = [datetime.date(2026, 3, 2), datetime.date(2026, 3, 3)]
+    for d in daty:
+        AbsenceLedger(ledger_path(data_dir)).add(nieobecny, d)
+
+    oczekiwane = zastepstwa.run(data_dir, daty, log=cisza)
+
+    def edycja_w_menu(i, ile, opis):
+        # zakładka Nauczyciele zmienia wspólną listę w trakcie pracy generatora
+        if i == 1:
+            store.nauczyciele().clear()
+            store.klasy().clear()
+
+    wynik = zastepstwa.run(data_dir, daty, log=cisza, progress=edycja_w_menu)
+
+    assert wynik == oczekiwane
+    assert any(wynik[1][1])
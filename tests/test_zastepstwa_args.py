@@ -0,0 +1,54 @@
+# 🧪 Zakres dat generatora zastępstw — parse_args() i date_range()
+#
+# Uruchomienie: python -m pytest -q
+
+import os, sys, datetime
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import pytest
+
+from zastepstwa import parse_args, date_range
+
+D = datetime.date
+
+
+def test_default_is_tomorrow_only():
+    jutro = datetime.date.today() + datetime.timedelta(days=1)
+    assert date_range(parse_args([])) == [jutro]
+
+
+def test_from_alone_is_one_day():
+    assert date_range(parse_args(["--from", "2026-03-02"])) == [D(2026, 3, 2)]
+
+
+def test_from_to_is_inclusive():
+    daty = date_range(parse_args(["--from", "2026-02-27", "--to", "2026-03-02"]))
+    assert daty == [D(2026, 2, 27), D(2026, 2, 28), D(2026, 3, 1), D(2026, 3, 2)]
+
+
+def test_days_counts_from_first_day():
+    daty = date_range(parse_args(["--from", "2026-03-02", "--days", "3"]))
+    assert daty == [D(2026, 3, 2), D(2026, 3, 3), D(2026, 3, 4)]
+
+
+def test_to_equal_to_from_is_one_day():
+    args = parse_args(["--from", "2026-03-02", "--to", "2026-03-02"])
+    assert date_range(args) == [D(2026, 3, 2)]
+
+
+@pytest.mark.parametrize("argv", [
+    ["--days", "0"],
+    ["--days", "-2"],
+    ["--from", "2026-03-02", "--to", "2026-03-01"],
+    ["--from", "2026-03-02", "--to", "2026-03-05", "--days", "2"],
+    ["--from", "2026-13-01"],
+    ["--to", "wczoraj"],
+])
+def test_invalid_arguments_are_rejected(argv, capsys):
+    with pytest.raises(SystemExit) as e:
+        parse_args(argv)
+    assert e.value.code == 2
+    assert "error" in capsys.readouterr().err
@@ -0,0 +1,94 @@
+const fs = require("fs");
+const path = require("path");
+
+// Rejestr nieobecności prowadzony przez menu (core/absences.py)
+const LEDGER_PATH = path.join(__dirname, "..", "data", "nieobecnosci.jsonl");
+
+// ===============================
+// Dzień, dla którego pokazujemy obecność (jutro — jak menu i generator)
+// ===============================
+function tomorrowISO() {
+  const d = new Date();
+  d.setDate(d.getDate() + 1);
+  const mm = String(d.getMonth() + 1).padStart(2, "0");
+  const dd = String(d.getDate()).padStart(2, "0");
+  return `${d.getFullYear()}-${mm}-${dd}`;
+}
+
+// ===============================
+// Aktualne wpisy rejestru (id → wpis)
+// ===============================
+function loadLedger() {
+  const wpisy = {};
+  let tekst;
+
+  try {
+    tekst = fs.readFileSync(LEDGER_PATH, "utf8");
+  } catch {
+    return wpisy;
+  }
+
+  // niepełna ostatnia linia (trwa zapis) jest pomijana
+  const linie = tekst.slice(0, tekst.lastIndexOf("\n") + 1).split("\n");
+
+  for (const linia of linie) {
+    if (!linia.trim()) continue;
+
+    let op;
+    try {
+      op = JSON.parse(linia);
+    } catch {
+      continue;
+    }
+
+    if (op.op === "dodaj") {
+      wpisy[op.id] = {
+        imie: op.imie,
+        od: op.od,
+        do: op.do || op.od,
+        powod: op.powod || ""
+      };
+    } else if (op.op === "powod" && wpisy[op.id]) {
+      wpisy[op.id].powod = op.powod || "";
+    } else if (op.op === "imie" && wpisy[op.id]) {
+      wpisy[op.id].imie = op.imie;
+    } else if (op.op === "usun") {
+      delete wpisy[op.id];
+    }
+  }
+
+  return wpisy;
+}
+
+// ===============================
+// imie → powód dla nieobecnych w dniu `dateISO`
+// ===============================
+function absentOn(dateISO) {
+  const wynik = {};
+  for (const w of Object.values(loadLedger())) {
+    if (w.od <= dateISO && dateISO <= w.do) wynik[w.imie] = w.powod;
+  }
+  return wynik;
+}
+
+// ===============================
+// Nauczyciele z polami obecnosc/powod na dany dzień
+// (stara flaga "obecnosc: no" nadal oznacza nieobecność)
+// ===============================
+function withAbsences(nauczyciele, dateISO = tomorrowISO()) {
+  if (!Array.isArray(nauczyciele)) return [];
+
+  const nieobecni = absentOn(dateISO);
+
+  return nauczyciele.map(n => {
+    if (n.obecnosc === "no" || !(n.imie in nieobecni)) return n;
+    return { ...n, obecnosc: "no", powod: nieobecni[n.imie] };
+  });
+}
+
+module.exports = {
+  tomorrowISO,
+  loadLedger,
+  absentOn,
+  withAbsences
+};
@@ -1,20 +1,25 @@
 #!/usr/bin/env python3
-# 🧑‍🏫 Generator zastępstw v14.1 — generuje zastępstwa NA NASTĘPNY DZIEŃ
-# Plik wynikowy: data/zastepstwa/YYYY-MM-DD.json
-
-import json, os, re, datetime
+# 🧑‍🏫 Generator zastępstw v15 — domyślnie NA NASTĘPNY DZIEŃ
+# Tryb zakresu: --from YYYY-MM-DD [--to YYYY-MM-DD | --days N]
+# Plik wynikowy: data/zastepstwa/YYYY-MM-DD.json (jeden na każdy dzień)
+
+import os, re, copy, time, datetime, argparse
+from functools import lru_cache
+
+from core.occupancy import OccupancyIndex
+from core.busy import BusyMatrix
+from core.matching import assign_slot, coverage, format_coverage
+from core.ranking import QualificationIndex
+from core.fairness import LoadTally
+from core.cascade import solve_slot, BUDGET_MS
+from core.instrumentation import Instrumentation
+from core.timetable import load_timetable, slot_key
+from core.absences import AbsenceLedger, absent_teachers, ledger_path
+from core.store import get_store, ZASTEPSTWA
+from core.history import SubstitutionIndex
+from core.calendar_index import calendar_index
 
 DATA_DIR = "data"
-PLANY_DIR = os.path.join(DATA_DIR, "plany")
-ZAST_DIR = os.path.join(DATA_DIR, "zastepstwa")
-
-# ============================================================
-# DATA: JUTRO
-# ============================================================
-
-TODAY = datetime.date.today()
-TOMORROW = TODAY + datetime.timedelta(days=1)
-DATE_STR = TOMORROW.strftime("%Y-%m-%d")
 
 # english → polish dni tygodnia
 MAPA_DNI = {
@@ -27,73 +32,113 @@ MAPA_DNI = {
     "sunday": "niedziela"
 }
 
-DZIEN_ENG = TOMORROW.strftime("%A").lower()
-DZIEN = MAPA_DNI[DZIEN_ENG]  # nazwa dnia PL
-
-OUTPUT_PATH = os.path.join(ZAST_DIR, f"{DATE_STR}.json")
+# date.weekday() → nazwa dnia PL (niezależnie od locale)
+DNI_TYGODNIA = list(MAPA_DNI.values())
 
 
 # ============================================================
 # FUNKCJE
 # ============================================================
 
-def load_json(path):
-    if not os.path.exists(path):
-        return {}
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
-
-def save_json(path, data):
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
-
+@lru_cache(maxsize=None)
 def extract_rocznik(klasa):
     m = re.match(r"(\d+)", klasa)
     return int(m.group(1)) if m else None
 
+def can_merge(klasa, inna_klasa):
+    """Różnica poziomów max 1 (klasy bez numeru — zawsze)."""
+    r1 = extract_rocznik(klasa)
+    r2 = extract_rocznik(inna_klasa)
+    return not (r1 and r2 and abs(r1 - r2) > 1)
 
-# ============================================================
-# GŁÓWNY PROGRAM — tylko na JUTRO
-# ============================================================
+def class_sizes(klasy):
+    """klasa → liczba uczniów (z klasy.json)."""
+    return {k: len(v.get("uczniowie") or []) for k, v in klasy.items() if isinstance(v, dict)}
 
-def main():
+def best_merge(klasa, lekcje_w_slocie, po_imieniu, nieobecni_imiona, rozmiary):
+    """Najlepsza klasa do połączenia: (klasa, nauczyciel) albo None.
+    Różnica roczników max 1 — najpierw ten sam rocznik, potem mniejsza klasa."""
+    r1 = extract_rocznik(klasa)
+    najlepsza = None
 
-    print(f"📅 Generuję zastępstwa na dzień: {DATE_STR} ({DZIEN})")
+    for nr, (inna_klasa, lekcja2) in enumerate(lekcje_w_slocie):
 
-    nauczyciele = load_json(os.path.join(DATA_DIR, "nauczyciele.json"))
-    if not isinstance(nauczyciele, list):
-        nauczyciele = []
+        if inna_klasa == klasa:
+            continue
 
-    klasy = [f[:-5] for f in os.listdir(PLANY_DIR) if f.endswith(".json")]
-    plany = {
-        k: load_json(os.path.join(PLANY_DIR, f"{k}.json"))
-        for k in klasy
-    }
+        nauc2 = lekcja2["nauczyciel"]
+        if nauc2 not in po_imieniu or nauc2 in nieobecni_imiona:
+            continue
+
+        if not can_merge(klasa, inna_klasa):
+            continue
+
+        r2 = extract_rocznik(inna_klasa)
+        roznica = abs(r1 - r2) if r1 and r2 else 1
+
+        klucz = (roznica, rozmiary.get(inna_klasa, 0), nr)
+        if najlepsza is None or klucz < najlepsza[0]:
+            najlepsza = (klucz, inna_klasa, nauc2)
+
+    return najlepsza[1:] if najlepsza else None
+
+def output_name(data):
+    """Ścieżka pliku dnia względem katalogu data/."""
+    return os.path.join(ZASTEPSTWA, f"{data.strftime('%Y-%m-%d')}.json")
+
+
+# ============================================================
+# ZASTĘPSTWA NA JEDEN DZIEŃ
+# ============================================================
+
+def generate_day(dzien, nauczyciele, indeks, nieobecni_imiona, log=print,
+                 macierz=None, ranking=None, historia=None, rozmiary=None,
+                 budget_ms=BUDGET_MS, instr=None):
+    """Lista zastępstw dla dnia tygodnia `dzien` (np. "wtorek")
+    przy nieobecności nauczycieli ze zbioru `nieobecni_imiona`.
+    `historia` — {imie: zastępstwa z ostatnich tygodni} do wyrównywania obciążenia,
+    `rozmiary` — {klasa: liczba uczniów} do wyboru klasy przy łączeniu,
+    `budget_ms` — limit czasu szukania kaskad w tym dniu,
+    `instr` — Instrumentation: fazy i liczniki (domyślnie wyłączone)."""
+
+    if instr is None:
+        instr = Instrumentation("zastepstwa", enabled=False)
+    if macierz is None:
+        macierz = BusyMatrix(indeks.timetable, nauczyciele)
+    if ranking is None:
+        ranking = QualificationIndex(nauczyciele)
 
     zastepstwa = []
+    rozmiary = rozmiary or {}
+    po_imieniu = {n["imie"]: n for n in nauczyciele}
 
-    nieobecni = [n for n in nauczyciele if n.get("obecnosc") == "no"]
-    obecni = [n for n in nauczyciele if n.get("obecnosc") == "yes"]
+    nieobecni = [n for n in nauczyciele if n["imie"] in nieobecni_imiona]
+    obecni = [n for n in nauczyciele if n["imie"] not in nieobecni_imiona]
 
-    print(f"🔍 Nieobecni nauczyciele: {len(nieobecni)}")
+    log(f"🔍 Nieobecni nauczyciele: {len(nieobecni)}")
+
+    # wolni nauczyciele dla wszystkich godzin z lekcjami nieobecnych — naraz
+    godziny = {
+        lekcja["godzina"]
+        for n in nieobecni
+        for _, lekcja in indeks.lessons_of(n["imie"], dzien)
+    }
+    wolni_o = macierz.free_sets(dzien, godziny, obecni)
+
+    # godzina → indeksy wpisów czekających na zastępcę
+    do_obsadzenia = {}
 
     # ------------------------------------------------------------
     # DLA KAŻDEGO NIEOBECNEGO
     # ------------------------------------------------------------
-    for n in nieobecni:
-
-        imie = n["imie"]
-        print(f"\n🚫 {imie} — nieobecny")
-
-        for klasa, plan in plany.items():
-
-            lekcje_jutro = plan.get(DZIEN, [])
+    with instr.phase("łączenie"):
+        for n in nieobecni:
 
-            for lekcja in lekcje_jutro:
+            imie = n["imie"]
+            log(f"\n🚫 {imie} — nieobecny")
 
-                if lekcja.get("nauczyciel") != imie:
-                    continue
+            for klasa, lekcja in indeks.lessons_of(imie, dzien):
+                instr.count("lekcje nieobecnych")
 
                 godzina = lekcja["godzina"]
                 przedmiot = lekcja["przedmiot"]
@@ -105,65 +150,21 @@ def main():
                 # =====================================================
                 # 1) PRÓBA ŁĄCZENIA KLAS
                 # =====================================================
+                # tylko klasy mające lekcję o tej godzinie (indeks slotów)
                 polaczone_z = None
+                w_slocie = indeks.lessons_at(dzien, godzina)
+                instr.count("łączenie: sprawdzone klasy", len(w_slocie))
+                partner = best_merge(klasa, w_slocie, po_imieniu, nieobecni_imiona, rozmiary)
 
-                for inna_klasa, plan2 in plany.items():
-
-                    if inna_klasa == klasa:
-                        continue
-
-                    lekcja2 = next(
-                        (l2 for l2 in plan2.get(DZIEN, []) if l2.get("godzina") == godzina),
-                        None
-                    )
-                    if not lekcja2:
-                        continue
-
-                    nauc2 = lekcja2.get("nauczyciel")
-                    if not nauc2:
-                        continue
-
-                    nauc2_obj = next((x for x in nauczyciele if x["imie"] == nauc2), None)
-                    if not nauc2_obj or nauc2_obj.get("obecnosc") == "no":
-                        continue
-
-                    # różnica poziomów max 1
-                    r1 = extract_rocznik(klasa)
-                    r2 = extract_rocznik(inna_klasa)
-                    if r1 and r2 and abs(r1 - r2) > 1:
-                        continue
-
-                    polaczone_z = inna_klasa
-                    nauczyciel_zast = nauc2
+                if partner:
+                    instr.count("łączenia")
+                    polaczone_z, nauczyciel_zast = partner
                     status = "łączenie"
-                    opis = f"Połączono klasy {klasa} i {inna_klasa}"
-                    break
+                    opis = f"Połączono klasy {klasa} i {polaczone_z}"
 
-                # =====================================================
-                # 2) PRÓBA ZASTĘPSTWA
-                # =====================================================
+                # bez łączenia — zastępca dobierany niżej, dla całej godziny naraz
                 if not polaczone_z:
-                    wolni = []
-
-                    for kandydat in obecni:
-
-                        zajety = False
-                        for p in plany.values():
-                            for ld in p.get(DZIEN, []):
-                                if ld.get("nauczyciel") == kandydat["imie"] and ld["godzina"] == godzina:
-                                    zajety = True
-                                    break
-                            if zajety:
-                                break
-
-                        if not zajety:
-                            wolni.append(kandydat)
-
-                    if wolni:
-                        wybrany = wolni[0]
-                        nauczyciel_zast = wybrany["imie"]
-                        status = "zastępstwo"
-                        opis = f"Zastępuje {wybrany['imie']}"
+                    do_obsadzenia.setdefault(godzina, []).append(len(zastepstwa))
 
                 # =====================================================
                 # ZAPIS
@@ -178,10 +179,239 @@ def main():
                     "opis": opis
                 })
 
-    save_json(OUTPUT_PATH, zastepstwa)
+    # ------------------------------------------------------------
+    # 2) PRZYDZIAŁ ZASTĘPCÓW — wspólnie dla wszystkich lekcji danej godziny
+    # ------------------------------------------------------------
+    with instr.phase("przydział"):
+        obciazenie = {}
+        deadline = time.perf_counter() + budget_ms / 1000
+
+        for godzina in sorted(do_obsadzenia, key=slot_key):
+            pozycje = do_obsadzenia[godzina]
+            wolni = [w["imie"] for w in wolni_o[godzina]]
+
+            # kandydaci każdej lekcji od najlepiej pasującego
+            # (przedmiot, klasa, etap, obciążenie dziś i w ostatnich tygodniach)
+            klucze = [
+                ranking.sort_key(zastepstwa[i]["klasa"], zastepstwa[i]["przedmiot"], obciazenie, historia)
+                for i in pozycje
+            ]
+
+            # tylko wolni z uprawnieniami do danej lekcji (przedmiot + etap klasy)
+            kandydaci = []
+            for i in pozycje:
+                uprawnieni = ranking.qualified(zastepstwa[i]["klasa"], zastepstwa[i]["przedmiot"])
+                kandydaci.append([w for w in wolni if w in uprawnieni])
+            instr.count("ocenieni kandydaci", sum(map(len, kandydaci)))
+
+            # skojarzenie maksymalne na próbę: lekcje, które mogą dostać uprawnionego zastępcę
+            wstepny = assign_slot(kandydaci, dict(obciazenie), klucze)
+            premiowane = {b for b, zastepca in enumerate(wstepny) if zastepca is not None}
+
+            # zastępców za mało → kaskady: klasa dołącza do klasy, która dostała zastępcę;
+            # przy remisie zastępcę dostają lekcje z uprawnionym kandydatem
+            sasiedzi = [
+                [b for b, j in enumerate(pozycje) if j != i and can_merge(zastepstwa[i]["klasa"], zastepstwa[j]["klasa"])]
+                for i in pozycje
+            ]
+            decyzje, pelne = solve_slot(len(pozycje), sasiedzi, len(wolni), deadline, premiowane)
+            if not pelne:
+                log(f"⏱ {godzina}: skończył się budżet czasu kaskad — najlepsze znalezione rozwiązanie")
+
+            # a) skojarzenie lekcje z zastępcą ↔ uprawnieni wolni nauczyciele
+            z_zastepca = [b for b, d in enumerate(decyzje) if d == "S"]
+            wynik = assign_slot([kandydaci[b] for b in z_zastepca], obciazenie,
+                                [klucze[b] for b in z_zastepca])
+
+            # b) lekcje bez uprawnionego zastępcy — ktokolwiek z pozostałych wolnych
+            bez = [k for k, zastepca in enumerate(wynik) if zastepca is None]
+            if bez:
+                zajeci = set(wynik)
+                pozostali = [w for w in wolni if w not in zajeci]
+                for k, zastepca in zip(bez, assign_slot([pozostali] * len(bez), obciazenie,
+                                                        [klucze[z_zastepca[k]] for k in bez])):
+                    wynik[k] = zastepca
+                    if zastepca is not None:
+                        instr.count("zastępstwa bez uprawnień")
+
+            for b, zastepca in zip(z_zastepca, wynik):
+                if zastepca is not None:
+                    zastepstwa[pozycje[b]].update({
+                        "nauczyciel_zastepujacy": zastepca,
+                        "status": "zastępstwo",
+                        "opis": f"Zastępuje {zastepca}"
+                    })
+
+            for i, d in zip(pozycje, decyzje):
+                if isinstance(d, tuple):
+                    instr.count("kaskady")
+                    cel = zastepstwa[pozycje[d[1]]]
+                    zastepstwa[i].update({
+                        "nauczyciel_zastepujacy": cel["nauczyciel_zastepujacy"],
+                        "status": "łączenie",
+                        "opis": f"Połączono klasy {zastepstwa[i]['klasa']} i {cel['klasa']}"
+                    })
+
+    log(format_coverage(coverage(zastepstwa)))
+
+    return zastepstwa
+
+
+# ============================================================
+# ZAKRES DAT
+# ============================================================
+
+def parse_date(text):
+    try:
+        return datetime.datetime.strptime(text, "%Y-%m-%d").date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"niepoprawna data: {text} (oczekiwano YYYY-MM-DD)")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generator zastępstw")
+    parser.add_argument("--from", dest="od", type=parse_date,
+                        help="pierwszy dzień (domyślnie jutro)")
+    zakres = parser.add_mutually_exclusive_group()
+    zakres.add_argument("--to", dest="do", type=parse_date,
+                        help="ostatni dzień zakresu (włącznie)")
+    zakres.add_argument("--days", type=int,
+                        help="liczba kolejnych dni od --from")
+    parser.add_argument("--compact", action="store_true",
+                        help="zapisuj pliki zastępstw bez wcięć")
+    parser.add_argument("--instrument", action="store_true", default=None,
+                        help="raport czasów faz i liczników (też ZASTEPSTWA_INSTRUMENT=1)")
+    parser.add_argument("--budget-ms", type=int, default=BUDGET_MS,
+                        help=f"limit czasu szukania kaskad na dzień (domyślnie {BUDGET_MS} ms)")
+    args = parser.parse_args(argv)
+
+    if args.days is not None and args.days < 1:
+        parser.error(f"--days musi być co najmniej 1 (podano {args.days})")
+    if args.do and args.do < first_day(args):
+        parser.error(f"--to {args.do} jest wcześniejsze niż pierwszy dzień {first_day(args)}")
+
+    return args
+
+
+def first_day(args):
+    return args.od or datetime.date.today() + datetime.timedelta(days=1)
+
+
+def date_range(args):
+    od = first_day(args)
+
+    if args.do:
+        do = args.do
+    elif args.days is not None:
+        do = od + datetime.timedelta(days=args.days - 1)
+    else:
+        do = od
+
+    return [od + datetime.timedelta(days=i) for i in range((do - od).days + 1)]
+
+
+# ============================================================
+# GŁÓWNY PROGRAM
+# ============================================================
 
-    print(f"\n📊 Wygenerowano {len(zastepstwa)} pozycji.")
-    print(f"📁 Plik zapisany: {OUTPUT_PATH}")
+def run(data_dir, daty, compact=False, log=print, progress=None, budget_ms=BUDGET_MS,
+        instrument=None):
+    """Zastępstwa dla kolejnych dat z listy `daty` (datetime.date).
+    `progress(zrobione, wszystkie, opis)` wołane przed każdym dniem.
+    `instrument` — raport wydajności (None: wg ZASTEPSTWA_INSTRUMENT).
+    Zwraca listę (data, wynik): wynik to lista zastępstw albo dict dnia wolnego."""
+    progress = progress or (lambda *a: None)
+    with Instrumentation("zastepstwa", instrument) as instr:
+        # dane ładowane RAZ dla całego zakresu
+        store = get_store(data_dir)
+
+        with instr.phase("wczytanie"):
+            # zmiany z menu czekające w kolejce zapisu trafiają na dysk przed startem
+            store.flush()
+            # kopie — zakładki menu zmieniają wspólne obiekty magazynu w wątku Tk
+            nauczyciele = copy.deepcopy(store.nauczyciele())
+            klasy = copy.deepcopy(store.klasy())
+            plan_lekcji = load_timetable(store)
+            kalendarz = calendar_index(data_dir)
+            ledger = AbsenceLedger(ledger_path(data_dir))
+
+        # indeks zajętości — budowany raz, używany przez łączenie i zastępstwa
+        with instr.phase("indeksy"):
+            indeks = OccupancyIndex(plan_lekcji)
+            macierz = BusyMatrix(plan_lekcji, nauczyciele)
+            ranking = QualificationIndex(nauczyciele, store.etapy())
+            rozmiary = class_sizes(klasy)
+
+            # liczniki zastępstw z ostatnich tygodni — z indeksu historii, nie z plików
+            historia = SubstitutionIndex(data_dir).sync()
+            liczniki = LoadTally(historia)
+
+        wyniki = []
+
+        # wszystkie dni wolne zakresu jednym zapytaniem do indeksu kalendarza
+        wolne = kalendarz.free_days_between(min(daty), max(daty)) if daty else {}
+
+        for i, data in enumerate(daty):
+
+            data_str = data.strftime("%Y-%m-%d")
+            progress(i, len(daty), data_str)
+            dzien = DNI_TYGODNIA[data.weekday()]
+            out_name = output_name(data)
+
+            free = wolne.get(data)
+
+            if free:
+                with instr.phase("zapis"):
+                    store.save(out_name, {"status": "wolne", **free}, compact=compact)
+                log(f"🎉 {data_str} — dzień wolny ({free['powod']})")
+                wyniki.append((data, free))
+                continue
+
+            log(f"📅 Generuję zastępstwa na dzień: {data_str} ({dzien})")
+
+            nieobecni_imiona = frozenset(absent_teachers(nauczyciele, ledger, data))
+
+            # wynik zależy od obciążenia z poprzednich dni — każdy dzień liczony osobno
+            zastepstwa = generate_day(
+                dzien, nauczyciele, indeks, nieobecni_imiona, log, macierz, ranking,
+                liczniki.counts(data), rozmiary, budget_ms, instr
+            )
+            liczniki.add(data_str, zastepstwa)
+            instr.count("dni")
+
+            with instr.phase("zapis"):
+                out_path = store.save(out_name, zastepstwa, compact=compact)
+            wyniki.append((data, zastepstwa))
+
+            log(f"\n📊 Wygenerowano {len(zastepstwa)} pozycji.")
+            log(f"📁 Plik zapisany: {out_path}")
+
+        # menu zaraz czyta katalog zastepstwa/ — nic nie może czekać w kolejce zapisu
+        with instr.phase("zapis"):
+            store.flush()
+
+        # skróty dni do indeksu historii (po zapisie — indeks pamięta stat pliku)
+        with instr.phase("historia"):
+            for data, wynik in wyniki:
+                historia.record(data.strftime("%Y-%m-%d"), {"status": "wolne", **wynik} if isinstance(wynik, dict) else wynik)
+            historia.save()
+
+        if instr.enabled and daty:
+            instr.stop()
+            nazwa = daty[0].isoformat() if len(daty) == 1 else f"{min(daty).isoformat()}_{max(daty).isoformat()}"
+            sciezka = instr.save(store, ZASTEPSTWA, nazwa)
+            log("")
+            for linia in instr.summary():
+                log(linia)
+            log(f"📁 Raport: {sciezka}")
+
+        return wyniki
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    run(DATA_DIR, date_range(args), compact=args.compact, budget_ms=args.budget_ms,
+        instrument=args.instrument)
 
 
 # ============================================================